@@ -0,0 +1,8 @@
+from backend import archive
+
+# Archive jobs past their closing date, in batches. The app does this every
+# ARCHIVE_INTERVAL_SECONDS already; run this from cron when that is
+# disabled (ARCHIVE_INTERVAL_SECONDS=0).
+
+if __name__ == "__main__":
+    print(f"Archived {archive.archive_expired()} expired jobs.")
@@ -0,0 +1,69 @@
+import os
+from datetime import datetime, timezone
+from sqlalchemy import update, func, false
+from sqlalchemy.orm import Session
+from . import models, schemas, queries, events, database, scheduler
+
+# Closing-date enforcement: the hot/archive split of jobs.
+#
+# Search, the public listing, recommendations and apply only read the hot
+# set (queries.hot_job): jobs that are not archived and not past their
+# closing date. archive_expired() flags expired jobs as archived,
+# ARCHIVE_BATCH_SIZE at a time in short transactions, and tells the search
+# index, response cache and recommendations to drop them. The listing
+# index leads with the flag (models.Job), so the hot set is one contiguous
+# index range that no longer grows with years of expired postings.
+#
+# Archived rows stay in the jobs table, so lookups by id, the employer's
+# own job list and the applications on archived jobs work as before.
+# Moving a closing date back into the future un-archives the job.
+
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+# Run by the app every this many seconds (see scheduler.py); 0 disables it
+# (run archive_jobs.py from cron instead)
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", "600"))
+ARCHIVE_PAUSE_SECONDS = 0.05
+
+def is_open(closing_date, now=None):
+    if closing_date is None:
+        return True
+    now = now or datetime.now(timezone.utc)
+    if closing_date.tzinfo is None:
+        # Stored values are UTC without an offset
+        closing_date = closing_date.replace(tzinfo=timezone.utc)
+    return closing_date > now
+
+def archive_expired(db: Session = None, pause=ARCHIVE_PAUSE_SECONDS, stopping=None):
+    """Archive every job past its closing date, or until stopping (a
+    threading.Event) is set; returns how many."""
+    own_session = db is None
+    db = db or database.SessionLocal()
+    job = models.Job
+    archived = 0
+    try:
+        while True:
+            rows = db.execute(
+                queries.job_listing()
+                .where(job.archived == false(), job.closing_date <= func.now())
+                .order_by(job.closing_date)
+                .limit(ARCHIVE_BATCH_SIZE)
+                .with_for_update(skip_locked=True, of=job)
+            ).all()
+            if rows:
+                db.execute(
+                    update(job).where(job.id.in_([row.id for row in rows]))
+                    .values(archived=True).execution_options(synchronize_session=False)
+                )
+            db.commit()
+            for row in rows:
+                events.job_changed(schemas.JobOut(**row._mapping), None)
+            archived += len(rows)
+            if len(rows) < ARCHIVE_BATCH_SIZE or scheduler.between_chunks(pause, stopping):
+                break
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        if own_session:
+            db.close()
+    return archived
@@ -0,0 +1,112 @@
+import hashlib
+import os
+import re
+import threading
+from mimetypes import guess_type
+from pathlib import Path
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+# Serving the frontend.
+#
+# build_assets.py turns frontend/ into build/frontend/: CSS and JS get
+# content-hashed names (js/api.3f2a9c81d0.js), the HTML pages are rewritten
+# to reference them, and every text file gets .gz and .br siblings
+# compressed at maximum level. PrecompressedStaticFiles serves that tree:
+#
+#   - the best variant the client accepts (br, then gzip, then the file),
+#     with Content-Encoding and Vary: Accept-Encoding
+#   - a strong ETag from the content hash, per variant, so If-None-Match
+#     revalidation gets a 304
+#   - Cache-Control: immutable for a year on hashed names (a new build
+#     means new names), no-cache on everything else, i.e. the HTML pages
+#     revalidate on every load and pick up a deploy at once
+#
+# Without a build it serves frontend/ itself the same way, minus the
+# variants, so development needs no build step.
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+SOURCE_DIR = BASE_DIR / "frontend"
+BUILD_DIR = BASE_DIR / "build" / "frontend"
+
+HASH_LENGTH = 10
+HASHED_NAME = re.compile(r"\.[0-9a-f]{%d}\.[A-Za-z0-9]+$" % HASH_LENGTH)
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+# Preferred first
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+def frontend_dir():
+    """The directory to serve: FRONTEND_DIR, else the build if there is one."""
+    configured = os.getenv("FRONTEND_DIR")
+    if configured:
+        return Path(configured)
+    return BUILD_DIR if (BUILD_DIR / "index.html").exists() else SOURCE_DIR
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+def accepted_encodings(header):
+    # Accept-Encoding tokens with a non-zero q
+    accepted = set()
+    for part in header.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(token.strip())
+    return accepted
+
+class PrecompressedStaticFiles(StaticFiles):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (path, mtime, size) -> (etag, {encoding: (variant path, stat)})
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def _describe(self, full_path, stat_result):
+        key = (full_path, stat_result.st_mtime_ns, stat_result.st_size)
+        described = self._files.get(key)
+        if described is None:
+            with open(full_path, "rb") as f:
+                etag = content_hash(f.read())[:32]
+            variants = {}
+            for encoding, suffix in ENCODINGS:
+                try:
+                    variants[encoding] = (full_path + suffix, os.stat(full_path + suffix))
+                except OSError:
+                    pass
+            described = (etag, variants)
+            with self._lock:
+                self._files[key] = described
+        return described
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        request_headers = Headers(scope=scope)
+        etag, variants = self._describe(str(full_path), stat_result)
+        path, stat_result, encoding = full_path, stat_result, None
+        if variants:
+            accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+            for candidate, _ in ENCODINGS:
+                if candidate in variants and candidate in accepted:
+                    (path, stat_result), encoding = variants[candidate], candidate
+                    break
+
+        headers = {
+            "Cache-Control": IMMUTABLE if HASHED_NAME.search(os.path.basename(full_path)) else REVALIDATE,
+            "Vary": "Accept-Encoding",
+        }
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        # The media type of the file, not of its .br/.gz variant
+        response = FileResponse(path, status_code=status_code, stat_result=stat_result, headers=headers,
+                                media_type=guess_type(str(full_path))[0] or "text/plain")
+        response.headers["etag"] = f'"{etag}-{encoding}"' if encoding else f'"{etag}"'
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -1,31 +1,33 @@
-from passlib.context import CryptContext
 from jose import JWTError, jwt
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
+import threading
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from . import models, schemas, database
+from . import models, schemas, database, passwords
 
 SECRET_KEY = "supersecretkeyforcollegeproject"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 # 1 day
+# How long a user's token version is trusted before it is re-read, i.e. the
+# longest a deleted user or a revoked token can keep working
+TOKEN_VERSION_TTL_SECONDS = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = passwords.pwd_context
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# Synchronous helpers for scripts (create_admin.py); request handlers use the
+# pooled passwords.*_async variants.
 def verify_password(plain_password, hashed_password):
-    try:
-        # Bcrypt has a 72-byte limit. Truncate if necessary
-        plain_password = plain_password[:72]
-        return pwd_context.verify(plain_password, hashed_password)
-    except Exception:
-        return False
+    return passwords.verify_and_update(plain_password, hashed_password)[0]
 
 def get_password_hash(password):
-    # Bcrypt has a 72-byte limit. Truncate if necessary to prevent ValueError
-    password = password[:72]
-    return pwd_context.hash(password)
+    return passwords.hash_password(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -37,25 +39,108 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
+@dataclass(frozen=True)
+class Principal:
+    # Identity taken from the signed token claims, no users row needed
+    id: int
+    email: str
+    role: models.UserRole
+    token_version: int
+
+def token_claims(user: models.User):
+    return {"sub": user.email, "uid": user.id, "role": user.role.value, "ver": user.token_version or 0}
+
+class TokenVersionCache:
+    """Short-lived cache of users.token_version keyed by user id.
+
+    A missing or deleted user caches as None, so their tokens are rejected.
+    """
+
+    def __init__(self, ttl=TOKEN_VERSION_TTL_SECONDS):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    async def get(self, db: AsyncSession, user_id: int):
+        now = time.monotonic()
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+        result = await db.execute(
+            select(models.User.token_version).where(models.User.id == user_id, models.User.deleted_at.is_(None))
+        )
+        version = result.scalar()
+        with self._lock:
+            self._entries[user_id] = (version, now + self.ttl)
+        return version
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+token_versions = TokenVersionCache()
+
+def revoke_tokens(db: Session, user: models.User):
+    # Bump the version so tokens issued before now stop validating; call this
+    # whenever a user's role or credentials change.
+    user.token_version = (user.token_version or 0) + 1
+    db.flush()
+    token_versions.invalidate(user.id)
+
+def decode_principal(token: str):
+    """The Principal in a signed token; ValueError if it is not a valid one.
+    Says nothing about revocation (see token_versions)."""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        return Principal(
+            id=int(payload["uid"]),
+            email=payload["sub"],
+            role=models.UserRole(payload["role"]),
+            token_version=int(payload.get("ver", 0)),
+        )
+    except (JWTError, KeyError, TypeError, ValueError) as exc:
+        raise ValueError("invalid token") from exc
+
+async def get_current_principal(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(database.get_async_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        role: str = payload.get("role")
-        if email is None:
-            raise credentials_exception
-        token_data = schemas.TokenData(email=email, role=role)
-    except JWTError:
+        principal = decode_principal(token)
+    except ValueError:
         raise credentials_exception
-    
-    user = db.query(models.User).filter(models.User.email == token_data.email).first()
-    if user is None:
+
+    # Session is lazy, so a cache hit never touches the database
+    if await token_versions.get(db, principal.id) != principal.token_version:
         raise credentials_exception
+    return principal
+
+def require_role(role: models.UserRole):
+    def dependency(principal: Principal = Depends(get_current_principal)):
+        if principal.role != role:
+            raise HTTPException(status_code=403, detail="Not authorized")
+        return principal
+    return dependency
+
+require_seeker = require_role(models.UserRole.seeker)
+require_employer = require_role(models.UserRole.employer)
+require_admin = require_role(models.UserRole.admin)
+
+def get_current_user(principal: Principal = Depends(get_current_principal), db: Session = Depends(database.get_db)):
+    # Full users row, for the few endpoints that need more than the claims
+    user = db.get(models.User, principal.id)
+    if user is None or user.deleted_at is not None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 def get_current_active_user(current_user: models.User = Depends(get_current_user)):
@@ -0,0 +1,220 @@
+import codecs
+import csv
+import io
+import json
+import os
+import tempfile
+from collections import Counter
+from datetime import datetime
+from itertools import islice
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert, update, bindparam
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from . import models, schemas, queries, counters, events, database, normalize, geo, archive, matching
+
+# Bulk job sync for employers pushing their openings from an ATS.
+#
+# The upload is spooled to a temporary file (memory up to SPOOL_BYTES, disk
+# after that) and parsed as a stream of rows. Rows are validated and
+# written BULK_CHUNK_SIZE at a time, one transaction per chunk: one lookup
+# of the chunk's external IDs, one multi-row INSERT and one executemany
+# UPDATE. Rows whose fields match what is stored are left alone, so a
+# nightly re-sync only writes what changed.
+
+BULK_CHUNK_SIZE = 500
+BULK_MAX_BYTES = int(os.getenv("BULK_MAX_BYTES", str(50 * 2**20)))
+SPOOL_BYTES = 2**20
+
+JOB_FIELDS = ("title", "description", "location", "job_type", "salary_range", "closing_date")
+# Written along with them, derived from job_type and salary_range
+WRITTEN_FIELDS = JOB_FIELDS + normalize.FIELDS + geo.FIELDS
+JSONL_TYPES = ("application/x-ndjson", "application/jsonl", "application/jsonlines")
+
+async def spool(request):
+    upload = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > BULK_MAX_BYTES:
+            upload.close()
+            raise HTTPException(status_code=413, detail=f"Upload exceeds {BULK_MAX_BYTES} bytes")
+        upload.write(chunk)
+    upload.seek(0)
+    return upload
+
+def _check_encoding(upload):
+    # Decoded up front: the rows are written a chunk at a time, so a bad
+    # byte found halfway through would leave the earlier chunks committed
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    try:
+        for chunk in iter(lambda: upload.read(SPOOL_BYTES), b""):
+            decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Upload is not valid UTF-8")
+    upload.seek(0)
+
+def parse(upload, content_type):
+    """Yield (row number, raw row) from a JSON array, JSONL or CSV upload."""
+    kind = content_type.split(";")[0].strip().lower()
+    if kind not in ("application/json", "text/csv") + JSONL_TYPES:
+        raise HTTPException(status_code=415, detail="Send application/json, application/x-ndjson or text/csv")
+    _check_encoding(upload)
+    text = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+
+    if kind == "application/json":
+        # A JSON array has to be read whole; large syncs should use JSONL
+        try:
+            data = json.load(text)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid JSON")
+        if not isinstance(data, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of jobs")
+        yield from enumerate(data, 1)
+    elif kind == "text/csv":
+        yield from enumerate(csv.DictReader(text), 1)
+    else:
+        for number, line in enumerate(text, 1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError:
+                yield number, None
+
+def _error(number, errors):
+    return schemas.JobBulkResult(row=number, status="error", errors=errors)
+
+def _validate(number, raw):
+    if not isinstance(raw, dict):
+        return None, _error(number, ["expected a JSON object"])
+    try:
+        return schemas.JobBulkItem.model_validate(raw), None
+    except ValidationError as e:
+        return None, _error(number, [f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()])
+
+def _same(stored, incoming):
+    if isinstance(stored, datetime) and isinstance(incoming, datetime):
+        # Stored values are whole seconds without an offset
+        return stored.replace(microsecond=0, tzinfo=None) == incoming.replace(microsecond=0, tzinfo=None)
+    return stored == incoming
+
+def _insert_ids(db: Session, params):
+    """Insert the rows with one multi-row INSERT and return their ids in order."""
+    table = models.Job.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect not in ("mysql", "sqlite"):
+        return db.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True), params).scalars().all()
+    result = db.execute(insert(table).values(params))
+    if dialect == "mysql":
+        # A multi-row INSERT of known size is a "simple insert", which InnoDB
+        # gives consecutive ids in every innodb_autoinc_lock_mode, starting
+        # at LAST_INSERT_ID()
+        return list(range(result.lastrowid, result.lastrowid + len(params)))
+    # SQLite assigns max(rowid) + 1 per row under the write lock, and
+    # lastrowid is the final one
+    return list(range(result.lastrowid - len(params) + 1, result.lastrowid + 1))
+
+def _write_chunk(db: Session, employer_id, items):
+    """items: (row number, JobBulkItem). Returns the chunk's results."""
+    job = models.Job
+    external_ids = [item.external_id for _, item in items if item.external_id]
+    existing = {}
+    if external_ids:
+        rows = db.execute(
+            queries.job_listing().add_columns(job.external_id)
+            .where(job.employer_id == employer_id, job.external_id.in_(external_ids))
+        )
+        existing = {row.external_id: row for row in rows}
+
+    results, inserts, updates = {}, [], []
+    for number, item in items:
+        values = item.model_dump(include=set(JOB_FIELDS))
+        values.update(normalize.derived(item.job_type, item.salary_range))
+        values.update(geo.derived(item.location))
+        old = existing.get(item.external_id) if item.external_id else None
+        if old is None:
+            inserts.append((number, item, values))
+        elif all(_same(getattr(old, field), values[field]) for field in JOB_FIELDS):
+            results[number] = schemas.JobBulkResult(row=number, status="unchanged", id=old.id, external_id=item.external_id)
+        else:
+            updates.append((number, item, values, old))
+
+    try:
+        inserted_ids = []
+        if inserts:
+            inserted_ids = _insert_ids(db, [
+                {**values, "employer_id": employer_id, "external_id": item.external_id} for _, item, values in inserts
+            ])
+            counters.job_created(db, employer_id, len(inserts))
+        if updates:
+            stmt = (
+                update(job.__table__)
+                .where(job.__table__.c.id == bindparam("job_id"))
+                .values({field: bindparam(f"new_{field}") for field in WRITTEN_FIELDS + ("archived",)})
+            )
+            # An archived job whose closing date moved past today goes back
+            # into search, as in update_job
+            db.execute(stmt, [
+                {"job_id": old.id, **{f"new_{field}": values[field] for field in WRITTEN_FIELDS},
+                 "new_archived": old.archived and not archive.is_open(values["closing_date"])}
+                for _, _, values, old in updates
+            ])
+            rescored = [old.id for _, _, values, old in updates
+                        if (old.title, old.description) != (values["title"], values["description"])]
+            if rescored:
+                matching.forget_job_scores(db, rescored)
+        db.commit()
+    except IntegrityError:
+        # A concurrent sync inserted the same external_id first
+        db.rollback()
+        for number, item, *_ in inserts + updates:
+            results[number] = _error(number, ["conflicting concurrent write; retry the sync"])
+        return list(results.values())
+
+    written = {**{new_id: None for new_id in inserted_ids}, **{old.id: old for *_, old in updates}}
+    if written:
+        fresh = {out.id: out for out in queries.jobs_out(db.execute(queries.job_listing().where(job.id.in_(written))))}
+        for job_id, old in written.items():
+            events.job_changed(schemas.JobOut(**old._mapping) if old is not None else None, fresh[job_id])
+
+    for (number, item, _), new_id in zip(inserts, inserted_ids):
+        results[number] = schemas.JobBulkResult(row=number, status="created", id=new_id, external_id=item.external_id)
+    for number, item, _, old in updates:
+        results[number] = schemas.JobBulkResult(row=number, status="updated", id=old.id, external_id=item.external_id)
+    return list(results.values())
+
+def sync(upload, content_type, employer_id):
+    results = []
+    seen = set()
+    rows = parse(upload, content_type)
+    db = database.SessionLocal()
+    try:
+        while True:
+            chunk = list(islice(rows, BULK_CHUNK_SIZE))
+            if not chunk:
+                break
+            valid = []
+            for number, raw in chunk:
+                item, error = _validate(number, raw)
+                if item is not None and item.external_id is not None:
+                    if item.external_id in seen:
+                        item, error = None, _error(number, ["duplicate external_id in this upload"])
+                    else:
+                        seen.add(item.external_id)
+                if error is not None:
+                    results.append(error)
+                else:
+                    valid.append((number, item))
+            if valid:
+                results.extend(_write_chunk(db, employer_id, valid))
+    finally:
+        db.close()
+
+    tally = Counter(result.status for result in results)
+    return schemas.JobBulkOut(
+        created=tally["created"], updated=tally["updated"], unchanged=tally["unchanged"], failed=tally["error"],
+        results=sorted(results, key=lambda r: r.row),
+    )
@@ -0,0 +1,223 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from fastapi import Response
+
+from . import events, search, filters
+
+# Response cache for the public job search. Bodies are cached as the exact
+# JSON bytes sent to clients, with a strong ETag so browsers revalidate
+# with If-None-Match and get a 304.
+#
+# Invalidation is precise rather than time-based: every cached page
+# remembers its filters and the (posted_at, id) range it covers, and a job
+# change only evicts the pages that job could appear on. The TTL is a
+# safety net for writes made by other worker processes.
+#
+# A page computed while a write is being invalidated could miss that write
+# and would then be cached stale. Every invalidation therefore bumps a
+# generation; callers read it before running the query and put() drops the
+# page if it has moved on since.
+
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "60"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "5000"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+class MemoryBackend:
+    """In-process LRU of bytes values with per-entry expiry.
+
+    Bounded by entry count and total size. Any object with the same
+    get/set/delete/clear methods (a Redis wrapper, say) can be passed to
+    ResponseCache instead.
+    """
+
+    def __init__(self, max_entries=RESPONSE_CACHE_MAX_ENTRIES, max_bytes=RESPONSE_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[0] <= time.monotonic():
+                self._drop(key)
+                return None
+            self._data.move_to_end(key)
+            return item[1]
+
+    def set(self, key, value, ttl):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            self._drop(key)
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._bytes += len(value)
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._data)))
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _drop(self, key):
+        item = self._data.pop(key, None)
+        if item is not None:
+            self._bytes -= len(item[1])
+
+    def usage(self):
+        return {"entries": len(self._data), "bytes": self._bytes, "evictions": self.evictions}
+
+class CachedPage:
+    """What a cached search page covers, for deciding which writes touch it."""
+
+    __slots__ = ("params", "job_filter", "newest", "oldest", "job_ids", "employer_ids")
+
+    def __init__(self, params, newest, oldest, jobs):
+        self.params = params
+        self.job_filter = filters.JobFilter.from_params(params)
+        # Keyset bounds: the page holds keys in [oldest, newest); None is open-ended
+        self.newest = newest
+        self.oldest = oldest
+        # jobs are the page's items (job dicts)
+        self.job_ids = {job["id"] for job in jobs}
+        self.employer_ids = {job["employer_id"] for job in jobs}
+
+    def affected_by(self, job):
+        if job is None:
+            return False
+        if job.id in self.job_ids:
+            return True
+        if not self.job_filter.matches(job):
+            return False
+        q = self.params.get("q")
+        if q:
+            # Relevance pages can reshuffle on any change to a matching posting
+            return bool(set(search.tokenize(q)) & job_terms(job))
+        key = (job.posted_at, job.id)
+        return (self.newest is None or key < self.newest) and (self.oldest is None or key >= self.oldest)
+
+def job_terms(job):
+    terms = set()
+    for field in search.FIELD_WEIGHTS:
+        terms.update(search.tokenize(getattr(job, field, None)))
+    return terms
+
+def make_etag(body):
+    return '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+class ResponseCache:
+    def __init__(self, backend=None, ttl=RESPONSE_CACHE_TTL, max_entries=RESPONSE_CACHE_MAX_ENTRIES):
+        self.backend = backend or MemoryBackend()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._pages = OrderedDict()  # key -> CachedPage
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+        self.generation = 0
+
+    @staticmethod
+    def key(namespace, params):
+        raw = "&".join(f"{k}={v}" for k, v in sorted(params.items()) if v is not None)
+        return f"{namespace}:{hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()}"
+
+    def get(self, key):
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        etag, body = value.split(b"\n", 1)
+        return etag.decode(), body
+
+    def put(self, key, page, body, generation=None):
+        """Cache body under key, unless an invalidation has happened since
+        generation (read before computing the page); returns the ETag."""
+        etag = make_etag(body)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return etag
+            self.backend.set(key, etag.encode() + b"\n" + body, self.ttl)
+            self._pages[key] = page
+            self._pages.move_to_end(key)
+            trimmed = []
+            while len(self._pages) > self.max_entries:
+                trimmed.append(self._pages.popitem(last=False)[0])
+        for stale in trimmed:
+            self.backend.delete(stale)
+        return etag
+
+    def _evict(self, predicate):
+        with self._lock:
+            self.generation += 1
+            stale = [key for key, page in self._pages.items() if predicate(page)]
+            for key in stale:
+                del self._pages[key]
+        for key in stale:
+            self.backend.delete(key)
+        self.invalidations += len(stale)
+
+    def invalidate_job(self, old, new):
+        self._evict(lambda page: page.affected_by(old) or page.affected_by(new))
+
+    def invalidate_employer(self, employer_id):
+        # Company names are shown on every posting and indexed for search
+        self._evict(lambda page: employer_id in page.employer_ids or page.params.get("q"))
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._pages.clear()
+        self.backend.clear()
+
+    def respond(self, request, etag, body, hit):
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Cache": "HIT" if hit else "MISS"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations,
+            "tracked_pages": len(self._pages),
+        }
+        if hasattr(self.backend, "usage"):
+            stats.update(self.backend.usage())
+        return stats
+
+job_search_cache = ResponseCache()
+
+@events.on_job_change
+def _follow_job(old, new):
+    job_search_cache.invalidate_job(old, new)
+
+@events.on_employer_change
+def _follow_employer(db, employer_id):
+    job_search_cache.invalidate_employer(employer_id)
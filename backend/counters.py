@@ -0,0 +1,183 @@
+import random
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, delete, func, insert as sql_insert
+from sqlalchemy.orm import Session
+from . import models
+
+# Materialised counters for the admin dashboard.
+#
+# COUNT(*) on InnoDB scans the whole table, so the dashboard reads these
+# small rows instead. Every write path that adds or removes a counted row
+# bumps the matching counters inside its own transaction, so they commit
+# or roll back together. reconcile() recomputes everything from the real
+# tables and is the fix for any drift (manual SQL, old data, bugs).
+#
+# Counters that every register, job post or apply touches (the totals, per
+# role, per status, per day) are sharded: each bump goes to one of SHARDS
+# rows, bucket "seeker#3" say, picked at random, so concurrent writers
+# rarely wait on each other's row lock. Reads add the shards up.
+# reconcile() folds them back into the plain bucket.
+
+USERS = "users"
+USERS_BY_ROLE = "users_by_role"
+SIGNUPS_PER_DAY = "signups_per_day"
+JOBS = "jobs"
+JOBS_BY_EMPLOYER = "jobs_by_employer"
+APPLICATIONS = "applications"
+APPLICATIONS_BY_STATUS = "applications_by_status"
+
+TOP_EMPLOYERS = 10
+SIGNUP_DAYS = 30
+SHARDS = 16
+SHARDED = {USERS, USERS_BY_ROLE, SIGNUPS_PER_DAY, JOBS, APPLICATIONS, APPLICATIONS_BY_STATUS}
+
+table = models.Counter.__table__
+
+def _upsert(dialect):
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table)
+        return stmt.on_duplicate_key_update(value=table.c.value + stmt.inserted.value)
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    stmt = insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.name, table.c.bucket],
+        set_={"value": table.c.value + stmt.excluded.value},
+    )
+
+def bump(db: Session, *deltas):
+    """Add to counters in the session's transaction; deltas are
+    (name, bucket, amount). One multi-row upsert, no read first."""
+    shard = f"#{random.randrange(SHARDS)}"
+    rows = [
+        {"name": name, "bucket": str(bucket) + shard if name in SHARDED else str(bucket), "value": amount}
+        for name, bucket, amount in deltas if amount
+    ]
+    if rows:
+        db.execute(_upsert(db.get_bind().dialect.name).values(rows))
+
+def _unsharded(bucket):
+    return bucket.partition("#")[0]
+
+def _status(status):
+    return getattr(status, "value", status)
+
+def _role(role):
+    return getattr(role, "value", role)
+
+# --- Write paths ---
+
+def user_created(db: Session, role):
+    today = datetime.now(timezone.utc).date().isoformat()
+    bump(db, (USERS, "", 1), (USERS_BY_ROLE, _role(role), 1), (SIGNUPS_PER_DAY, today, 1))
+
+def user_deleted(db: Session, role):
+    # Signups are history and stay counted
+    bump(db, (USERS, "", -1), (USERS_BY_ROLE, _role(role), -1))
+
+def job_created(db: Session, employer_id, amount=1):
+    bump(db, (JOBS, "", amount), (JOBS_BY_EMPLOYER, employer_id, amount))
+
+def job_deleted(db: Session, employer_id):
+    job_created(db, employer_id, -1)
+
+def application_created(db: Session, status=models.ApplicationStatus.applied):
+    bump(db, (APPLICATIONS, "", 1), (APPLICATIONS_BY_STATUS, _status(status), 1))
+
+def application_status_changed(db: Session, old, new):
+    if _status(old) != _status(new):
+        bump(db, (APPLICATIONS_BY_STATUS, _status(old), -1), (APPLICATIONS_BY_STATUS, _status(new), 1))
+
+# --- Reads ---
+
+def snapshot(db: Session):
+    """Dashboard stats; reads a bounded number of counter rows whatever
+    the size of the counted tables (the top employers through the
+    (name, value) index)."""
+    c = table.c
+    grouped = {name: {} for name in (USERS, JOBS, APPLICATIONS, USERS_BY_ROLE, APPLICATIONS_BY_STATUS)}
+    for name, bucket, value in db.execute(select(c.name, c.bucket, c.value).where(c.name.in_(list(grouped)))):
+        bucket = _unsharded(bucket)
+        grouped[name][bucket] = grouped[name].get(bucket, 0) + value
+
+    since = (datetime.now(timezone.utc).date() - timedelta(days=SIGNUP_DAYS - 1)).isoformat()
+    signups = {}
+    for bucket, value in db.execute(
+        select(c.bucket, c.value).where(c.name == SIGNUPS_PER_DAY, c.bucket >= since).order_by(c.bucket)
+    ):
+        signups[_unsharded(bucket)] = signups.get(_unsharded(bucket), 0) + value
+
+    top = db.execute(
+        select(c.bucket, c.value).where(c.name == JOBS_BY_EMPLOYER, c.value > 0)
+        .order_by(c.value.desc()).limit(TOP_EMPLOYERS)
+    ).all()
+    names = dict(db.execute(
+        select(models.Employer.id, models.Employer.company_name)
+        .where(models.Employer.id.in_([int(bucket) for bucket, _ in top]))
+    ).all()) if top else {}
+
+    return {
+        "total_users": grouped[USERS].get("", 0),
+        "total_jobs": grouped[JOBS].get("", 0),
+        "total_applications": grouped[APPLICATIONS].get("", 0),
+        "users_by_role": {bucket: value for bucket, value in grouped[USERS_BY_ROLE].items() if value},
+        "applications_by_status": {bucket: value for bucket, value in grouped[APPLICATIONS_BY_STATUS].items() if value},
+        "signups_per_day": signups,
+        "top_employers": [
+            {"employer_id": int(bucket), "company_name": names.get(int(bucket), "Unknown"), "jobs": value}
+            for bucket, value in top
+        ],
+    }
+
+# --- Reconciliation ---
+
+def recompute(db: Session):
+    """Exact counters from the real tables (full scans; batch use only)."""
+    rows = []
+    # Soft-deleted rows are uncounted when deleted (a deleted employer's
+    # jobs when the purge retires them); applications when purged
+    live_users = models.User.deleted_at.is_(None)
+    by_role = db.execute(select(models.User.role, func.count()).where(live_users).group_by(models.User.role)).all()
+    rows.append((USERS, "", sum(n for _, n in by_role)))
+    rows += [(USERS_BY_ROLE, _role(role), n) for role, n in by_role if role is not None]
+
+    day = func.date(models.User.created_at)
+    rows += [(SIGNUPS_PER_DAY, str(d), n) for d, n in db.execute(select(day, func.count()).group_by(day)) if d]
+
+    by_employer = db.execute(
+        select(models.Job.employer_id, func.count()).where(models.Job.deleted_at.is_(None))
+        .group_by(models.Job.employer_id)
+    ).all()
+    rows.append((JOBS, "", sum(n for _, n in by_employer)))
+    rows += [(JOBS_BY_EMPLOYER, employer_id, n) for employer_id, n in by_employer if employer_id is not None]
+
+    by_status = db.execute(
+        select(models.Application.status, func.count()).group_by(models.Application.status)
+    ).all()
+    rows.append((APPLICATIONS, "", sum(n for _, n in by_status)))
+    rows += [(APPLICATIONS_BY_STATUS, _status(status), n) for status, n in by_status if status is not None]
+    return {(name, str(bucket)): value for name, bucket, value in rows}
+
+def reconcile(db: Session):
+    """Replace every counter with recomputed values; returns the number of
+    counters that had drifted. Writes that race with this are recounted
+    on the next run."""
+    exact = recompute(db)
+    current = {}
+    for name, bucket, value in db.execute(select(table)):
+        key = (name, _unsharded(bucket) if name in SHARDED else bucket)
+        current[key] = current.get(key, 0) + value
+    # Signups are history: purged users leave the table but stay counted
+    for (name, bucket), value in current.items():
+        if name == SIGNUPS_PER_DAY and value > exact.get((name, bucket), 0):
+            exact[(name, bucket)] = value
+    drifted = sum(1 for key in exact.keys() | current.keys() if exact.get(key, 0) != current.get(key, 0))
+
+    db.execute(delete(table))
+    if exact:
+        db.execute(sql_insert(table), [{"name": n, "bucket": b, "value": v} for (n, b), v in exact.items()])
+    db.commit()
+    return drifted
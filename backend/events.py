@@ -0,0 +1,27 @@
+# In-process change notifications. Routers announce job and employer
+# changes after they commit; derived state (search index, response cache)
+# subscribes here instead of being called from every write path.
+
+_job_listeners = []
+_employer_listeners = []
+
+def on_job_change(listener):
+    _job_listeners.append(listener)
+    return listener
+
+def on_employer_change(listener):
+    _employer_listeners.append(listener)
+    return listener
+
+def job_changed(old, new):
+    # old is None for a new posting, new is None for a deletion. Both are
+    # JobOut-like snapshots (old may lack company_name). An archived job
+    # has left search, so listeners see it as deleted.
+    if new is not None and getattr(new, "archived", False):
+        new = None
+    for listener in _job_listeners:
+        listener(old, new)
+
+def employer_changed(db, employer_id):
+    for listener in _employer_listeners:
+        listener(db, employer_id)
@@ -0,0 +1,74 @@
+import csv
+import enum
+import io
+import json
+from datetime import date, datetime
+from typing import Literal
+from fastapi import Query
+from fastapi.responses import StreamingResponse
+from . import database
+
+# Streaming CSV / NDJSON exports.
+#
+# Rows are fetched in EXPORT_BATCH_SIZE batches through yield_per, which
+# makes SQLAlchemy use a server-side cursor (pymysql's SSCursor on MySQL),
+# and each batch is encoded and sent before the next is read. Memory stays
+# at one batch however large the export, and the CSV header goes out
+# before the query runs.
+
+EXPORT_BATCH_SIZE = 1000
+# Spreadsheets run a cell starting with one of these as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+def export_format(fmt: Literal["csv", "ndjson"] = Query("csv", alias="format")):
+    return fmt
+
+def _plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def _csv_cell(value):
+    # User-entered text (names, skills, titles) is defused with a leading
+    # quote, so opening the export cannot run it; NDJSON is left as is
+    value = _plain(value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+def _csv_chunk(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_cell(v) for v in row] for row in rows)
+    return buffer.getvalue().encode()
+
+def _ndjson_chunk(columns, rows):
+    return "".join(
+        json.dumps(dict(zip(columns, (_plain(v) for v in row))), ensure_ascii=False) + "\n" for row in rows
+    ).encode()
+
+def stream(query, fmt):
+    """Yield the encoded export of query in batches. Uses its own session:
+    the request's session is closed before a streamed body finishes."""
+    columns = [c["name"] for c in query.column_descriptions]
+    if fmt == "csv":
+        yield _csv_chunk([columns])
+
+    db = database.SessionLocal()
+    try:
+        result = db.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for batch in result.partitions():
+            yield _csv_chunk(batch) if fmt == "csv" else _ndjson_chunk(columns, batch)
+    finally:
+        db.close()
+
+def response(query, fmt, filename):
+    return StreamingResponse(
+        stream(query, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
@@ -0,0 +1,166 @@
+from collections import Counter
+from typing import Annotated, Optional
+from fastapi import HTTPException, Query
+from sqlalchemy import select, func, case, and_, or_
+from . import models, schemas, queries, normalize, geo
+
+# Structured filters on the job search, and the facet counts for them.
+#
+# A JobFilter is built from the query string (it is a FastAPI dependency)
+# and applied three ways: as SQL conditions on the listing, as a predicate
+# on indexed documents for ranked search, and by the response cache to
+# tell whether a job change can touch a cached page. The three must agree.
+#
+# Salary bounds are per year in one currency (DEFAULT_CURRENCY unless one
+# is given). salary_min keeps jobs that can pay at least that much (top of
+# the range, or the bottom for open-ended "60k+"); salary_max keeps jobs
+# starting at most that much.
+#
+# A location that names a gazetteer place matches every spelling of that
+# place ("Bengaluru" finds "Bangalore"); other text ("Remote") is matched
+# as a substring. near (a place or "lat,lon") with radius_km keeps jobs
+# at places within that distance (see geo.py).
+
+# Lower edges of the salary facet buckets
+SALARY_BUCKETS = (0, 30_000, 50_000, 75_000, 100_000, 150_000, 200_000)
+FACET_LOCATIONS = 20
+
+class JobFilter:
+    FIELDS = ("title", "location", "employment_type", "salary_min", "salary_max", "currency", "near", "radius_km")
+
+    def __init__(
+        self,
+        title: Optional[str] = None,
+        location: Optional[str] = None,
+        employment_type: Optional[schemas.EmploymentType] = None,
+        salary_min: Annotated[Optional[int], Query(ge=0)] = None,
+        salary_max: Annotated[Optional[int], Query(ge=0)] = None,
+        currency: Annotated[Optional[str], Query(min_length=3, max_length=3)] = None,
+        near: Optional[str] = None,
+        radius_km: Annotated[Optional[float], Query(gt=0, le=2000)] = None,
+    ):
+        self.title = title or None
+        self.location = location or None
+        self.employment_type = models.EmploymentType(employment_type) if employment_type else None
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+        if currency is None and (salary_min is not None or salary_max is not None):
+            currency = normalize.DEFAULT_CURRENCY
+        self.currency = currency.upper() if currency else None
+
+        self.place = geo.resolve(self.location) if self.location else None
+        self.near = near or None
+        self.radius_km = (radius_km or geo.DEFAULT_RADIUS_KM) if self.near else None
+        self.origin = None
+        self.geohashes = None  # allowed by near=, if given
+        if self.near:
+            self.origin = geo.origin(self.near)
+            if self.origin is None:
+                raise HTTPException(status_code=422, detail=f"Unknown place: {self.near}")
+            self.geohashes = {place.geohash for place in geo.gazetteer().within(*self.origin, self.radius_km)}
+
+    @classmethod
+    def from_params(cls, params):
+        return cls(**{field: params.get(field) for field in cls.FIELDS})
+
+    def params(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __bool__(self):
+        return any(value is not None for value in self.params().values())
+
+    def where(self, query):
+        job = models.Job
+        if self.title:
+            query = query.where(job.title.contains(self.title, autoescape=True))
+        if self.place:
+            query = query.where(job.geohash == self.place.geohash)
+        elif self.location:
+            query = query.where(job.location.contains(self.location, autoescape=True))
+        if self.geohashes is not None:
+            query = query.where(job.geohash.in_(sorted(self.geohashes)))
+        if self.employment_type:
+            query = query.where(job.employment_type == self.employment_type)
+        if self.currency:
+            query = query.where(job.salary_currency == self.currency)
+        if self.salary_min is not None:
+            query = query.where(or_(
+                job.salary_max >= self.salary_min,
+                and_(job.salary_max.is_(None), job.salary_min >= self.salary_min),
+            ))
+        if self.salary_max is not None:
+            query = query.where(or_(
+                job.salary_min <= self.salary_max,
+                and_(job.salary_min.is_(None), job.salary_max <= self.salary_max),
+            ))
+        return query
+
+    def matches(self, job):
+        """The same test as where(), on anything with the JobOut attributes."""
+        if self.title and self.title.lower() not in (job.title or "").lower():
+            return False
+        if self.place:
+            if job.geohash != self.place.geohash:
+                return False
+        elif self.location and self.location.lower() not in (job.location or "").lower():
+            return False
+        if self.geohashes is not None and job.geohash not in self.geohashes:
+            return False
+        if self.employment_type and job.employment_type != self.employment_type:
+            return False
+        if self.currency and job.salary_currency != self.currency:
+            return False
+        top = job.salary_max if job.salary_max is not None else job.salary_min
+        if self.salary_min is not None and (top is None or top < self.salary_min):
+            return False
+        bottom = job.salary_min if job.salary_min is not None else job.salary_max
+        if self.salary_max is not None and (bottom is None or bottom > self.salary_max):
+            return False
+        return True
+
+    def annotate(self, jobs):
+        """Set distance_km on page items (job dicts) when searching near a point."""
+        if self.origin is None:
+            return
+        places = geo.gazetteer().places
+        for job in jobs:
+            place = places.get(job["place_id"])
+            if place is not None:
+                job["distance_km"] = round(geo.distance_km(*self.origin, place.latitude, place.longitude), 1)
+
+def _salary_bucket():
+    job = models.Job
+    value = func.coalesce(job.salary_min, job.salary_max)
+    return case(*((value >= edge, edge) for edge in reversed(SALARY_BUCKETS)), else_=None)
+
+# Facets come from one grouped query over all three keys; the per-facet
+# totals are summed up from its rows, so the database scans the matching
+# jobs once rather than once per facet.
+
+def facet_query(job_filter):
+    job = models.Job
+    bucket = _salary_bucket().label("bucket")
+    return job_filter.where(
+        select(job.employment_type, job.location, job.salary_currency, bucket, func.count().label("n"))
+        .where(queries.live_job(), queries.hot_job())
+    ).group_by(job.employment_type, job.location, job.salary_currency, bucket)
+
+def facets_out(rows):
+    total, types, locations, salaries = 0, Counter(), Counter(), Counter()
+    for row in rows:
+        total += row.n
+        types[row.employment_type.value if row.employment_type else None] += row.n
+        locations[row.location] += row.n
+        if row.salary_currency is not None and row.bucket is not None:
+            salaries[row.salary_currency, row.bucket] += row.n
+
+    edges = dict(zip(SALARY_BUCKETS, SALARY_BUCKETS[1:]))
+    return schemas.JobFacets(
+        total=total,
+        employment_type=[schemas.FacetCount(value=v, count=n) for v, n in types.most_common()],
+        location=[schemas.FacetCount(value=v, count=n) for v, n in locations.most_common(FACET_LOCATIONS)],
+        salary=[
+            schemas.SalaryBucket(currency=currency, min=low, max=edges.get(low), count=salaries[currency, low])
+            for currency, low in sorted(salaries)
+        ],
+    )
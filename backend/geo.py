@@ -0,0 +1,186 @@
+import bisect
+import csv
+import math
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+# Offline location resolution and radius search.
+#
+# Free-text locations ("Bangalore, India", "Bengaluru", "NYC") resolve
+# against the bundled gazetteer (data/places.csv: one row per place with
+# its aliases) to a canonical place and its coordinates; no geocoding
+# service is called. Jobs store the place id and its geohash. Edit
+# places.csv, not places_v10.csv: that is migration 10's own snapshot.
+#
+# A radius query covers the circle with a handful of geohash cells, finds
+# the places in those cells by prefix in the gazetteer's sorted geohash
+# list, keeps those within the exact great-circle distance, and hands the
+# jobs query their geohashes: an indexed IN on jobs.geohash, however many
+# jobs there are. Job coordinates are always a gazetteer place, so
+# filtering places is filtering jobs exactly.
+
+GAZETTEER_PATH = Path(os.getenv("GAZETTEER_PATH", Path(__file__).parent / "data" / "places.csv"))
+GEOHASH_PRECISION = 9  # ~5 m cells
+EARTH_RADIUS_KM = 6371.0088
+DEFAULT_RADIUS_KM = 25.0
+# Most geohash cells a radius query is covered with
+MAX_COVER_CELLS = 16
+# Longest run of words tried as a place name ("salt lake city")
+MAX_NAME_WORDS = 4
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_COORDINATES = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+class Place(NamedTuple):
+    id: str
+    name: str
+    country: str
+    latitude: float
+    longitude: float
+    geohash: str
+
+# --- Geohash ---
+
+def encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        ranges, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (ranges[0] + ranges[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            ranges[0] = middle
+        else:
+            ranges[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+def _cell_size(precision):
+    # (height, width) in degrees of a cell with this many characters
+    lon_bits = (5 * precision + 1) // 2
+    return 180.0 / 2 ** (5 * precision - lon_bits), 360.0 / 2 ** lon_bits
+
+def cover(latitude, longitude, radius_km):
+    """Geohash prefixes whose cells together contain the circle."""
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(latitude))
+    d_lon = 180.0 if cos_lat < 1e-6 else min(180.0, d_lat / cos_lat)
+    south, north = max(-90.0, latitude - d_lat), min(90.0, latitude + d_lat)
+
+    # The finest precision that still needs only a few cells
+    precision = 1
+    for p in range(GEOHASH_PRECISION, 0, -1):
+        height, width = _cell_size(p)
+        if (math.ceil((north - south) / height) + 1) * (math.ceil(2 * d_lon / width) + 1) <= MAX_COVER_CELLS:
+            precision = p
+            break
+    height, width = _cell_size(precision)
+
+    cells = set()
+    lat = south
+    while True:
+        lon = longitude - d_lon
+        while True:
+            cells.add(encode(lat, (lon + 180.0) % 360.0 - 180.0, precision))
+            if lon >= longitude + d_lon:
+                break
+            lon = min(lon + width, longitude + d_lon)
+        if lat >= north:
+            break
+        lat = min(lat + height, north)
+    return cells
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """Great-circle (haversine) distance."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+# --- Gazetteer ---
+
+def normalize_name(text):
+    # "São Paulo, SP" -> "sao paulo sp"
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return " ".join(re.findall(r"[a-z0-9]+", text))
+
+class Gazetteer:
+    def __init__(self, rows):
+        self.places = {}
+        self.by_name = {}
+        for row in rows:
+            place = Place(row["id"], row["name"], row["country"], float(row["latitude"]), float(row["longitude"]),
+                          encode(float(row["latitude"]), float(row["longitude"])))
+            self.places[place.id] = place
+            for name in [row["name"], *(row.get("aliases") or "").split("|")]:
+                # Earlier rows win an ambiguous name
+                if normalize_name(name):
+                    self.by_name.setdefault(normalize_name(name), place)
+        # The prefix index: places sorted by geohash
+        self.sorted = sorted(self.places.values(), key=lambda p: p.geohash)
+        self.geohashes = [place.geohash for place in self.sorted]
+
+    @classmethod
+    def load(cls, path=GAZETTEER_PATH):
+        with open(path, encoding="utf-8", newline="") as f:
+            return cls(csv.DictReader(f))
+
+    def resolve(self, text):
+        """The place a free-text location names, or None. Tries the longest
+        runs of words first, so "Whitefield, Bangalore, India" finds
+        Bangalore and "New York, NY" finds New York."""
+        words = normalize_name(text or "").split()[:12]
+        for n in range(min(MAX_NAME_WORDS, len(words)), 0, -1):
+            for start in range(len(words) - n + 1):
+                place = self.by_name.get(" ".join(words[start:start + n]))
+                if place is not None:
+                    return place
+        return None
+
+    def within(self, latitude, longitude, radius_km):
+        """Places within radius_km of the point."""
+        found = []
+        for prefix in cover(latitude, longitude, radius_km):
+            start = bisect.bisect_left(self.geohashes, prefix)
+            end = bisect.bisect_left(self.geohashes, prefix + "~")
+            found.extend(
+                place for place in self.sorted[start:end]
+                if distance_km(latitude, longitude, place.latitude, place.longitude) <= radius_km
+            )
+        return found
+
+@lru_cache(maxsize=1)
+def gazetteer():
+    return Gazetteer.load()
+
+@lru_cache(maxsize=65536)
+def resolve(text):
+    return gazetteer().resolve(text)
+
+def origin(text):
+    """(latitude, longitude) of a place name or a "lat,lon" pair, or None."""
+    match = _COORDINATES.match(text or "")
+    if match:
+        latitude, longitude = float(match.group(1)), float(match.group(2))
+        if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+            return latitude, longitude
+        return None
+    place = resolve(text)
+    return (place.latitude, place.longitude) if place else None
+
+FIELDS = ("place_id", "geohash")
+
+def derived(location):
+    """The place columns for a job or employer at this free-text location."""
+    place = resolve(location) if location else None
+    return {"place_id": place.id if place else None, "geohash": place.geohash if place else None}
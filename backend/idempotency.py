@@ -0,0 +1,78 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from fastapi import HTTPException
+
+# Idempotency-Key support for retried writes.
+#
+# The first request with a key runs the handler; repeats within the TTL get
+# the same result (or the same HTTP error) without touching the database.
+# A repeat that arrives while the first is still running waits for it
+# rather than racing it. Keys live in process memory, so a retry routed to
+# another worker runs again and relies on the unique constraints instead.
+
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "3600"))
+IDEMPOTENCY_MAX_KEYS = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000"))
+# How long a repeat waits for the original request to finish
+IDEMPOTENCY_WAIT_SECONDS = 30
+
+class _Entry:
+    __slots__ = ("done", "expires_at", "result", "error")
+
+    def __init__(self, expires_at):
+        self.done = threading.Event()
+        self.expires_at = expires_at
+        self.result = None
+        self.error = None
+
+class IdempotencyStore:
+    def __init__(self, ttl=IDEMPOTENCY_TTL_SECONDS, max_keys=IDEMPOTENCY_MAX_KEYS):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def run(self, key, fn):
+        """Return (result, replayed). HTTPExceptions are replayed as well;
+        other errors are not remembered, so the client can retry."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= now:
+                del self._entries[key]
+                entry = None
+            owner = entry is None
+            if owner:
+                entry = self._entries[key] = _Entry(now + self.ttl)
+                while len(self._entries) > self.max_keys:
+                    self._entries.popitem(last=False)
+
+        if not owner:
+            if not entry.done.wait(IDEMPOTENCY_WAIT_SECONDS):
+                raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+            if entry.error is not None:
+                raise entry.error
+            return entry.result, True
+
+        try:
+            entry.result = fn()
+            return entry.result, False
+        except HTTPException as e:
+            entry.error = e
+            raise
+        except Exception:
+            # Waiters get told to retry; the key is forgotten so the retry runs
+            entry.error = HTTPException(status_code=409, detail="The original request with this Idempotency-Key failed")
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            raise
+        finally:
+            entry.done.set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+store = IdempotencyStore()
@@ -1,16 +1,33 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from pathlib import Path
+from fastapi.responses import FileResponse, PlainTextResponse
 
-from .database import engine, Base
-from .routers import auth, seeker, employer, admin
+from .routers import auth, seeker, employer, admin, health
+from . import scheduler, purge, archive, metrics, profiling, passwords, database, assets
 
-# Initialize Database (Ensures tables exist, though we have init_tables.py too)
-Base.metadata.create_all(bind=engine)
+# Importing this module has no side effects: no connection is opened until
+# a request needs one, and the schema is created and upgraded by
+# `python migrate.py`, run once per deploy rather than by every worker.
+# /health/ready reports a worker whose database is down or not migrated.
 
-app = FastAPI(title="Job Portal API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background removal of soft-deleted rows and archiving of expired jobs
+    tasks = [
+        scheduler.start("purge", purge.purge_pending, purge.PURGE_INTERVAL_SECONDS),
+        scheduler.start("archive", archive.archive_expired, archive.ARCHIVE_INTERVAL_SECONDS),
+    ]
+    app.state.ready = True
+    yield
+    # Out of rotation first, then stop the background work and close pools
+    app.state.ready = False
+    await scheduler.stop(*tasks)
+    passwords.shutdown_pool()
+    await database.dispose()
+
+app = FastAPI(title="Job Portal API", lifespan=lifespan)
 
 # CORS Setup
 origins = ["*"] # Allow all for simplicity in development
@@ -23,18 +40,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Admin-requested profiles of single requests (X-Profile: 1)
+app.add_middleware(profiling.ProfilingMiddleware)
+# Per-route latency, SQL and response size; added last so it is outermost
+# and times the whole stack
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Include Routers
 app.include_router(auth.router)
 app.include_router(seeker.router)
 app.include_router(employer.router)
 app.include_router(admin.router)
+app.include_router(health.router)
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics(authorization: Optional[str] = Header(None)):
+    # Scraper only (METRICS_TOKEN); invisible to everyone else
+    if not metrics.scrape_allowed(authorization):
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
 
-# Serve frontend static files (so visiting http://127.0.0.1:8000 loads the SPA)
-BASE_DIR = Path(__file__).resolve().parent.parent
-FRONTEND_DIR = BASE_DIR / "frontend"
+# Serve frontend static files (so visiting http://127.0.0.1:8000 loads the SPA):
+# the build_assets.py output when there is one, else frontend/ as is
+FRONTEND_DIR = assets.frontend_dir()
 
 # Mount static files at root as a fallback for any non-API path
-app.mount("/", StaticFiles(directory=str(FRONTEND_DIR), html=True), name="frontend")
+app.mount("/", assets.PrecompressedStaticFiles(directory=str(FRONTEND_DIR), html=True), name="frontend")
 
 # Optional explicit root route that returns index.html (exact match takes precedence)
 @app.get("/")
@@ -0,0 +1,111 @@
+import math
+import zlib
+from collections import Counter
+from functools import lru_cache
+import numpy as np
+from sqlalchemy import select, update, bindparam
+from sqlalchemy.orm import Session
+
+from . import models
+from .search import tokenize
+
+# Skill matching between a job and its applicants.
+#
+# Texts become sparse term vectors over a fixed hashed feature space
+# (1 + log tf per stemmed term), cached per text so a seeker's profile is
+# tokenized once however many jobs they apply to. Scoring a batch of
+# applicants is a handful of numpy operations: one gather from the dense
+# job vector and a segmented sum per applicant.
+#
+# A score depends only on the job's text and the applicant's profile, so
+# it is stored on the application (applications.match_score) and ranked
+# listings page over it in SQL. It starts out NULL; changing the job's
+# title or description or the seeker's skills or experience sets it back
+# to NULL, and fill_scores() scores the NULL ones of a job before its
+# applicants are listed by match.
+
+FEATURE_BITS = 18
+FEATURES = 1 << FEATURE_BITS
+_EMPTY = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32))
+
+@lru_cache(maxsize=65536)
+def term_vector(text):
+    """(feature indices, weights) for a text; indices are unique."""
+    counts = Counter(zlib.crc32(term.encode()) & (FEATURES - 1) for term in tokenize(text))
+    if not counts:
+        return _EMPTY
+    idx = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    weights = np.fromiter((1.0 + math.log(n) for n in counts.values()), dtype=np.float32, count=len(counts))
+    return idx, weights
+
+def profile_text(skills, experience):
+    return " ".join(part for part in (skills, experience) if part)
+
+def job_text(title, description):
+    return f"{title or ''} {description or ''}"
+
+def scores(job_text, profiles):
+    """Cosine similarity of each profile text to the job text."""
+    if not profiles:
+        return np.zeros(0, dtype=np.float32)
+    job_idx, job_weights = term_vector(job_text)
+    job_norm = np.linalg.norm(job_weights)
+    vectors = [term_vector(text) for text in profiles]
+    lengths = np.fromiter((len(idx) for idx, _ in vectors), dtype=np.int64, count=len(vectors))
+    if not job_norm or not lengths.sum():
+        return np.zeros(len(profiles), dtype=np.float32)
+    job = np.zeros(FEATURES, dtype=np.float32)
+    job[job_idx] = job_weights
+    idx = np.concatenate([v[0] for v in vectors])
+    weights = np.concatenate([v[1] for v in vectors])
+
+    # Segmented sums over each profile's slice; empty profiles score 0
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    nonempty = lengths > 0
+    dots = np.zeros(len(profiles), dtype=np.float32)
+    norms = np.ones(len(profiles), dtype=np.float32)
+    dots[nonempty] = np.add.reduceat(job[idx] * weights, starts[nonempty])
+    norms[nonempty] = np.sqrt(np.add.reduceat(weights * weights, starts[nonempty]))
+    return dots / (norms * job_norm)
+
+# --- Stored scores ---
+
+SCORE_BATCH_SIZE = 1000
+
+def forget_job_scores(db: Session, job_ids):
+    """The jobs' text changed: their applications are scored again."""
+    app = models.Application
+    db.execute(update(app).where(app.job_id.in_(job_ids))
+               .values(match_score=None).execution_options(synchronize_session=False))
+
+def forget_seeker_scores(db: Session, seeker_id):
+    """The seeker's profile changed: their applications are scored again."""
+    app = models.Application
+    db.execute(update(app).where(app.seeker_id == seeker_id)
+               .values(match_score=None).execution_options(synchronize_session=False))
+
+def fill_scores(db: Session, job_id, employer_id):
+    """Score and store the applications of the employer's job that have no
+    score, a batch per transaction."""
+    app, job, seeker = models.Application, models.Job, models.JobSeeker
+    table = app.__table__
+    store = update(table).where(table.c.id == bindparam("app_id")).values(match_score=bindparam("score"))
+    while True:
+        # Locked: a listing running at the same time waits, then finds
+        # these scored
+        rows = db.execute(
+            select(app.id, job.title, job.description, seeker.skills, seeker.experience)
+            .join(job, job.id == app.job_id)
+            .outerjoin(seeker, seeker.id == app.seeker_id)
+            .where(app.job_id == job_id, job.employer_id == employer_id, app.match_score.is_(None))
+            .limit(SCORE_BATCH_SIZE)
+            .with_for_update(of=app)
+        ).all()
+        if not rows:
+            return
+        result = scores(job_text(rows[0].title, rows[0].description),
+                        [profile_text(row.skills, row.experience) for row in rows])
+        db.execute(store, [{"app_id": row.id, "score": round(float(score), 6)} for row, score in zip(rows, result)])
+        db.commit()
+        if len(rows) < SCORE_BATCH_SIZE:
+            return
@@ -0,0 +1,220 @@
+import hmac
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Per-route request metrics, served in Prometheus text format on /metrics.
+#
+# MetricsMiddleware is a plain ASGI middleware (no BaseHTTPMiddleware task
+# and body buffering): it times each request, counts response bytes and, on
+# the way out, files them under the matched route template ("/seeker/jobs/
+# {job_id}", never the raw path, so label cardinality stays bounded). SQL is
+# counted by engine-wide cursor hooks that add to the current request's
+# RequestStats through a contextvar; the threadpool and SQLAlchemy's async
+# greenlets both carry the context along, so sync and async routes are
+# covered. Statements outside a request (the purge, the archiver) are not
+# counted.
+#
+# Requests slower than SLOW_REQUEST_SECONDS are logged with their
+# statements, which is where an N+1 shows up: one route, hundreds of
+# near-identical SELECTs.
+#
+# The endpoint is only for the scraper: it answers requests carrying
+# "Authorization: Bearer $METRICS_TOKEN" (Prometheus' bearer token
+# setting) and is not served at all while METRICS_TOKEN is unset.
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", "1.0"))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+# Statements kept per request for the slow log (all are counted)
+MAX_LOGGED_STATEMENTS = 50
+MAX_STATEMENT_CHARS = 200
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+def scrape_allowed(authorization):
+    """Whether an Authorization header value may read /metrics."""
+    if not METRICS_TOKEN:
+        return False
+    scheme, _, token = (authorization or "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(token.strip().encode(), METRICS_TOKEN.encode())
+
+class RequestStats:
+    __slots__ = ("statements", "sql_seconds", "logged", "started")
+
+    def __init__(self):
+        self.statements = 0
+        self.sql_seconds = 0.0
+        self.logged = []  # (statement, seconds), the first MAX_LOGGED_STATEMENTS
+        self.started = None
+
+_current = ContextVar("request_stats", default=None)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None:
+        stats.started = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None or stats.started is None:
+        return
+    elapsed = time.perf_counter() - stats.started
+    stats.started = None
+    stats.statements += 1
+    stats.sql_seconds += elapsed
+    if len(stats.logged) < MAX_LOGGED_STATEMENTS:
+        stats.logged.append((statement, elapsed))
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # the last one is +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+class RouteMetrics:
+    __slots__ = ("latency", "statements", "requests", "errors", "sql_statements", "sql_seconds", "response_bytes")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.requests = 0
+        self.errors = 0  # 5xx responses
+        self.sql_statements = 0
+        self.sql_seconds = 0.0
+        self.response_bytes = 0
+
+class Registry:
+    def __init__(self):
+        self.routes = {}  # (method, route template) -> RouteMetrics
+        self._lock = threading.Lock()
+
+    def record(self, method, route, status, seconds, response_bytes, stats):
+        with self._lock:
+            metrics = self.routes.get((method, route))
+            if metrics is None:
+                metrics = self.routes[(method, route)] = RouteMetrics()
+            metrics.requests += 1
+            metrics.errors += status >= 500
+            metrics.latency.observe(seconds)
+            metrics.statements.observe(stats.statements)
+            metrics.sql_statements += stats.statements
+            metrics.sql_seconds += stats.sql_seconds
+            metrics.response_bytes += response_bytes
+
+    def clear(self):
+        with self._lock:
+            self.routes.clear()
+
+    def render(self):
+        """The metrics in Prometheus text exposition format."""
+        with self._lock:
+            routes = sorted(self.routes.items())
+            lines = []
+            _histogram(lines, "http_request_duration_seconds", "Request latency by route.",
+                       [(key, m.latency) for key, m in routes])
+            _histogram(lines, "http_request_sql_statements", "SQL statements per request by route.",
+                       [(key, m.statements) for key, m in routes])
+            for name, help_text, attr in (
+                ("http_requests_total", "Requests by route.", "requests"),
+                ("http_request_errors_total", "5xx responses by route.", "errors"),
+                ("http_sql_statements_total", "SQL statements run by route.", "sql_statements"),
+                ("http_sql_seconds_total", "Time spent in SQL statements by route.", "sql_seconds"),
+                ("http_response_bytes_total", "Response body bytes by route.", "response_bytes"),
+            ):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for key, m in routes:
+                    lines.append(f"{name}{{{_labels(key)}}} {_number(getattr(m, attr))}")
+        return "\n".join(lines) + "\n"
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(key):
+    method, route = key
+    return f'method="{_escape(method)}",route="{_escape(route)}"'
+
+def _number(value):
+    return repr(round(value, 6)) if isinstance(value, float) else str(value)
+
+def _histogram(lines, name, help_text, histograms):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key, histogram in histograms:
+        labels = _labels(key)
+        total = 0
+        for bound, count in zip(histogram.bounds + ("+Inf",), histogram.counts):
+            total += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {total}')
+        lines.append(f"{name}_sum{{{labels}}} {_number(histogram.sum)}")
+        lines.append(f"{name}_count{{{labels}}} {total}")
+
+registry = Registry()
+
+def route_template(scope):
+    # Set by the router once an API route matched. Everything else (the
+    # frontend's static files, unknown paths) shares one label.
+    path = getattr(scope.get("route"), "path", None)
+    return path if path is not None else "<other>"
+
+class MetricsMiddleware:
+    def __init__(self, app, registry=registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status = 500
+        response_bytes = 0
+
+        async def send_wrapper(message):
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+            route = route_template(scope)
+            self.registry.record(scope["method"], route, status, elapsed, response_bytes, stats)
+            if elapsed >= SLOW_REQUEST_SECONDS:
+                _log_slow(scope["method"], route, status, elapsed, stats)
+
+def _log_slow(method, route, status, elapsed, stats):
+    statements = "".join(
+        f"\n  {seconds * 1000:8.1f} ms  {' '.join(statement.split())[:MAX_STATEMENT_CHARS]}"
+        for statement, seconds in stats.logged
+    )
+    more = stats.statements - len(stats.logged)
+    logger.warning(
+        "slow request %s %s -> %s in %.0f ms; %d SQL statements in %.0f ms%s%s",
+        method, route, status, elapsed * 1000, stats.statements, stats.sql_seconds * 1000,
+        statements, f"\n  ... {more} more" if more > 0 else "",
+    )
@@ -0,0 +1,404 @@
+import csv
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from sqlalchemy import Column, Integer, BigInteger, Double, String, Enum, MetaData, Table, Index, inspect, select, update, bindparam, text, func
+from . import models
+from .models import Timestamp
+
+# Versioned schema migrations, run with `python migrate.py`.
+#
+# Each migration runs in its own transaction and is recorded in the
+# schema_version table. MySQL commits DDL implicitly, so a failed step may
+# be half applied; steps therefore inspect the live schema before changing
+# it and can simply be re-run. That also makes them safe on a fresh
+# database (where create_all in step 1 already builds the current schema)
+# and on databases patched by the old scripts.
+# Add new steps at the end with the next version number; never renumber,
+# and never change a step once released: fix things in a new step. Data
+# steps spell out their SQL instead of calling app code (counters.py and
+# the like), which moves on with the models while the step must keep
+# doing what it did against the schema of its time. Steps that parse
+# (9, 10) carry a copy of the parsing as it was released, and of the data
+# it read (data/places_v10.csv), and declare the tables and columns they
+# touch rather than using the models'.
+
+_meta = MetaData()
+schema_version = Table(
+    "schema_version", _meta,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", Timestamp, server_default=func.now()),
+)
+
+MIGRATIONS = []
+BACKFILL_BATCH_SIZE = 1000
+
+def migration(version, name):
+    def register(fn):
+        assert not MIGRATIONS or MIGRATIONS[-1][0] < version, "migrations must be added in order"
+        MIGRATIONS.append((version, name, fn))
+        return fn
+    return register
+
+def _has_column(conn, table, column):
+    return column in {c["name"] for c in inspect(conn).get_columns(table)}
+
+def _has_index(conn, table, name):
+    return name in {i["name"] for i in inspect(conn).get_indexes(table)}
+
+def _create_index(conn, table, name, *columns):
+    # Indexes the models still declare may be created from them; superseded
+    # ones (later dropped again) and those of frozen steps are spelled out
+    # with their columns
+    if not _has_index(conn, table, name):
+        if columns:
+            conn.execute(text(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"))
+        else:
+            index = next(i for i in models.Base.metadata.tables[table].indexes if i.name == name)
+            index.create(bind=conn)
+
+def _drop_index(conn, table, name):
+    if _has_index(conn, table, name):
+        # DROP INDEX needs only the names (MySQL also wants the table)
+        Index(name, Table(table, MetaData(), Column("id", Integer)).c.id).drop(bind=conn)
+
+def _add_nullable_column(conn, column):
+    # column is declared in the step's own Table; its type is compiled for
+    # this database's dialect
+    table = column.table.name
+    if not _has_column(conn, table, column.name):
+        column_type = column.type.compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column.name} {column_type} DEFAULT NULL"))
+
+def _backfill(conn, table, sources, fields, derive):
+    # Set fields to derive(*sources) on every row, a batch of ids at a time
+    stmt = update(table).where(table.c.id == bindparam("row_id")).values(
+        {name: bindparam(f"new_{name}") for name in fields}
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(table.c.id, *sources).where(table.c.id > last_id).order_by(table.c.id).limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        conn.execute(stmt, [
+            {"row_id": row.id, **{f"new_{name}": value for name, value in derive(*row[1:]).items()}}
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+@migration(1, "create tables")
+def create_tables(conn):
+    models.Base.metadata.create_all(bind=conn)
+
+@migration(2, "jobs.closing_date")
+def add_closing_date(conn):
+    if not _has_column(conn, "jobs", "closing_date"):
+        conn.execute(text("ALTER TABLE jobs ADD COLUMN closing_date DATETIME DEFAULT NULL"))
+
+@migration(3, "users.token_version")
+def add_token_version(conn):
+    if not _has_column(conn, "users", "token_version"):
+        conn.execute(text("ALTER TABLE users ADD COLUMN token_version INT NOT NULL DEFAULT 0"))
+
+@migration(4, "query indexes and unique applications")
+def add_query_indexes(conn):
+    # Earlier versions could record the same application twice; keep the
+    # first before the unique index goes on. The derived table is needed
+    # because MySQL cannot select from the table it is deleting from.
+    if not _has_index(conn, "applications", "uq_applications_job_seeker"):
+        conn.execute(text(
+            "DELETE FROM applications WHERE id NOT IN ("
+            "SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM applications GROUP BY job_id, seeker_id) AS keep)"
+        ))
+    _create_index(conn, "applications", "uq_applications_job_seeker")
+    _create_index(conn, "applications", "ix_applications_job_applied_at_id")
+    _create_index(conn, "applications", "ix_applications_seeker_applied_at_id")
+    _create_index(conn, "jobs", "ix_jobs_posted_at_id", "posted_at", "id")
+    _create_index(conn, "jobs", "ix_jobs_employer_posted_at_id")
+    _create_index(conn, "users", "ix_users_created_at_id", "created_at", "id")
+
+# The counters table as migration 5 created it
+_counters_v5 = Table(
+    "counters", MetaData(),
+    Column("name", String(50), primary_key=True),
+    Column("bucket", String(100), primary_key=True, default=""),
+    Column("value", BigInteger, nullable=False, default=0),
+)
+
+def _count(name, bucket, source, where="", group_by=""):
+    # INSERT INTO counters the counts of one counter, from plain SQL
+    where = f" WHERE {where}" if where else ""
+    group_by = f" GROUP BY {group_by}" if group_by else ""
+    return text(f"INSERT INTO counters (name, bucket, value) SELECT '{name}', {bucket}, COUNT(*) FROM {source}{where}{group_by}")
+
+# Statuses are stored by enum name and counted by value
+_STATUS_VALUE = "CASE status WHEN 'applied' THEN 'Applied' WHEN 'accepted' THEN 'Accepted' WHEN 'rejected' THEN 'Rejected' END"
+
+@migration(5, "counters")
+def populate_counters(conn):
+    _counters_v5.create(bind=conn, checkfirst=True)
+    conn.execute(text("DELETE FROM counters"))
+    for stmt in (
+        _count("users", "''", "users"),
+        _count("users_by_role", "role", "users", "role IS NOT NULL", "role"),
+        _count("signups_per_day", "DATE(created_at)", "users", "created_at IS NOT NULL", "DATE(created_at)"),
+        _count("jobs", "''", "jobs"),
+        _count("jobs_by_employer", "CAST(employer_id AS CHAR)", "jobs", "employer_id IS NOT NULL", "employer_id"),
+        _count("applications", "''", "applications"),
+        _count("applications_by_status", _STATUS_VALUE, "applications", "status IS NOT NULL", "status"),
+    ):
+        conn.execute(stmt)
+
+@migration(6, "jobs.external_id")
+def add_external_id(conn):
+    if not _has_column(conn, "jobs", "external_id"):
+        conn.execute(text("ALTER TABLE jobs ADD COLUMN external_id VARCHAR(255) DEFAULT NULL"))
+    _create_index(conn, "jobs", "uq_jobs_employer_external_id")
+
+@migration(7, "soft delete")
+def add_deleted_at(conn):
+    for table in ("users", "jobs"):
+        if not _has_column(conn, table, "deleted_at"):
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN deleted_at DATETIME DEFAULT NULL"))
+    _create_index(conn, "users", "ix_users_deleted_at_created_at_id")
+    _create_index(conn, "jobs", "ix_jobs_deleted_at_posted_at_id", "deleted_at", "posted_at", "id")
+    # What the counters count changed: deleted rows are left out. Signups
+    # are history and stay as they are.
+    conn.execute(text("DELETE FROM counters WHERE name <> 'signups_per_day'"))
+    for stmt in (
+        _count("users", "''", "users", "deleted_at IS NULL"),
+        _count("users_by_role", "role", "users", "deleted_at IS NULL AND role IS NOT NULL", "role"),
+        _count("jobs", "''", "jobs", "deleted_at IS NULL"),
+        _count("jobs_by_employer", "CAST(employer_id AS CHAR)", "jobs",
+               "deleted_at IS NULL AND employer_id IS NOT NULL", "employer_id"),
+        _count("applications", "''", "applications"),
+        _count("applications_by_status", _STATUS_VALUE, "applications", "status IS NOT NULL", "status"),
+    ):
+        conn.execute(stmt)
+
+@migration(8, "jobs.archived")
+def add_archived(conn):
+    if not _has_column(conn, "jobs", "archived"):
+        conn.execute(text("ALTER TABLE jobs ADD COLUMN archived BOOLEAN NOT NULL DEFAULT 0"))
+    _create_index(conn, "jobs", "ix_jobs_hot_posted_at_id")
+    _create_index(conn, "jobs", "ix_jobs_archived_closing_date")
+    # Superseded by the indexes leading with deleted_at / archived
+    _drop_index(conn, "jobs", "ix_jobs_deleted_at_posted_at_id")
+    _drop_index(conn, "jobs", "ix_jobs_posted_at_id")
+    _drop_index(conn, "users", "ix_users_created_at_id")
+
+# Migration 9: the jobs columns it added and the job_type / salary_range
+# parsing of normalize.py as released with it. Employment types are
+# stored by enum name.
+_jobs_v9 = Table(
+    "jobs", MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("job_type", String(50)),
+    Column("salary_range", String(100)),
+    Column("employment_type", Enum("full_time", "part_time", "contract", "temporary", "internship", "other",
+                                   name="employmenttype")),
+    Column("salary_min", Integer),
+    Column("salary_max", Integer),
+    Column("salary_currency", String(3)),
+)
+_V9_FIELDS = ("employment_type", "salary_min", "salary_max", "salary_currency")
+_V9_CURRENCY_SYMBOLS = (
+    ("US$", "USD"), ("CA$", "CAD"), ("C$", "CAD"), ("AU$", "AUD"), ("A$", "AUD"),
+    ("$", "USD"), ("€", "EUR"), ("£", "GBP"), ("₹", "INR"), ("¥", "JPY"),
+)
+_V9_DEFAULT_CURRENCY = os.getenv("DEFAULT_CURRENCY", "USD")
+_V9_CURRENCY_CODES = {"USD", "EUR", "GBP", "CAD", "AUD", "INR", "JPY", "CHF", "SEK", "NOK", "DKK", "PLN", "NZD", "SGD"}
+_V9_PERIODS = (
+    (re.compile(r"/\s*h(ou)?r\b|\bper\s+hour\b|\ban?\s+hour\b|\bhourly\b|\bp/?h\b", re.I), 2080),
+    (re.compile(r"/\s*day\b|\bper\s+day\b|\ba\s+day\b|\bdaily\b", re.I), 260),
+    (re.compile(r"/\s*w(ee)?k\b|\bper\s+week\b|\ba\s+week\b|\bweekly\b", re.I), 52),
+    (re.compile(r"/\s*mo(nth)?\b|\bper\s+month\b|\ba\s+month\b|\bmonthly\b|\bp/?m\b", re.I), 12),
+)
+_V9_AMOUNT = re.compile(r"(\d{1,3}(?:[,.\s]\d{3})+|\d+(?:\.\d+)?)\s*([km])?(?![a-z])", re.I)
+_V9_UP_TO = re.compile(r"\b(up\s+to|max(imum)?|under)\b", re.I)
+_V9_FROM = re.compile(r"\b(from|min(imum)?|starting|at\s+least)\b|\+", re.I)
+_V9_MIN_ANNUAL = 1000
+_V9_JOB_TYPES = (
+    (re.compile(r"\bpart\b|\bpt\b"), "part_time"),
+    (re.compile(r"\bfull\b|\bft\b|fulltime|permanent"), "full_time"),
+    (re.compile(r"intern|trainee|apprentice"), "internship"),
+    (re.compile(r"temp|seasonal|casual"), "temporary"),
+    (re.compile(r"contract|freelance|fixed.?term|consult"), "contract"),
+)
+
+def _v9_currency(text):
+    for word in re.findall(r"(?<![A-Z])[A-Z]{3}(?![A-Z])", text.upper()):
+        if word in _V9_CURRENCY_CODES:
+            return word
+    for symbol, code in _V9_CURRENCY_SYMBOLS:
+        if symbol in text:
+            return code
+    return None
+
+def _v9_amount(digits, suffix):
+    if re.fullmatch(r"\d{1,3}(?:[,.\s]\d{3})+", digits):
+        value = float(re.sub(r"[,.\s]", "", digits))
+    else:
+        value = float(digits)
+    return value * {"k": 1_000, "m": 1_000_000}.get((suffix or "").lower(), 1)
+
+def _v9_salary(text):
+    if not text:
+        return None, None, None
+    amounts = _V9_AMOUNT.findall(text)
+    if not amounts:
+        return None, None, _v9_currency(text)
+    amounts = amounts[:2]
+    last_suffix = amounts[-1][1]
+    values = [_v9_amount(digits, suffix or (last_suffix if len(amounts) == 2 else None)) for digits, suffix in amounts]
+    scale = next((factor for pattern, factor in _V9_PERIODS if pattern.search(text)), None)
+    if scale is None:
+        if max(values) < _V9_MIN_ANNUAL:
+            return None, None, _v9_currency(text)
+        scale = 1
+    values = sorted(round(v * scale) for v in values)
+    low, high = values[0], values[-1]
+    if len(values) == 1:
+        if _V9_UP_TO.search(text):
+            low = None
+        elif _V9_FROM.search(text):
+            high = None
+    return low, high, _v9_currency(text) or _V9_DEFAULT_CURRENCY
+
+def _v9_job_type(text):
+    if not text or not text.strip():
+        return None
+    text = text.lower()
+    return next((name for pattern, name in _V9_JOB_TYPES if pattern.search(text)), "other")
+
+def _v9_derived(job_type, salary_range):
+    salary_min, salary_max, currency = _v9_salary(salary_range)
+    return {"employment_type": _v9_job_type(job_type), "salary_min": salary_min, "salary_max": salary_max,
+            "salary_currency": currency}
+
+@migration(9, "structured job type and salary")
+def add_structured_fields(conn):
+    jobs = _jobs_v9
+    for name in _V9_FIELDS:
+        _add_nullable_column(conn, jobs.c[name])
+    _backfill(conn, jobs, (jobs.c.job_type, jobs.c.salary_range), _V9_FIELDS, _v9_derived)
+    _create_index(conn, "jobs", "ix_jobs_hot_type_posted_at_id", "deleted_at", "archived", "employment_type", "posted_at", "id")
+    _create_index(conn, "jobs", "ix_jobs_hot_salary_max", "deleted_at", "archived", "salary_currency", "salary_max")
+
+# Migration 10: the place columns it added, and location resolution as
+# geo.py released it against the gazetteer of the time
+_jobs_v10 = Table(
+    "jobs", MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("location", String(255)),
+    Column("place_id", String(64)),
+    Column("geohash", String(12)),
+)
+_employers_v10 = Table(
+    "employers", MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("location", String(255)),
+    Column("place_id", String(64)),
+)
+_V10_PLACES = Path(__file__).parent / "data" / "places_v10.csv"
+_V10_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+def _v10_geohash(latitude, longitude, precision=9):
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        ranges, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (ranges[0] + ranges[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            ranges[0] = middle
+        else:
+            ranges[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_V10_BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+def _v10_name(text):
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return " ".join(re.findall(r"[a-z0-9]+", text))
+
+def _v10_places():
+    # Normalised name or alias -> (place id, geohash); earlier rows win
+    by_name = {}
+    with open(_V10_PLACES, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            place = (row["id"], _v10_geohash(float(row["latitude"]), float(row["longitude"])))
+            for name in [row["name"], *(row.get("aliases") or "").split("|")]:
+                if _v10_name(name):
+                    by_name.setdefault(_v10_name(name), place)
+    return by_name
+
+@migration(10, "job and employer places")
+def add_places(conn):
+    by_name = _v10_places()
+
+    @lru_cache(maxsize=65536)
+    def derived(location):
+        # The longest run of up to four words that names a place
+        words = _v10_name(location or "").split()[:12]
+        for n in range(min(4, len(words)), 0, -1):
+            for start in range(len(words) - n + 1):
+                place = by_name.get(" ".join(words[start:start + n]))
+                if place is not None:
+                    return {"place_id": place[0], "geohash": place[1]}
+        return {"place_id": None, "geohash": None}
+
+    jobs, employers = _jobs_v10, _employers_v10
+    for column in (jobs.c.place_id, jobs.c.geohash, employers.c.place_id):
+        _add_nullable_column(conn, column)
+    _backfill(conn, jobs, (jobs.c.location,), ("place_id", "geohash"), derived)
+    _backfill(conn, employers, (employers.c.location,), ("place_id",), lambda location: {
+        "place_id": derived(location)["place_id"]
+    })
+    _create_index(conn, "jobs", "ix_jobs_hot_geohash_posted_at_id", "deleted_at", "archived", "geohash", "posted_at", "id")
+
+@migration(11, "counters by value")
+def add_counter_value_index(conn):
+    _create_index(conn, "counters", "ix_counters_name_value")
+
+@migration(12, "applications.match_score")
+def add_match_score(conn):
+    # Left NULL: applications are scored when first listed by match
+    _add_nullable_column(conn, Table("applications", MetaData(), Column("match_score", Double)).c.match_score)
+    _create_index(conn, "applications", "ix_applications_job_match_score_id", "job_id", "match_score", "id")
+
+def current_version(conn):
+    schema_version.create(bind=conn, checkfirst=True)
+    return conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+def upgrade(engine, log=print):
+    """Apply pending migrations in order; returns the versions applied."""
+    with engine.begin() as conn:
+        version = current_version(conn)
+    applied = []
+    for number, name, fn in MIGRATIONS:
+        if number <= version:
+            continue
+        log(f"Applying migration {number}: {name}...")
+        with engine.begin() as conn:
+            fn(conn)
+            conn.execute(schema_version.insert().values(version=number, name=name))
+        applied.append(number)
+    if not applied:
+        log(f"Schema is up to date (version {version}).")
+    return applied
+
+def status(engine):
+    with engine.begin() as conn:
+        version = current_version(conn)
+    return version, [(number, name) for number, name, _ in MIGRATIONS if number > version]
@@ -1,9 +1,18 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, Enum, DateTime
+from sqlalchemy import Column, Integer, BigInteger, Boolean, String, ForeignKey, Text, Enum, DateTime, Double, Index, false
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from sqlalchemy.dialects import sqlite
 import enum
 from .database import Base
 
+# SQLite compares DATETIME values as text. Store them in the same format
+# CURRENT_TIMESTAMP produces so server defaults and bound parameters (e.g.
+# pagination cursors) compare correctly, matching MySQL's whole-second DATETIME.
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite",
+)
+
 class UserRole(str, enum.Enum):
     seeker = "seeker"
     employer = "employer"
@@ -14,6 +23,15 @@ class ApplicationStatus(str, enum.Enum):
     accepted = "Accepted"
     rejected = "Rejected"
 
+class EmploymentType(str, enum.Enum):
+    # Normalised from the free-text Job.job_type (see normalize.py)
+    full_time = "Full-time"
+    part_time = "Part-time"
+    contract = "Contract"
+    temporary = "Temporary"
+    internship = "Internship"
+    other = "Other"
+
 class User(Base):
     __tablename__ = "users"
 
@@ -21,11 +39,22 @@ class User(Base):
     email = Column(String(255), unique=True, index=True)
     hashed_password = Column(String(255))
     role = Column(Enum(UserRole))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Part of every access token; bumping it revokes the user's tokens
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(Timestamp, server_default=func.now())
+    # Set on delete; the row and everything hanging off it are removed later
+    # by backend/purge.py
+    deleted_at = Column(Timestamp, nullable=True)
 
     seeker_profile = relationship("JobSeeker", back_populates="user", uselist=False)
     employer_profile = relationship("Employer", back_populates="user", uselist=False)
 
+    __table_args__ = (
+        # Live users newest first (deleted_at IS NULL is an equality for the
+        # index); also the purge worker's queue of deleted ones
+        Index("ix_users_deleted_at_created_at_id", "deleted_at", "created_at", "id"),
+    )
+
 class JobSeeker(Base):
     __tablename__ = "job_seekers"
 
@@ -47,6 +76,8 @@ class Employer(Base):
     company_description = Column(Text, nullable=True)
     website = Column(String(255), nullable=True)
     location = Column(String(255), nullable=True)
+    # Gazetteer place the location resolves to (see geo.py)
+    place_id = Column(String(64), nullable=True)
 
     user = relationship("User", back_populates="employer_profile")
     jobs = relationship("Job", back_populates="employer")
@@ -61,12 +92,49 @@ class Job(Base):
     location = Column(String(255))
     job_type = Column(String(50)) # e.g. Full-time, Part-time
     salary_range = Column(String(100))
-    posted_at = Column(DateTime(timezone=True), server_default=func.now())
-    closing_date = Column(DateTime(timezone=True), nullable=True)
+    # Parsed from job_type / salary_range for filters and facets; salaries
+    # are per year, in salary_currency (see normalize.py)
+    employment_type = Column(Enum(EmploymentType), nullable=True)
+    salary_min = Column(Integer, nullable=True)
+    salary_max = Column(Integer, nullable=True)
+    salary_currency = Column(String(3), nullable=True)
+    # Gazetteer place the location resolves to, and its geohash for
+    # radius search (see geo.py)
+    place_id = Column(String(64), nullable=True)
+    geohash = Column(String(12), nullable=True)
+    posted_at = Column(Timestamp, server_default=func.now())
+    closing_date = Column(Timestamp, nullable=True)
+    # The employer's own ID for the posting (e.g. from their ATS), used by
+    # bulk sync to update instead of duplicating
+    external_id = Column(String(255), nullable=True)
+    # Soft delete, see User.deleted_at
+    deleted_at = Column(Timestamp, nullable=True)
+    # Set by backend/archive.py once closing_date has passed. Archived jobs
+    # leave search (the hot set) but stay readable by id, with their
+    # applications. A flag rather than a timestamp so both values are an
+    # equality prefix of the indexes below.
+    archived = Column(Boolean, nullable=False, default=False, server_default=false())
 
     employer = relationship("Employer", back_populates="jobs")
     applications = relationship("Application", back_populates="job")
 
+    __table_args__ = (
+        # Search listing (the hot set: neither deleted nor archived), newest
+        # first; the deleted_at prefix is also the purge worker's queue
+        Index("ix_jobs_hot_posted_at_id", "deleted_at", "archived", "posted_at", "id"),
+        # Listing filtered by type, and salary range filters (the upper
+        # bound is what "paying at least" compares)
+        Index("ix_jobs_hot_type_posted_at_id", "deleted_at", "archived", "employment_type", "posted_at", "id"),
+        Index("ix_jobs_hot_salary_max", "deleted_at", "archived", "salary_currency", "salary_max"),
+        # Place and radius filters: geohash equality / IN, newest first
+        Index("ix_jobs_hot_geohash_posted_at_id", "deleted_at", "archived", "geohash", "posted_at", "id"),
+        # The archiver's queue
+        Index("ix_jobs_archived_closing_date", "archived", "closing_date"),
+        # An employer's own jobs, newest first (also serves the FK)
+        Index("ix_jobs_employer_posted_at_id", "employer_id", "posted_at", "id"),
+        Index("uq_jobs_employer_external_id", "employer_id", "external_id", unique=True),
+    )
+
 class Application(Base):
     __tablename__ = "applications"
 
@@ -74,7 +142,34 @@ class Application(Base):
     job_id = Column(Integer, ForeignKey("jobs.id"))
     seeker_id = Column(Integer, ForeignKey("job_seekers.id"))
     status = Column(Enum(ApplicationStatus), default=ApplicationStatus.applied)
-    applied_at = Column(DateTime(timezone=True), server_default=func.now())
+    applied_at = Column(Timestamp, server_default=func.now())
+    # How well the seeker's profile matches the job (0..1), NULL until
+    # scored (see matching.py)
+    match_score = Column(Double, nullable=True)
 
     job = relationship("Job", back_populates="applications")
     seeker = relationship("JobSeeker", back_populates="applications")
+
+    __table_args__ = (
+        # One application per seeker per job
+        Index("uq_applications_job_seeker", "job_id", "seeker_id", unique=True),
+        # Applicants for a job / a seeker's applications, newest first
+        Index("ix_applications_job_applied_at_id", "job_id", "applied_at", "id"),
+        Index("ix_applications_seeker_applied_at_id", "seeker_id", "applied_at", "id"),
+        # Applicants for a job, best match first
+        Index("ix_applications_job_match_score_id", "job_id", "match_score", "id"),
+    )
+
+class Counter(Base):
+    # Materialised totals for the admin dashboard, maintained by
+    # backend/counters.py in the same transaction as the rows they count
+    __tablename__ = "counters"
+
+    name = Column(String(50), primary_key=True)
+    bucket = Column(String(100), primary_key=True, default="")
+    value = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        # Top employers by job count
+        Index("ix_counters_name_value", "name", "value"),
+    )
@@ -0,0 +1,106 @@
+import os
+import re
+from . import models
+
+# Structured columns derived from the free-text job_type and salary_range
+# employers type in. The text stays as entered (it is what listings show);
+# the derived columns are what filters and facets read. Every write path
+# stores derived(job_type, salary_range) next to the text, and migration 9
+# backfills older rows.
+
+CURRENCY_SYMBOLS = (
+    # Longest first: "US$" before "$"
+    ("US$", "USD"), ("CA$", "CAD"), ("C$", "CAD"), ("AU$", "AUD"), ("A$", "AUD"),
+    ("$", "USD"), ("€", "EUR"), ("£", "GBP"), ("₹", "INR"), ("¥", "JPY"),
+)
+# For salaries that state no currency, and salary filters that name none
+DEFAULT_CURRENCY = os.getenv("DEFAULT_CURRENCY", "USD")
+CURRENCY_CODES = {"USD", "EUR", "GBP", "CAD", "AUD", "INR", "JPY", "CHF", "SEK", "NOK", "DKK", "PLN", "NZD", "SGD"}
+
+# Salaries are stored per year; other periods are scaled by these
+PERIODS = (
+    (re.compile(r"/\s*h(ou)?r\b|\bper\s+hour\b|\ban?\s+hour\b|\bhourly\b|\bp/?h\b", re.I), 2080),
+    (re.compile(r"/\s*day\b|\bper\s+day\b|\ba\s+day\b|\bdaily\b", re.I), 260),
+    (re.compile(r"/\s*w(ee)?k\b|\bper\s+week\b|\ba\s+week\b|\bweekly\b", re.I), 52),
+    (re.compile(r"/\s*mo(nth)?\b|\bper\s+month\b|\ba\s+month\b|\bmonthly\b|\bp/?m\b", re.I), 12),
+)
+# 100k, 1.5m, 40,000, 40.000, 42 500
+AMOUNT = re.compile(r"(\d{1,3}(?:[,.\s]\d{3})+|\d+(?:\.\d+)?)\s*([km])?(?![a-z])", re.I)
+UP_TO = re.compile(r"\b(up\s+to|max(imum)?|under)\b", re.I)
+FROM = re.compile(r"\b(from|min(imum)?|starting|at\s+least)\b|\+", re.I)
+# Unit-less numbers below this without a stated period are too ambiguous
+# to guess at ("45-60": hourly? thousands?)
+MIN_ANNUAL = 1000
+
+JOB_TYPES = (
+    (re.compile(r"\bpart\b|\bpt\b"), models.EmploymentType.part_time),
+    (re.compile(r"\bfull\b|\bft\b|fulltime|permanent"), models.EmploymentType.full_time),
+    (re.compile(r"intern|trainee|apprentice"), models.EmploymentType.internship),
+    (re.compile(r"temp|seasonal|casual"), models.EmploymentType.temporary),
+    (re.compile(r"contract|freelance|fixed.?term|consult"), models.EmploymentType.contract),
+)
+
+def _amount(digits, suffix):
+    if re.fullmatch(r"\d{1,3}(?:[,.\s]\d{3})+", digits):
+        value = float(re.sub(r"[,.\s]", "", digits))
+    else:
+        value = float(digits)
+    return value * {"k": 1_000, "m": 1_000_000}.get((suffix or "").lower(), 1)
+
+def parse_currency(text):
+    # A spelled-out code wins over an ambiguous symbol ("CAD $90k")
+    for word in re.findall(r"(?<![A-Z])[A-Z]{3}(?![A-Z])", text.upper()):
+        if word in CURRENCY_CODES:
+            return word
+    for symbol, code in CURRENCY_SYMBOLS:
+        if symbol in text:
+            return code
+    return None
+
+def parse_salary(text):
+    """Return (min, max, currency) per year from free text such as
+    "$100k-120k", "€45,000 - €55,000", "£18/hr" or "Up to 80k"; any of
+    them is None when the text does not say."""
+    if not text:
+        return None, None, None
+    amounts = AMOUNT.findall(text)
+    if not amounts:
+        return None, None, parse_currency(text)
+    amounts = amounts[:2]
+    # "100-120k": the suffix on the second number covers the first
+    last_suffix = amounts[-1][1]
+    values = [_amount(digits, suffix or (last_suffix if len(amounts) == 2 else None)) for digits, suffix in amounts]
+    scale = next((factor for pattern, factor in PERIODS if pattern.search(text)), None)
+    if scale is None:
+        if max(values) < MIN_ANNUAL:
+            return None, None, parse_currency(text)
+        scale = 1
+    values = sorted(round(v * scale) for v in values)
+    low, high = values[0], values[-1]
+    if len(values) == 1:
+        if UP_TO.search(text):
+            low = None
+        elif FROM.search(text):
+            high = None
+    return low, high, parse_currency(text) or DEFAULT_CURRENCY
+
+def parse_job_type(text):
+    if not text or not text.strip():
+        return None
+    text = text.lower()
+    for pattern, employment_type in JOB_TYPES:
+        if pattern.search(text):
+            return employment_type
+    return models.EmploymentType.other
+
+FIELDS = ("employment_type", "salary_min", "salary_max", "salary_currency")
+
+def derived(job_type, salary_range):
+    """The structured columns for a job with this job_type and salary_range."""
+    salary_min, salary_max, currency = parse_salary(salary_range)
+    return {
+        "employment_type": parse_job_type(job_type),
+        "salary_min": salary_min,
+        "salary_max": salary_max,
+        "salary_currency": currency,
+    }
@@ -0,0 +1,58 @@
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException, Query
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Keyset (cursor) pagination: pages are ordered newest first by
+# (timestamp, id) and the cursor carries the last row's key, so fetching a
+# deep page is an index range scan just like page 1 (no OFFSET).
+
+def encode_cursor(sort_value, row_id):
+    raw = json.dumps([sort_value.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+# Ranked results (search relevance) page the same way, keyed on (score, id)
+def encode_rank_cursor(score, row_id):
+    raw = json.dumps([score, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_rank_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        score, row_id = json.loads(raw)
+        return float(score), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def page_size(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    return limit
+
+def keyset(query, sort_column, id_column, cursor, limit, decode=decode_cursor):
+    if cursor:
+        sort_value, row_id = decode(cursor)
+        query = query.where(or_(
+            sort_column < sort_value,
+            and_(sort_column == sort_value, id_column < row_id),
+        ))
+    # One extra row tells us whether there is a next page
+    return query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1)
+
+def split_page(rows, limit, sort_key, id_key, encode=encode_cursor):
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode(getattr(last, sort_key), getattr(last, id_key))
+    return items, next_cursor
@@ -0,0 +1,67 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
+
+# Password hashing, kept free of app imports so pool workers start cheaply.
+#
+# bcrypt costs ~250 ms of CPU per hash at the default cost. Running it in
+# Starlette's threadpool caps login throughput at the pool size; the
+# process pool here spreads it over every core instead.
+
+# bcrypt cost factor (log2 rounds). Changing it makes existing hashes
+# "need update", and they are rehashed on the user's next login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Worker processes for hashing; 0 runs hashes in the threadpool instead
+# (handy for tests and single-core dev boxes).
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+def hash_password(password):
+    # Bcrypt has a 72-byte limit. Truncate if necessary to prevent ValueError
+    return pwd_context.hash(password[:72])
+
+def verify_and_update(plain_password, hashed_password):
+    """Return (verified, new_hash); new_hash is set when the stored hash
+    was made with outdated parameters and should be replaced."""
+    try:
+        return pwd_context.verify_and_update(plain_password[:72], hashed_password)
+    except Exception:
+        return False, None
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn, not fork: the server process has threads running
+                _pool = ProcessPoolExecutor(
+                    max_workers=HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+async def _run(fn, *args):
+    if HASH_WORKERS <= 0:
+        return await run_in_threadpool(fn, *args)
+    return await asyncio.get_running_loop().run_in_executor(get_pool(), fn, *args)
+
+async def hash_password_async(password):
+    return await _run(hash_password, password)
+
+async def verify_and_update_async(plain_password, hashed_password):
+    return await _run(verify_and_update, plain_password, hashed_password)
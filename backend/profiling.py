@@ -0,0 +1,298 @@
+import asyncio
+import contextlib
+import contextvars
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime, timezone
+from urllib.parse import parse_qs
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from . import auth, database, models
+
+# On-demand profiling of single requests, for admins.
+#
+# A request carrying an "X-Profile: 1" header (or ?profile=1) from an admin
+# runs under a sampling profiler. The admin is whoever holds the token in
+# X-Profile-Token, or else in Authorization; so an admin can profile a
+# request made with another account's token. Anything else carrying the
+# flag is served normally. The response gets an X-Profile-Id header and the
+# profile is kept in a ring buffer of the last PROFILE_BUFFER_SIZE, listed
+# and downloaded from /admin/profiles as speedscope JSON or collapsed
+# stacks (flamegraph.pl, speedscope and most flame graph tools read both).
+# Each process keeps its own buffer.
+#
+# A sampler thread reads sys._current_frames() every PROFILE_INTERVAL_SECONDS
+# and keeps the stacks that belong to the request: the event loop thread
+# while the request's task is the one running, and threadpool threads
+# while they run a call submitted from the request (sync routes and
+# dependencies; recognised by the request's context they run in). A tick
+# where the request is on no thread is counted as "(waiting)", so the
+# profile adds up to wall time; those waits are mostly the SQL statements,
+# recorded separately with their timings.
+#
+# Unflagged requests pay one header scan and one contextvar read per SQL
+# statement.
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_TOKEN_HEADER = b"x-profile-token"
+PROFILE_BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER_SIZE", "20"))
+PROFILE_INTERVAL_SECONDS = float(os.getenv("PROFILE_INTERVAL_SECONDS", "0.001"))
+# Sampling stops after this long; the request itself carries on
+PROFILE_MAX_SECONDS = 30
+PROFILE_MAX_STATEMENTS = 1000
+WAITING = ("(waiting)", "", 0)
+
+class Profile:
+    def __init__(self, method, path, query, admin_id):
+        self.id = uuid.uuid4().hex[:16]
+        self.method = method
+        self.path = path
+        self.query = query
+        self.admin_id = admin_id
+        self.route = None
+        self.status = None
+        self.started_at = datetime.now(timezone.utc)
+        self.duration_ms = 0.0
+        self.interval_ms = PROFILE_INTERVAL_SECONDS * 1000
+        self.stacks = Counter()  # (frame, ...) root first -> samples
+        self.statements = []  # {"sql", "start_ms", "duration_ms"}
+        self.statement_count = 0
+        self._clock = time.perf_counter()
+        self._statement_start = None
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "query": self.query,
+            "route": self.route,
+            "status": self.status,
+            "admin_id": self.admin_id,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration_ms, 2),
+            "samples": sum(self.stacks.values()),
+            "sql_statements": self.statement_count,
+            "sql_ms": round(sum(s["duration_ms"] for s in self.statements), 2),
+        }
+
+    def collapsed(self):
+        """Brendan Gregg's collapsed stacks: "root;...;leaf count" lines."""
+        lines = []
+        for stack, count in sorted(self.stacks.items(), key=lambda item: -item[1]):
+            lines.append(";".join(_label(frame) for frame in stack) + f" {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self):
+        """The profile in speedscope's file format, with the SQL statements
+        alongside (speedscope ignores unknown keys)."""
+        frames, index = [], {}
+        samples, weights = [], []
+        for stack, count in self.stacks.items():
+            sample = []
+            for frame in stack:
+                if frame not in index:
+                    index[frame] = len(frames)
+                    name, filename, line = frame
+                    frames.append({"name": name, "file": filename, "line": line} if filename else {"name": name})
+                sample.append(index[frame])
+            samples.append(sample)
+            weights.append(round(count * self.interval_ms, 3))
+        name = f"{self.method} {self.route or self.path}"
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "job-portal",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 3),
+                "samples": samples,
+                "weights": weights,
+            }],
+            "request": self.summary(),
+            "sql": self.statements,
+        }
+
+def _label(frame):
+    name, filename, line = frame
+    if not filename:
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+_session = contextvars.ContextVar("profile", default=None)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _session.get()
+    if profile is not None:
+        profile._statement_start = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _session.get()
+    if profile is None or profile._statement_start is None:
+        return
+    end = time.perf_counter()
+    profile.statement_count += 1
+    if len(profile.statements) < PROFILE_MAX_STATEMENTS:
+        profile.statements.append({
+            "sql": statement,
+            "start_ms": round((profile._statement_start - profile._clock) * 1000, 3),
+            "duration_ms": round((end - profile._statement_start) * 1000, 3),
+        })
+    profile._statement_start = None
+
+def _frame_key(frame):
+    code = frame.f_code
+    # Per function, not per line, so a function is one box in the flame graph
+    return (code.co_name, code.co_filename, code.co_firstlineno)
+
+def _stack(frame, stop=None):
+    # Root first, up to (not including) stop
+    stack = []
+    while frame is not None and frame is not stop:
+        stack.append(_frame_key(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+def _worker_entry(frame, profile):
+    # The worker frame that entered the request's context (anyio's
+    # WorkerThread.run calls context.run(func)), if this thread is running
+    # on the request's behalf
+    while frame is not None:
+        if frame.f_code.co_name == "run":
+            context = frame.f_locals.get("context")
+            if isinstance(context, contextvars.Context) and context.get(_session) is profile:
+                return frame
+        frame = frame.f_back
+    return None
+
+class Sampler(threading.Thread):
+    def __init__(self, profile, loop, task):
+        super().__init__(name=f"profiler-{profile.id}", daemon=True)
+        self.profile = profile
+        self.loop = loop
+        self.task = task
+        self.loop_thread = threading.get_ident()
+        self.stopped = threading.Event()
+
+    def run(self):
+        deadline = time.perf_counter() + PROFILE_MAX_SECONDS
+        own = threading.get_ident()
+        while not self.stopped.wait(PROFILE_INTERVAL_SECONDS) and time.perf_counter() < deadline:
+            found = False
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                if thread_id == self.loop_thread:
+                    if asyncio.current_task(self.loop) is self.task:
+                        self.profile.stacks[_stack(frame)] += 1
+                        found = True
+                    continue
+                entry = _worker_entry(frame, self.profile)
+                if entry is not None:
+                    self.profile.stacks[_stack(frame, stop=entry)] += 1
+                    found = True
+            if not found:
+                self.profile.stacks[(WAITING,)] += 1
+
+class ProfileStore:
+    """The last few profiles, newest first."""
+
+    def __init__(self, size=PROFILE_BUFFER_SIZE):
+        self._profiles = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, profile):
+        with self._lock:
+            self._profiles.appendleft(profile)
+
+    def list(self):
+        with self._lock:
+            return list(self._profiles)
+
+    def get(self, profile_id):
+        with self._lock:
+            return next((p for p in self._profiles if p.id == profile_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+store = ProfileStore()
+
+def _requested(scope, headers):
+    if headers.get(PROFILE_HEADER, b"").strip().lower() in (b"1", b"true", b"yes"):
+        return True
+    query = scope.get("query_string", b"")
+    if b"profile=" in query:
+        values = parse_qs(query.decode("latin-1")).get("profile", [])
+        return any(v.lower() in ("1", "true", "yes") for v in values)
+    return False
+
+async def _admin_id(headers):
+    token = headers.get(PROFILE_TOKEN_HEADER)
+    if token is None:
+        scheme, _, token = headers.get(b"authorization", b"").partition(b" ")
+        if scheme.lower() != b"bearer":
+            return None
+    try:
+        principal = auth.decode_principal(token.decode("latin-1").strip())
+    except ValueError:
+        return None
+    if principal.role != models.UserRole.admin:
+        return None
+    async with contextlib.asynccontextmanager(database.get_async_db)() as db:
+        if await auth.token_versions.get(db, principal.id) != principal.token_version:
+            return None
+    return principal.id
+
+class ProfilingMiddleware:
+    def __init__(self, app, store=store):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        if not _requested(scope, headers):
+            await self.app(scope, receive, send)
+            return
+        admin_id = await _admin_id(headers)
+        if admin_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(scope["method"], scope["path"], scope.get("query_string", b"").decode("latin-1"), admin_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", profile.id.encode())]}
+            await send(message)
+
+        token = _session.set(profile)
+        sampler = Sampler(profile, asyncio.get_running_loop(), asyncio.current_task())
+        sampler.start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.duration_ms = (time.perf_counter() - start) * 1000
+            sampler.stopped.set()
+            _session.reset(token)
+            sampler.join()
+            profile.route = getattr(scope.get("route"), "path", None)
+            self.store.add(profile)
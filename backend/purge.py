@@ -0,0 +1,179 @@
+import os
+from collections import Counter
+from sqlalchemy import select, update, delete, exists, func
+from sqlalchemy.orm import Session
+from . import models, schemas, queries, counters, events, database, auth, scheduler
+
+# Soft deletes and the background purge.
+#
+# Deleting a user or a job only stamps deleted_at (one single-row UPDATE),
+# and every read path filters those rows out (see queries.live_job). The
+# rows themselves, and everything hanging off them, are removed later by
+# purge_pending(), which each app process runs every PURGE_INTERVAL_SECONDS
+# (see scheduler.py):
+#
+#   1. live jobs of deleted employers are soft-deleted too
+#   2. applications to deleted jobs or from deleted seekers are deleted
+#   3. deleted jobs without applications are deleted
+#   4. deleted users without jobs or applications are deleted, with their
+#      job_seekers / employers profile
+#
+# Every step works PURGE_BATCH_SIZE rows at a time: one SELECT picks the
+# chunk's primary keys, one DELETE (or UPDATE) by those keys, commit. So no
+# transaction holds more than a chunk's row locks, however large the
+# employer. The SELECT uses FOR UPDATE SKIP LOCKED (ignored by SQLite), so
+# purgers in several processes take different chunks instead of waiting.
+
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", "500"))
+# 0 disables the in-process worker (run purge_deleted.py from cron instead)
+PURGE_INTERVAL_SECONDS = float(os.getenv("PURGE_INTERVAL_SECONDS", "30"))
+# Breather between chunks so the purge never monopolises a hot table
+PURGE_PAUSE_SECONDS = 0.05
+
+# --- Soft deletes ---
+
+def delete_job(db: Session, job_id: int, employer_id=None):
+    """Soft-delete a live job (of employer_id, if given). Returns False if
+    there was no such job."""
+    job = models.Job
+    query = queries.job_listing().where(job.id == job_id)
+    if employer_id is not None:
+        query = query.where(job.employer_id == employer_id)
+    old = db.execute(query).first()
+    if old is None:
+        return False
+    # Clearing external_id frees it for the employer's next bulk sync
+    result = db.execute(
+        update(job).where(job.id == job_id, job.deleted_at.is_(None))
+        .values(deleted_at=func.now(), external_id=None).execution_options(synchronize_session=False)
+    )
+    if not result.rowcount:
+        # Lost a race with another delete
+        db.rollback()
+        return False
+    counters.job_deleted(db, old.employer_id)
+    db.commit()
+    events.job_changed(schemas.JobOut(**old._mapping), None)
+    return True
+
+def delete_user(db: Session, user_id: int):
+    """Soft-delete a user; their tokens stop working and, for an employer,
+    their jobs disappear from every listing. Returns False if there was no
+    such user."""
+    user = models.User
+    role = db.execute(select(user.role).where(user.id == user_id, user.deleted_at.is_(None))).scalar()
+    if role is None:
+        return False
+    result = db.execute(
+        update(user).where(user.id == user_id, user.deleted_at.is_(None))
+        .values(deleted_at=func.now(), token_version=user.token_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if not result.rowcount:
+        db.rollback()
+        return False
+    counters.user_deleted(db, role)
+    db.commit()
+    auth.token_versions.invalidate(user_id)
+    if role == models.UserRole.employer:
+        events.employer_changed(db, user_id)
+    return True
+
+# --- Purge steps; each handles one chunk and returns its size ---
+
+def _claim(db: Session, query, *of):
+    return db.execute(query.limit(PURGE_BATCH_SIZE).with_for_update(skip_locked=True, of=of or None)).all()
+
+def _retire_employer_jobs(db: Session):
+    job, user = models.Job, models.User
+    rows = _claim(db, select(job.id, job.employer_id).join(user, user.id == job.employer_id)
+                  .where(user.deleted_at.is_not(None), job.deleted_at.is_(None)), job)
+    if rows:
+        db.execute(
+            update(job).where(job.id.in_([row.id for row in rows]))
+            .values(deleted_at=func.now(), external_id=None).execution_options(synchronize_session=False)
+        )
+        per_employer = Counter(row.employer_id for row in rows)
+        counters.bump(db, (counters.JOBS, "", -len(rows)), *(
+            (counters.JOBS_BY_EMPLOYER, employer_id, -n) for employer_id, n in per_employer.items()
+        ))
+    return len(rows)
+
+def _delete_applications(db: Session, rows):
+    if rows:
+        db.execute(delete(models.Application).where(models.Application.id.in_([row.id for row in rows])))
+        per_status = Counter(row.status.value for row in rows)
+        counters.bump(db, (counters.APPLICATIONS, "", -len(rows)), *(
+            (counters.APPLICATIONS_BY_STATUS, status, -n) for status, n in per_status.items()
+        ))
+    return len(rows)
+
+def _purge_job_applications(db: Session):
+    app, job = models.Application, models.Job
+    return _delete_applications(db, _claim(db, select(app.id, app.status).join(job, job.id == app.job_id)
+                                           .where(job.deleted_at.is_not(None)), app))
+
+def _purge_seeker_applications(db: Session):
+    app, user = models.Application, models.User
+    return _delete_applications(db, _claim(db, select(app.id, app.status).join(user, user.id == app.seeker_id)
+                                           .where(user.deleted_at.is_not(None)), app))
+
+def _purge_jobs(db: Session):
+    job = models.Job
+    ids = [row.id for row in _claim(db, select(job.id).where(
+        job.deleted_at.is_not(None), ~exists().where(models.Application.job_id == job.id)
+    ))]
+    if ids:
+        db.execute(delete(job).where(job.id.in_(ids)))
+    return len(ids)
+
+def _purge_users(db: Session):
+    user = models.User
+    ids = [row.id for row in _claim(db, select(user.id).where(
+        user.deleted_at.is_not(None),
+        ~exists().where(models.Job.employer_id == user.id),
+        ~exists().where(models.Application.seeker_id == user.id),
+    ))]
+    if ids:
+        # Profiles first: they reference users.id
+        db.execute(delete(models.JobSeeker).where(models.JobSeeker.id.in_(ids)))
+        db.execute(delete(models.Employer).where(models.Employer.id.in_(ids)))
+        db.execute(delete(user).where(user.id.in_(ids)))
+    return len(ids)
+
+STEPS = (
+    ("jobs_retired", _retire_employer_jobs),
+    ("applications", _purge_job_applications),
+    ("applications", _purge_seeker_applications),
+    ("jobs", _purge_jobs),
+    ("users", _purge_users),
+)
+
+def purge_pending(db: Session = None, pause=PURGE_PAUSE_SECONDS, stopping=None):
+    """Run every step until it has nothing left, or until stopping (a
+    threading.Event) is set; returns rows handled per kind. Safe to run
+    concurrently from several processes."""
+    own_session = db is None
+    db = db or database.SessionLocal()
+    purged = Counter()
+    stopped = False
+    try:
+        for name, step in STEPS:
+            while not stopped:
+                try:
+                    n = step(db)
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    raise
+                purged[name] += n
+                # A short chunk means the queue is drained (or the rest is
+                # locked by another purger)
+                if n < PURGE_BATCH_SIZE:
+                    break
+                stopped = scheduler.between_chunks(pause, stopping)
+    finally:
+        if own_session:
+            db.close()
+    # Only the non-zero counts, so an idle run logs nothing
+    return {name: n for name, n in purged.items() if n}
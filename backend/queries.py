@@ -0,0 +1,93 @@
+from sqlalchemy import select, func, exists, and_, or_, false
+from sqlalchemy.orm import aliased
+from . import models, schemas, pagination, responses
+
+# Deleted users and jobs stay in place until backend/purge.py removes them,
+# so every read filters them out. These are plain WHERE conditions (a
+# correlated primary-key probe for the owner) so they cost no extra query.
+
+def is_deleted_user(user_id):
+    # Aliased so it never correlates with a users table the outer query joins
+    owner = aliased(models.User)
+    return exists().where(owner.id == user_id, owner.deleted_at.is_not(None))
+
+def live_user(user_id):
+    return ~is_deleted_user(user_id)
+
+def live_job():
+    # Deleting an employer hides their jobs at once, before the purge
+    # worker gets to them
+    return and_(models.Job.deleted_at.is_(None), live_user(models.Job.employer_id))
+
+def hot_job():
+    # Searchable: not archived and not past its closing date (backend/
+    # archive.py archives those in batches; until then this hides them)
+    job = models.Job
+    return and_(job.archived == false(), or_(job.closing_date.is_(None), job.closing_date > func.now()))
+
+# Columns needed to build a JobOut. Listing endpoints select these directly
+# (plus the employer's company name) instead of loading full Job entities.
+JOB_COLUMNS = (
+    models.Job.id,
+    models.Job.employer_id,
+    models.Job.title,
+    models.Job.description,
+    models.Job.location,
+    models.Job.job_type,
+    models.Job.salary_range,
+    models.Job.posted_at,
+    models.Job.closing_date,
+    models.Job.archived,
+    models.Job.employment_type,
+    models.Job.salary_min,
+    models.Job.salary_max,
+    models.Job.salary_currency,
+    models.Job.place_id,
+    models.Job.geohash,
+)
+
+def job_listing():
+    # One joined SELECT for the whole listing, so touching the company name
+    # no longer lazy-loads job.employer once per row (N+1).
+    return (
+        select(*JOB_COLUMNS, func.coalesce(models.Employer.company_name, "Unknown").label("company_name"))
+        .outerjoin(models.Employer, models.Employer.id == models.Job.employer_id)
+        .where(live_job())
+    )
+
+def hot_job_listing():
+    # What search and recommendations read; job_listing() also returns
+    # archived jobs, for lookups by id and the employer's own list
+    return job_listing().where(hot_job())
+
+def jobs_out(rows):
+    return [schemas.JobOut(**row._mapping) for row in rows]
+
+def job_out(db, job_id):
+    return jobs_out(db.execute(job_listing().where(models.Job.id == job_id)))[0]
+
+def job_page_query(query, cursor, limit):
+    return pagination.keyset(query, models.Job.posted_at, models.Job.id, cursor, limit)
+
+def job_dicts(rows):
+    # Page items for ORJSONResponse; see responses.py
+    return responses.rows_out(schemas.JobOut, rows)
+
+def job_page_out(rows, limit):
+    rows, next_cursor = pagination.split_page(rows, limit, "posted_at", "id")
+    return {"items": job_dicts(rows), "next_cursor": next_cursor}
+
+async def job_page(db, query, cursor, limit):
+    result = await db.execute(job_page_query(query, cursor, limit))
+    return job_page_out(result.all(), limit)
+
+APPLICATION_COLUMNS = (
+    models.Application.id,
+    models.Application.job_id,
+    models.Application.seeker_id,
+    models.Application.status,
+    models.Application.applied_at,
+)
+
+def application_dicts(rows, **extra):
+    return responses.rows_out(schemas.ApplicationOut, rows, **extra)
@@ -0,0 +1,275 @@
+import threading
+import time
+from datetime import timezone
+import numpy as np
+from sqlalchemy import select
+
+from . import models, queries, events, matching
+
+# Job recommendations for seekers: open jobs ranked by how well they match
+# the seeker's skills and experience.
+#
+# Jobs live in a sparse jobs x features matrix over matching's hashed term
+# space, stored column-major (CSC): for each feature, the rows of the jobs
+# containing it. Job rows are log-tf weighted and unit length; idf goes on
+# the profile side instead (SMART lnc.ltc), so adding a job never reweights
+# the others. Scoring is one sparse matrix-vector product that only reads
+# the columns of the profile's terms, then an argpartition for the top k:
+# cost follows the postings of a few dozen terms, not the number of jobs.
+#
+# Updates are incremental. New rows collect in a small pending buffer that
+# is scored separately and merged into the columns every MERGE_ROWS rows
+# (one O(nnz) np.insert). Removed rows are masked out and physically
+# dropped once they are VACUUM_RATIO of the matrix; until then they still
+# count towards document frequencies, which only nudges idf. Closed jobs
+# need no update at all: closing dates are checked against the clock per
+# query.
+
+MAX_TERMS = 64          # per job, highest weights first
+MERGE_ROWS = 1024
+VACUUM_RATIO = 0.25
+
+def job_text(job):
+    return f"{job.title or ''} {job.description or ''}"
+
+def _row_vector(text):
+    # Uncached: job texts would only crowd profiles out of term_vector's cache
+    idx, weights = matching.term_vector.__wrapped__(text)
+    if len(idx) > MAX_TERMS:
+        keep = np.argpartition(-weights, MAX_TERMS - 1)[:MAX_TERMS]
+        idx, weights = idx[keep], weights[keep]
+    norm = np.linalg.norm(weights)
+    return idx.astype(np.int32), (weights / norm if norm else weights).astype(np.float32)
+
+def _closes_at(job):
+    if job.closing_date is None:
+        return np.inf
+    closing = job.closing_date
+    if closing.tzinfo is None:
+        closing = closing.replace(tzinfo=timezone.utc)
+    return closing.timestamp()
+
+class RecommendationIndex:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.loaded = False
+        self.row_of = {}                                    # job_id -> row
+        self.size = 0                                       # rows in use (live or not)
+        self.job_ids = np.zeros(0, dtype=np.int64)
+        self.employer_ids = np.zeros(0, dtype=np.int64)
+        # Epoch seconds; inf if open-ended, -inf once removed
+        self.closes = np.zeros(0, dtype=np.float64)
+        self.alive = np.zeros(0, dtype=bool)
+        self.dead = 0
+        # Merged rows, column-major
+        self.indptr = np.zeros(matching.FEATURES + 1, dtype=np.int64)
+        self.rows = np.zeros(0, dtype=np.int32)
+        self.data = np.zeros(0, dtype=np.float32)
+        # Rows added since the last merge: row -> (features, weights)
+        self.pending = {}
+        self.pending_df = np.zeros(matching.FEATURES, dtype=np.int32)
+
+    def clear(self):
+        with self.lock:
+            self._reset()
+
+    def ensure_loaded(self, db):
+        if self.loaded:
+            return
+        with self.lock:
+            if self.loaded:
+                return
+            query = queries.hot_job_listing().execution_options(yield_per=1000)
+            for job in db.execute(query):
+                self._add(job, merge=False)
+            self._merge()
+            self.loaded = True
+
+    # --- Updates ---
+
+    def add_job(self, job):
+        with self.lock:
+            if self.loaded:
+                self._add(job)
+
+    def remove_job(self, job_id):
+        with self.lock:
+            self._remove(job_id)
+
+    def reindex_employer(self, db, employer_id):
+        # Only whether they are still searchable matters here (company
+        # names are not matched on): a deleted employer's jobs drop out
+        with self.lock:
+            if not self.loaded:
+                return
+            live = set(db.execute(
+                select(models.Job.id)
+                .where(models.Job.employer_id == employer_id, queries.live_job(), queries.hot_job())
+            ).scalars())
+            owned = self.job_ids[:self.size][(self.employer_ids[:self.size] == employer_id) & self.alive[:self.size]]
+            for job_id in owned.tolist():
+                if job_id not in live:
+                    self._remove(job_id)
+
+    def _grow(self, needed):
+        capacity = len(self.job_ids)
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity, 1024)
+        for name in ("job_ids", "employer_ids", "closes", "alive"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _add(self, job, merge=True):
+        self._remove(job.id)
+        row = self.size
+        self._grow(row + 1)
+        self.size += 1
+        self.row_of[job.id] = row
+        self.job_ids[row] = job.id
+        self.employer_ids[row] = job.employer_id or 0
+        self.closes[row] = _closes_at(job)
+        self.alive[row] = True
+        idx, weights = _row_vector(job_text(job))
+        self.pending[row] = (idx, weights)
+        self.pending_df[idx] += 1
+        if merge and len(self.pending) >= MERGE_ROWS:
+            self._merge()
+
+    def _remove(self, job_id):
+        row = self.row_of.pop(job_id, None)
+        if row is None:
+            return
+        self.alive[row] = False
+        self.closes[row] = -np.inf
+        pending = self.pending.pop(row, None)
+        if pending is not None:
+            self.pending_df[pending[0]] -= 1
+        else:
+            self.dead += 1
+            if self.dead > VACUUM_RATIO * self.size:
+                self._vacuum()
+
+    def _merge(self):
+        """Move pending rows into the columns: one sorted np.insert."""
+        if not self.pending:
+            return
+        features = np.concatenate([idx for idx, _ in self.pending.values()])
+        weights = np.concatenate([w for _, w in self.pending.values()])
+        rows = np.repeat(
+            np.fromiter(self.pending.keys(), dtype=np.int32, count=len(self.pending)),
+            [len(idx) for idx, _ in self.pending.values()],
+        )
+        order = np.argsort(features, kind="stable")
+        features, weights, rows = features[order], weights[order], rows[order]
+        # Each entry goes to the end of its column
+        at = self.indptr[features + 1]
+        self.rows = np.insert(self.rows, at, rows)
+        self.data = np.insert(self.data, at, weights)
+        self.indptr[1:] += np.cumsum(np.bincount(features, minlength=matching.FEATURES))
+        self.pending = {}
+        self.pending_df[:] = 0
+
+    def _vacuum(self):
+        """Drop removed rows from the columns and renumber the live ones."""
+        self._merge()
+        size = self.size
+        alive = self.alive[:size]
+        new_row = np.cumsum(alive) - 1
+        keep = alive[self.rows]
+        columns = np.repeat(np.arange(matching.FEATURES), np.diff(self.indptr))
+        self.indptr[1:] = np.cumsum(np.bincount(columns[keep], minlength=matching.FEATURES))
+        self.rows = new_row[self.rows[keep]].astype(np.int32)
+        self.data = self.data[keep]
+        live = int(alive.sum())
+        for name in ("job_ids", "employer_ids", "closes", "alive"):
+            values = getattr(self, name)
+            values[:live] = values[:size][alive]
+            values[live:size] = 0
+        self.size = live
+        self.dead = 0
+        self.row_of = {int(job_id): row for row, job_id in enumerate(self.job_ids[:live].tolist())}
+
+    # --- Queries ---
+
+    def recommend(self, profile_text, k, exclude=(), now=None):
+        """Top k (score, job_id) pairs for a profile text, best first (ties
+        go to the newer job)."""
+        idx, tf = matching.term_vector(profile_text)
+        if not len(idx) or k <= 0:
+            return []
+        now = time.time() if now is None else now
+        with self.lock:
+            n = self.size
+            if not n:
+                return []
+            starts, ends = self.indptr[idx], self.indptr[idx + 1]
+            df = (ends - starts) + self.pending_df[idx]
+            query = tf * (np.log((n + 1) / (df + 1)) + 1)
+            query = (query / np.linalg.norm(query)).astype(np.float32)
+
+            # Sparse mat-vec over the merged rows, column by column: only the
+            # profile terms' columns are read, and rows within a column are
+            # unique so a fancy-index add is exact
+            scores = np.zeros(n, dtype=np.float32)
+            for start, end, weight in zip(starts.tolist(), ends.tolist(), query.tolist()):
+                if end > start:
+                    rows = self.rows[start:end]
+                    scores[rows] += self.data[start:end] * weight
+            if self.pending:
+                dense = np.zeros(matching.FEATURES, dtype=np.float32)
+                dense[idx] = query
+                features = np.concatenate([f for f, _ in self.pending.values()])
+                weights = np.concatenate([w for _, w in self.pending.values()])
+                rows = np.repeat(list(self.pending), [len(f) for f, _ in self.pending.values()])
+                scores += np.bincount(rows, weights=weights * dense[features], minlength=n).astype(np.float32)
+
+            # Removed rows close at -inf, so one check drops them too
+            hits = np.flatnonzero(scores)
+            hits = hits[self.closes[hits] > now]
+            if len(exclude):
+                excluded = [self.row_of[job_id] for job_id in exclude if job_id in self.row_of]
+                hits = hits[~np.isin(hits, excluded)]
+            if not len(hits):
+                return []
+            k = min(k, len(hits))
+            top = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+            job_ids = self.job_ids[top]
+        return sorted(zip(np.round(scores[top], 6).tolist(), job_ids.tolist()), reverse=True)
+
+index = RecommendationIndex()
+
+@events.on_job_change
+def _follow_job(old, new):
+    if new is None:
+        index.remove_job(old.id)
+    else:
+        index.add_job(new)
+
+@events.on_employer_change
+def _follow_employer(db, employer_id):
+    index.reindex_employer(db, employer_id)
+
+def recommendations(db, seeker_id, limit):
+    """Recommended open jobs for a seeker, as JobOut-like rows with a
+    match_score, best first."""
+    profile = db.execute(
+        select(models.JobSeeker.skills, models.JobSeeker.experience).where(models.JobSeeker.id == seeker_id)
+    ).first()
+    text = matching.profile_text(profile.skills, profile.experience) if profile else ""
+    if not text:
+        return []
+    index.ensure_loaded(db)
+    applied = db.execute(
+        select(models.Application.job_id).where(models.Application.seeker_id == seeker_id)
+    ).scalars().all()
+    ranked = index.recommend(text, limit, exclude=applied)
+    if not ranked:
+        return []
+    rows = {row.id: row for row in db.execute(queries.hot_job_listing().where(models.Job.id.in_([i for _, i in ranked])))}
+    return [{**rows[job_id]._mapping, "match_score": score} for score, job_id in ranked if job_id in rows]
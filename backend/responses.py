@@ -0,0 +1,67 @@
+from decimal import Decimal
+from operator import itemgetter
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+# Fast path for the hot list endpoints (search, job lists, applicants).
+#
+# Returning Pydantic models from a route with a response_model costs three
+# passes per row: the handler builds the model, FastAPI dumps it back to a
+# dict, validates that dict into a second model and serializes it. Rows
+# from the listing queries already have the schema's columns and types, so
+# these endpoints build plain dicts straight from the row tuples
+# (rows_out) and send them with ORJSONResponse, which FastAPI passes
+# through untouched. The routes keep their response_model, so the OpenAPI
+# schema is unchanged; test_serialization.py checks the bytes match what
+# the Pydantic path produced.
+
+def _default(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def dumps(content):
+    return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+
+class ORJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content):
+        return dumps(content)
+
+# (schema, row columns) -> (names taken from the row, their getter, defaults
+# for the rest); every row of a query has the same columns
+_layouts = {}
+
+def _layout(schema, columns):
+    key = (schema, columns)
+    layout = _layouts.get(key)
+    if layout is None:
+        positions = {name: i for i, name in enumerate(columns)}
+        names = tuple(name for name in schema.model_fields if name in positions)
+        getter = itemgetter(*(positions[name] for name in names)) if len(names) > 1 else (
+            lambda row, i=positions[names[0]]: (row[i],)
+        )
+        defaults = {
+            name: field.get_default(call_default_factory=True)
+            for name, field in schema.model_fields.items() if name not in positions
+        }
+        layout = _layouts[key] = (names, getter, defaults)
+    return layout
+
+def rows_out(schema, rows, **extra):
+    """JSON-ready dicts of schema's fields from result rows, without
+    building the models. extra sets the same field on every dict."""
+    out = []
+    layout = None
+    for row in rows:
+        if layout is None:
+            names, getter, defaults = layout = _layout(schema, tuple(row._fields))
+            defaults = {**defaults, **extra}
+        item = dict(zip(names, getter(row)))
+        item.update(defaults)
+        out.append(item)
+    return out
@@ -1,88 +1,116 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from .. import models, schemas, database, auth
+from typing import Literal, Optional
+from .. import models, schemas, database, auth, queries, pagination, cache, counters, exports, purge, responses, profiling
 
 router = APIRouter(
     prefix="/admin",
     tags=["admin"],
 )
 
-@router.get("/users", response_model=List[schemas.UserOut])
-def list_users(
-    current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(database.get_db)
+@router.get("/users", response_model=schemas.Page[schemas.UserOut])
+async def list_users(
+    cursor: Optional[str] = None,
+    limit: int = Depends(pagination.page_size),
+    current_user: auth.Principal = Depends(auth.require_admin),
+    db: AsyncSession = Depends(database.get_async_db)
+):
+    query = select(models.User).where(models.User.deleted_at.is_(None))
+    query = pagination.keyset(query, models.User.created_at, models.User.id, cursor, limit)
+    users, next_cursor = pagination.split_page((await db.scalars(query)).all(), limit, "created_at", "id")
+    return {"items": users, "next_cursor": next_cursor}
+
+@router.get("/users/export")
+def export_users(
+    fmt: str = Depends(exports.export_format),
+    current_user: auth.Principal = Depends(auth.require_admin)
 ):
-    if current_user.role != models.UserRole.admin:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    users = db.query(models.User).all()
-    return users
+    u = models.User
+    query = select(u.id, u.email, u.role, u.created_at).where(u.deleted_at.is_(None)).order_by(u.id)
+    return exports.response(query, fmt, "users")
 
 @router.delete("/users/{user_id}")
 def delete_user(
     user_id: int,
-    current_user: models.User = Depends(auth.get_current_active_user),
+    current_user: auth.Principal = Depends(auth.require_admin),
     db: Session = Depends(database.get_db)
 ):
-    if current_user.role != models.UserRole.admin:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not user:
+    # Soft delete: their tokens are rejected on this worker right away (other
+    # workers notice within auth.TOKEN_VERSION_TTL_SECONDS) and their rows
+    # are removed in the background by purge.py
+    if not purge.delete_user(db, user_id):
         raise HTTPException(status_code=404, detail="User not found")
-    
-    db.delete(user)
-    db.commit()
     return {"message": "User deleted"}
 
-@router.get("/jobs", response_model=List[schemas.JobOut])
-def list_jobs(
-    current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(database.get_db)
+@router.get("/jobs", response_model=schemas.Page[schemas.JobOut])
+async def list_jobs(
+    cursor: Optional[str] = None,
+    archived: bool = False,
+    limit: int = Depends(pagination.page_size),
+    current_user: auth.Principal = Depends(auth.require_admin),
+    db: AsyncSession = Depends(database.get_async_db)
 ):
-    if current_user.role != models.UserRole.admin:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    jobs = db.query(models.Job).all()
-    result = []
-    for job in jobs:
-        job_data = schemas.JobOut.model_validate(job)
-        job_data.company_name = job.employer.company_name if job.employer else "Unknown"
-        result.append(job_data)
-    return result
+    # Current jobs by default, the archive with archived=true
+    query = queries.job_listing().where(models.Job.archived == archived)
+    return responses.ORJSONResponse(await queries.job_page(db, query, cursor, limit))
+
+@router.get("/jobs/export")
+def export_jobs(
+    fmt: str = Depends(exports.export_format),
+    current_user: auth.Principal = Depends(auth.require_admin)
+):
+    return exports.response(queries.job_listing().order_by(models.Job.id), fmt, "jobs")
 
 @router.get("/stats")
 def get_stats(
-    current_user: models.User = Depends(auth.get_current_active_user),
+    current_user: auth.Principal = Depends(auth.require_admin),
     db: Session = Depends(database.get_db)
 ):
-    if current_user.role != models.UserRole.admin:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    total_users = db.query(models.User).count()
-    total_jobs = db.query(models.Job).count()
-    total_applications = db.query(models.Application).count()
-    
-    return {
-        "total_users": total_users,
-        "total_jobs": total_jobs,
-        "total_applications": total_applications
-    }
+    # Read from the counters table, not COUNT(*) over the real tables
+    return counters.snapshot(db)
+
+@router.post("/stats/reconcile")
+def reconcile_stats(
+    current_user: auth.Principal = Depends(auth.require_admin),
+    db: Session = Depends(database.get_db)
+):
+    drifted = counters.reconcile(db)
+    return {"drifted": drifted, **counters.snapshot(db)}
+
+@router.get("/cache")
+def get_cache_stats(current_user: auth.Principal = Depends(auth.require_admin)):
+    return {"job_search": cache.job_search_cache.stats()}
 
 @router.delete("/jobs/{job_id}")
 def delete_job(
     job_id: int,
-    current_user: models.User = Depends(auth.get_current_active_user),
+    current_user: auth.Principal = Depends(auth.require_admin),
     db: Session = Depends(database.get_db)
 ):
-    if current_user.role != models.UserRole.admin:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    job = db.query(models.Job).filter(models.Job.id == job_id).first()
-    if not job:
+    if not purge.delete_job(db, job_id):
         raise HTTPException(status_code=404, detail="Job not found")
-        
-    db.delete(job)
-    db.commit()
     return {"message": "Job deleted"}
+
+@router.get("/profiles")
+def list_profiles(current_user: auth.Principal = Depends(auth.require_admin)):
+    # Requests profiled with X-Profile (see profiling.py), newest first; only
+    # this process's
+    return [profile.summary() for profile in profiling.store.list()]
+
+@router.get("/profiles/{profile_id}")
+def download_profile(
+    profile_id: str,
+    fmt: Literal["speedscope", "collapsed"] = Query("speedscope", alias="format"),
+    current_user: auth.Principal = Depends(auth.require_admin)
+):
+    profile = profiling.store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if fmt == "collapsed":
+        headers = {"Content-Disposition": f'attachment; filename="profile-{profile.id}.txt"'}
+        return PlainTextResponse(profile.collapsed(), headers=headers)
+    headers = {"Content-Disposition": f'attachment; filename="profile-{profile.id}.speedscope.json"'}
+    return responses.ORJSONResponse(profile.speedscope(), headers=headers)
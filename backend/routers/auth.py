@@ -1,33 +1,32 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from .. import models, schemas, database, auth
+from starlette.concurrency import run_in_threadpool
+from .. import models, schemas, database, auth, passwords, counters
 
 router = APIRouter(
     prefix="/auth",
     tags=["auth"],
 )
 
-@router.post("/register", response_model=schemas.UserOut)
-def register(user_in: schemas.UserCreate, db: Session = Depends(database.get_db)):
-    # Check if user already exists
-    user = db.query(models.User).filter(models.User.email == user_in.email).first()
-    if user:
-        raise HTTPException(
-            status_code=400,
-            detail="Email already registered",
-        )
-    
-    # Create User
-    hashed_password = auth.get_password_hash(user_in.password)
+# register and login are async so bcrypt can run in the hashing process pool
+# without holding a threadpool worker; their database work is still sync and
+# is pushed to the threadpool explicitly.
+
+def _find_user(db: Session, email: str, include_deleted=False):
+    query = db.query(models.User).filter(models.User.email == email)
+    if not include_deleted:
+        query = query.filter(models.User.deleted_at.is_(None))
+    return query.first()
+
+def _create_user(db: Session, user_in: schemas.UserCreate, hashed_password: str):
     user = models.User(
         email=user_in.email,
         hashed_password=hashed_password,
         role=user_in.role
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    db.flush()
 
     # Create associated profile based on role
     if user.role == models.UserRole.seeker:
@@ -42,31 +41,54 @@ def register(user_in: schemas.UserCreate, db: Session = Depends(database.get_db)
             company_name=user_in.company_name or "New Company",
         )
         db.add(employer)
+    counters.user_created(db, user.role)
     
     db.commit()
+    # Serialise here; touching the expired instance later would query from the event loop
+    return schemas.UserOut.model_validate(user)
+
+def _rehash(db: Session, user: models.User, new_hash: str):
+    user.hashed_password = new_hash
+    db.commit()
+
+@router.post("/register", response_model=schemas.UserOut)
+async def register(user_in: schemas.UserCreate, db: Session = Depends(database.get_db)):
+    # Check if user already exists
+    # A deleted account keeps its email until the purge removes it
+    user = await run_in_threadpool(_find_user, db, user_in.email, True)
+    if user:
+        raise HTTPException(
+            status_code=400,
+            detail="Email already registered",
+        )
     
-    return user
+    # Create User
+    hashed_password = await passwords.hash_password_async(user_in.password)
+    return await run_in_threadpool(_create_user, db, user_in, hashed_password)
 
 @router.post("/login", response_model=schemas.Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(database.get_db)):
-    user = db.query(models.User).filter(models.User.email == form_data.username).first()
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(database.get_db)):
+    user = await run_in_threadpool(_find_user, db, form_data.username)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    if not auth.verify_password(form_data.password, user.hashed_password):
+    verified, new_hash = await passwords.verify_and_update_async(form_data.password, user.hashed_password)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token = auth.create_access_token(
-        data={"sub": user.email, "role": user.role.value}
-    )
-    return {"access_token": access_token, "token_type": "bearer", "role": user.role.value}
+    access_token = auth.create_access_token(data=auth.token_claims(user))
+    role = user.role.value
+    # Hash made with an older cost factor: upgrade it transparently
+    if new_hash:
+        await run_in_threadpool(_rehash, db, user, new_hash)
+    return {"access_token": access_token, "token_type": "bearer", "role": role}
 
 @router.get("/me", response_model=schemas.UserOut)
 def read_users_me(current_user: models.User = Depends(auth.get_current_active_user)):
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from .. import models, schemas, database, auth
+from starlette.concurrency import run_in_threadpool
+from typing import Literal, Optional
+from .. import models, schemas, database, auth, queries, pagination, events, counters, matching, exports, bulk, purge, archive, normalize, geo, responses
 
 router = APIRouter(
     prefix="/employer",
@@ -10,11 +13,9 @@ router = APIRouter(
 
 @router.get("/profile", response_model=schemas.EmployerOut)
 def get_profile(
-    current_user: models.User = Depends(auth.get_current_active_user),
+    current_user: auth.Principal = Depends(auth.require_employer),
     db: Session = Depends(database.get_db)
 ):
-    if current_user.role != models.UserRole.employer:
-        raise HTTPException(status_code=403, detail="Not authorized")
     employer = db.query(models.Employer).filter(models.Employer.id == current_user.id).first()
     if not employer:
         raise HTTPException(status_code=404, detail="Profile not found")
@@ -23,12 +24,9 @@ def get_profile(
 @router.put("/profile", response_model=schemas.EmployerOut)
 def update_profile(
     profile: schemas.EmployerCreate,
-    current_user: models.User = Depends(auth.get_current_active_user),
+    current_user: auth.Principal = Depends(auth.require_employer),
     db: Session = Depends(database.get_db)
 ):
-    if current_user.role != models.UserRole.employer:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     employer = db.query(models.Employer).filter(models.Employer.id == current_user.id).first()
     if not employer:
         employer = models.Employer(id=current_user.id, company_name=profile.company_name)
@@ -38,138 +36,252 @@ def update_profile(
     employer.company_description = profile.company_description
     employer.website = profile.website
     employer.location = profile.location
+    employer.place_id = geo.derived(profile.location)["place_id"]
     
     db.commit()
     db.refresh(employer)
+    events.employer_changed(db, employer.id)
     return employer
 
 @router.post("/jobs", response_model=schemas.JobOut)
 def post_job(
     job: schemas.JobCreate,
-    current_user: models.User = Depends(auth.get_current_active_user),
+    current_user: auth.Principal = Depends(auth.require_employer),
     db: Session = Depends(database.get_db)
 ):
-    if current_user.role != models.UserRole.employer:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     new_job = models.Job(
         **job.dict(exclude={"closing_date"}),
         employer_id=current_user.id,
-        closing_date=job.closing_date
+        closing_date=job.closing_date,
+        **normalize.derived(job.job_type, job.salary_range),
+        **geo.derived(job.location)
     )
     db.add(new_job)
+    counters.job_created(db, current_user.id)
     db.commit()
-    db.refresh(new_job)
     
-    job_out = schemas.JobOut.model_validate(new_job)
-    job_out.company_name = current_user.employer_profile.company_name
+    job_out = queries.job_out(db, new_job.id)
+    events.job_changed(None, job_out)
     return job_out
 
-@router.get("/jobs", response_model=List[schemas.JobOut])
-def my_jobs(
-    current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(database.get_db)
+@router.post("/jobs/bulk", response_model=schemas.JobBulkOut)
+async def bulk_post_jobs(
+    request: Request,
+    current_user: auth.Principal = Depends(auth.require_employer)
 ):
-    if current_user.role != models.UserRole.employer:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    jobs = db.query(models.Job).filter(models.Job.employer_id == current_user.id).all()
-    
-    result = []
-    for job in jobs:
-        job_out = schemas.JobOut.model_validate(job)
-        job_out.company_name = current_user.employer_profile.company_name
-        result.append(job_out)
-    return result
+    # Body is a JSON array, JSONL or CSV of JobCreate rows (plus optional
+    # external_id), chosen by Content-Type. See bulk.py.
+    upload = await bulk.spool(request)
+    try:
+        return await run_in_threadpool(bulk.sync, upload, request.headers.get("content-type", ""), current_user.id)
+    finally:
+        upload.close()
+
+@router.get("/jobs", response_model=schemas.Page[schemas.JobOut])
+async def my_jobs(
+    cursor: Optional[str] = None,
+    limit: int = Depends(pagination.page_size),
+    current_user: auth.Principal = Depends(auth.require_employer),
+    db: AsyncSession = Depends(database.get_async_db)
+):
+    query = queries.job_listing().where(models.Job.employer_id == current_user.id)
+    return responses.ORJSONResponse(await queries.job_page(db, query, cursor, limit))
 
 @router.put("/jobs/{job_id}", response_model=schemas.JobOut)
 def update_job(
     job_id: int,
     job_update: schemas.JobUpdate,
-    current_user: models.User = Depends(auth.get_current_active_user),
+    current_user: auth.Principal = Depends(auth.require_employer),
     db: Session = Depends(database.get_db)
 ):
-    if current_user.role != models.UserRole.employer:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    job = db.query(models.Job).filter(models.Job.id == job_id, models.Job.employer_id == current_user.id).first()
+    job = db.query(models.Job).filter(
+        models.Job.id == job_id, models.Job.employer_id == current_user.id, models.Job.deleted_at.is_(None)
+    ).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
+    old_job = schemas.JobOut.model_validate(job)
     update_data = job_update.dict(exclude_unset=True)
     for key, value in update_data.items():
         setattr(job, key, value)
+    if update_data.keys() & {"job_type", "salary_range"}:
+        for key, value in normalize.derived(job.job_type, job.salary_range).items():
+            setattr(job, key, value)
+    if "location" in update_data:
+        for key, value in geo.derived(job.location).items():
+            setattr(job, key, value)
+    if update_data.keys() & {"title", "description"}:
+        matching.forget_job_scores(db, [job_id])
+    if job.archived and "closing_date" in update_data and archive.is_open(job.closing_date):
+        # Extended past today: back into search
+        job.archived = False
     
     db.commit()
-    db.refresh(job)
-    job_out = schemas.JobOut.model_validate(job)
-    job_out.company_name = current_user.employer_profile.company_name
+    job_out = queries.job_out(db, job_id)
+    events.job_changed(old_job, job_out)
     return job_out
 
 @router.delete("/jobs/{job_id}")
 def delete_job(
     job_id: int,
-    current_user: models.User = Depends(auth.get_current_active_user),
+    current_user: auth.Principal = Depends(auth.require_employer),
     db: Session = Depends(database.get_db)
 ):
-    if current_user.role != models.UserRole.employer:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    job = db.query(models.Job).filter(models.Job.id == job_id, models.Job.employer_id == current_user.id).first()
-    if not job:
+    # Applications go with it, in the background (see purge.py)
+    if not purge.delete_job(db, job_id, employer_id=current_user.id):
         raise HTTPException(status_code=404, detail="Job not found")
-        
-    db.delete(job)
-    db.commit()
     return {"message": "Job deleted"}
 
-@router.get("/jobs/{job_id}/applicants", response_model=List[schemas.ApplicationOut])
+def _applicant_rows(job_id: int, employer_id: int):
+    # Everything the applicant card shows, in one joined query. Joining the
+    # job on its owner doubles as the ownership check.
+    return (
+        select(
+            *queries.APPLICATION_COLUMNS,
+            models.Job.title.label("job_title"),
+            models.JobSeeker.full_name.label("seeker_name"),
+            models.User.email.label("seeker_email"),
+            models.JobSeeker.skills.label("seeker_skills"),
+            models.JobSeeker.education.label("seeker_education"),
+            models.JobSeeker.experience.label("seeker_experience"),
+            models.JobSeeker.resume_link.label("seeker_resume_link"),
+        )
+        .join(models.Job, models.Job.id == models.Application.job_id)
+        .outerjoin(models.JobSeeker, models.JobSeeker.id == models.Application.seeker_id)
+        .outerjoin(models.User, models.User.id == models.JobSeeker.id)
+        .where(
+            models.Application.job_id == job_id, models.Job.employer_id == employer_id,
+            models.Job.deleted_at.is_(None), queries.live_user(models.Application.seeker_id),
+        )
+    )
+
+def _owned_job(db: Session, job_id: int, employer_id: int):
+    job = db.execute(
+        select(models.Job.title, models.Job.description)
+        .where(models.Job.id == job_id, models.Job.employer_id == employer_id, models.Job.deleted_at.is_(None))
+    ).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found or not owned by you")
+    return job
+
+def _ranked_applicants(db: Session, job_id: int, employer_id: int, cursor, limit):
+    matching.fill_scores(db, job_id, employer_id)
+    query = pagination.keyset(
+        _applicant_rows(job_id, employer_id).add_columns(models.Application.match_score)
+        .where(models.Application.match_score.is_not(None)),
+        models.Application.match_score, models.Application.id, cursor, limit, pagination.decode_rank_cursor,
+    )
+    rows, next_cursor = pagination.split_page(
+        db.execute(query).all(), limit, "match_score", "id", pagination.encode_rank_cursor
+    )
+    if not rows and not cursor:
+        _owned_job(db, job_id, employer_id)
+    return responses.ORJSONResponse({"items": queries.application_dicts(rows), "next_cursor": next_cursor})
+
+@router.get("/jobs/{job_id}/applicants", response_model=schemas.Page[schemas.ApplicationOut])
 def view_applicants(
     job_id: int,
-    current_user: models.User = Depends(auth.get_current_active_user),
+    cursor: Optional[str] = None,
+    sort: Literal["recent", "match"] = "recent",
+    limit: int = Depends(pagination.page_size),
+    current_user: auth.Principal = Depends(auth.require_employer),
     db: Session = Depends(database.get_db)
 ):
-    if current_user.role != models.UserRole.employer:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    # Ensure job belongs to employer
-    job = db.query(models.Job).filter(models.Job.id == job_id, models.Job.employer_id == current_user.id).first()
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found or not owned by you")
-    
-    apps = db.query(models.Application).filter(models.Application.job_id == job_id).all()
-    
-    result = []
-    for app in apps:
-        app_out = schemas.ApplicationOut.model_validate(app)
-        app_out.job_title = job.title
-        app_out.seeker_name = app.seeker.full_name
-        app_out.seeker_email = app.seeker.user.email
-        app_out.seeker_skills = app.seeker.skills
-        app_out.seeker_education = app.seeker.education
-        app_out.seeker_experience = app.seeker.experience
-        app_out.seeker_resume_link = app.seeker.resume_link
-        result.append(app_out)
-    return result
+    # sort=match ranks applicants by how well their skills and experience
+    # match the job (scores stored per application, see matching.py); the
+    # default is newest first.
+    if sort == "match":
+        return _ranked_applicants(db, job_id, current_user.id, cursor, limit)
+
+    query = pagination.keyset(
+        _applicant_rows(job_id, current_user.id), models.Application.applied_at, models.Application.id, cursor, limit
+    )
+    rows, next_cursor = pagination.split_page(db.execute(query).all(), limit, "applied_at", "id")
+    if not rows and not cursor:
+        # No rows: either no applicants yet or not this employer's job
+        _owned_job(db, job_id, current_user.id)
+    return responses.ORJSONResponse({"items": queries.application_dicts(rows), "next_cursor": next_cursor})
+
+@router.get("/jobs/{job_id}/applicants/export")
+def export_applicants(
+    job_id: int,
+    fmt: str = Depends(exports.export_format),
+    current_user: auth.Principal = Depends(auth.require_employer),
+    db: Session = Depends(database.get_db)
+):
+    _owned_job(db, job_id, current_user.id)
+    query = _applicant_rows(job_id, current_user.id).order_by(models.Application.id)
+    return exports.response(query, fmt, f"job-{job_id}-applicants")
+
+@router.put("/applications/status")
+def bulk_update_application_status(
+    change: schemas.ApplicationStatusBulk,
+    current_user: auth.Principal = Depends(auth.require_employer),
+    db: Session = Depends(database.get_db)
+):
+    # Either explicit ids or a filter ("every Applied applicant of job X").
+    # Applications of other employers' jobs are simply not matched.
+    if change.application_ids is None and change.job_id is None:
+        raise HTTPException(status_code=400, detail="Give application_ids or job_id")
+
+    app, job = models.Application, models.Job
+    new_status = models.ApplicationStatus(change.status.value)
+    conditions = [
+        app.job_id == job.id, job.employer_id == current_user.id, job.deleted_at.is_(None), app.status != new_status,
+    ]
+    if change.application_ids is not None:
+        conditions.append(app.id.in_(change.application_ids))
+    if change.job_id is not None:
+        conditions.append(app.job_id == change.job_id)
+    if change.current_status is not None:
+        conditions.append(app.status == models.ApplicationStatus(change.current_status.value))
+
+    # Counted first (rows locked on MySQL) so the counters move by exactly
+    # what the UPDATE changes
+    previous = db.execute(
+        select(app.status, func.count()).select_from(app).join(job, app.job_id == job.id)
+        .where(*conditions).group_by(app.status).with_for_update()
+    ).all()
+    # One set-based UPDATE applications ... JOIN jobs (UPDATE ... FROM on SQLite/Postgres)
+    result = db.execute(
+        update(app).where(*conditions).values(status=new_status).execution_options(synchronize_session=False)
+    )
+    counters.bump(db, *(
+        delta for old_status, n in previous for delta in (
+            (counters.APPLICATIONS_BY_STATUS, old_status.value, -n),
+            (counters.APPLICATIONS_BY_STATUS, new_status.value, n),
+        )
+    ))
+    db.commit()
+    return {"updated": result.rowcount, "previous_status": {old_status.value: n for old_status, n in previous}}
 
 @router.put("/applications/{app_id}/status")
 def update_application_status(
     app_id: int,
     status: schemas.ApplicationStatus,
-    current_user: models.User = Depends(auth.get_current_active_user),
+    current_user: auth.Principal = Depends(auth.require_employer),
     db: Session = Depends(database.get_db)
 ):
-    if current_user.role != models.UserRole.employer:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    app = db.query(models.Application).filter(models.Application.id == app_id).first()
-    if not app:
+    # Status and owner in one query instead of loading app, then app.job.
+    # The application row stays locked (MySQL) until commit, so concurrent
+    # updates move the status counters from the status they really replace.
+    row = db.execute(
+        select(models.Application.status, models.Job.employer_id)
+        .join(models.Job, models.Job.id == models.Application.job_id)
+        .where(models.Application.id == app_id, models.Job.deleted_at.is_(None))
+        .with_for_update(of=models.Application)
+    ).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Application not found")
     
     # Check ownership via job
-    if app.job.employer_id != current_user.id:
+    if row.employer_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to update this application")
     
-    app.status = status
+    counters.application_status_changed(db, row.status, status)
+    db.execute(
+        update(models.Application).where(models.Application.id == app_id)
+        .values(status=models.ApplicationStatus(status.value))
+    )
     db.commit()
     return {"message": "Status updated"}
@@ -0,0 +1,43 @@
+import asyncio
+import os
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, func
+from .. import database, migrations
+
+router = APIRouter(
+    prefix="/health",
+    tags=["health"],
+)
+
+# Probes for the process manager / load balancer. Liveness never touches
+# the database, so a database outage does not get healthy workers
+# restarted; readiness takes the worker out of rotation until the app has
+# started, the database answers and the schema is migrated (python
+# migrate.py), and again once shutdown begins.
+
+READY_TIMEOUT_SECONDS = float(os.getenv("READY_TIMEOUT_SECONDS", "2"))
+
+@router.get("/live")
+def live():
+    return {"status": "ok"}
+
+async def _schema_version():
+    async with database.get_async_engine().connect() as conn:
+        return (await conn.execute(select(func.max(migrations.schema_version.c.version)))).scalar()
+
+@router.get("/ready")
+async def ready(request: Request):
+    expected = migrations.MIGRATIONS[-1][0]
+    body = {"status": "unavailable", "started": getattr(request.app.state, "ready", False),
+            "database": "ok", "schema_version": None, "expected_version": expected}
+    try:
+        body["schema_version"] = await asyncio.wait_for(_schema_version(), READY_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        body["database"] = "timeout"
+    except Exception as exc:
+        body["database"] = f"error: {type(exc).__name__}"
+    if body["started"] and body["database"] == "ok" and body["schema_version"] == expected:
+        body["status"] = "ready"
+        return body
+    return JSONResponse(body, status_code=503)
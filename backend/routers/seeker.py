@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Header, Request, Response
+from sqlalchemy import select, literal, literal_column
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
-from .. import models, schemas, database, auth
+from .. import models, schemas, database, auth, queries, pagination, search, cache, counters, idempotency, recommend, filters, responses, matching
 
 router = APIRouter(
     prefix="/seeker",
@@ -10,11 +14,9 @@ router = APIRouter(
 
 @router.get("/profile", response_model=schemas.JobSeekerOut)
 def get_profile(
-    current_user: models.User = Depends(auth.get_current_active_user),
+    current_user: auth.Principal = Depends(auth.require_seeker),
     db: Session = Depends(database.get_db)
 ):
-    if current_user.role != models.UserRole.seeker:
-        raise HTTPException(status_code=403, detail="Not authorized")
     seeker = db.query(models.JobSeeker).filter(models.JobSeeker.id == current_user.id).first()
     if not seeker:
         raise HTTPException(status_code=404, detail="Profile not found")
@@ -23,18 +25,17 @@ def get_profile(
 @router.put("/profile", response_model=schemas.JobSeekerOut)
 def update_profile(
     profile: schemas.JobSeekerCreate,
-    current_user: models.User = Depends(auth.get_current_active_user),
+    current_user: auth.Principal = Depends(auth.require_seeker),
     db: Session = Depends(database.get_db)
 ):
-    if current_user.role != models.UserRole.seeker:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     seeker = db.query(models.JobSeeker).filter(models.JobSeeker.id == current_user.id).first()
     if not seeker:
         # Should create if missing (though auth/register does it)
         seeker = models.JobSeeker(id=current_user.id, full_name=profile.full_name)
         db.add(seeker)
     
+    if (seeker.skills, seeker.experience) != (profile.skills, profile.experience):
+        matching.forget_seeker_scores(db, seeker.id)
     seeker.full_name = profile.full_name
     seeker.skills = profile.skills
     seeker.experience = profile.experience
@@ -45,79 +46,169 @@ def update_profile(
     db.refresh(seeker)
     return seeker
 
-@router.get("/jobs", response_model=List[schemas.JobOut])
-def search_jobs(
-    title: Optional[str] = None,
-    location: Optional[str] = None,
-    db: Session = Depends(database.get_db)
+def _ranked_search(q, cursor, limit, job_filter):
+    db = database.SessionLocal()
+    try:
+        return search.search_page(db, q, cursor, limit, job_filter)
+    finally:
+        db.close()
+
+@router.get("/jobs", response_model=schemas.Page[schemas.JobOut])
+async def search_jobs(
+    request: Request,
+    q: Optional[str] = None,
+    job_filter: filters.JobFilter = Depends(),
+    cursor: Optional[str] = None,
+    limit: int = Depends(pagination.page_size),
+    db: AsyncSession = Depends(database.get_async_db)
 ):
-    query = db.query(models.Job)
-    if title:
-        query = query.filter(models.Job.title.contains(title))
-    if location:
-        query = query.filter(models.Job.location.contains(location))
-    
-    jobs = query.all()
-    # Populate company_name manually for the response provided manually
-    # Note: Using Pydantic's orm_mode, we might need a richer query or property.
-    # For simplicity, let's just use the relationship in schema or loop.
-    # Actually, JobOut has company_name field, but model doesn't.
-    # We can rely on relationship "employer" -> "company_name" and schema update
-    # But let's just stick to simpler approach:
-    result = []
-    for job in jobs:
-        job_data = schemas.JobOut.model_validate(job)
-        job_data.company_name = job.employer.company_name if job.employer else "Unknown"
-        result.append(job_data)
-    return result
+    # Public and read-heavy: pages are served from the response cache and
+    # evicted precisely when a job they cover changes (see cache.py).
+    q = q.strip() if q and q.strip() else None
+    params = {"q": q, **job_filter.params(), "cursor": cursor, "limit": limit}
+    key = cache.ResponseCache.key("jobs", params)
+    cached = cache.job_search_cache.get(key)
+    if cached is not None:
+        return cache.job_search_cache.respond(request, *cached, hit=True)
+    generation = cache.job_search_cache.generation
+
+    # Keyword search is ranked by relevance through the in-process index;
+    # without q the listing stays in newest-first order. Ranking is CPU
+    # work (and the first call builds the index), so it runs off the loop.
+    if q:
+        page = await run_in_threadpool(_ranked_search, q, cursor, limit, job_filter)
+        newest = oldest = None
+    else:
+        page = await queries.job_page(db, job_filter.where(queries.hot_job_listing()), cursor, limit)
+        newest = pagination.decode_cursor(cursor) if cursor else None
+        last = page["items"][-1] if page["items"] and page["next_cursor"] else None
+        oldest = (last["posted_at"], last["id"]) if last else None
+    job_filter.annotate(page["items"])
+
+    body = responses.dumps(page)
+    etag = cache.job_search_cache.put(key, cache.CachedPage(params, newest, oldest, page["items"]), body, generation)
+    return cache.job_search_cache.respond(request, etag, body, hit=False)
+
+@router.get("/jobs/facets", response_model=schemas.JobFacets)
+async def job_facets(
+    request: Request,
+    job_filter: filters.JobFilter = Depends(),
+    db: AsyncSession = Depends(database.get_async_db)
+):
+    # Counts for the filter sidebar under the current filters, cached like
+    # search pages; any change to a matching job evicts them
+    params = job_filter.params()
+    key = cache.ResponseCache.key("facets", params)
+    cached = cache.job_search_cache.get(key)
+    if cached is not None:
+        return cache.job_search_cache.respond(request, *cached, hit=True)
+    generation = cache.job_search_cache.generation
+    result = await db.execute(filters.facet_query(job_filter))
+    body = filters.facets_out(result.all()).model_dump_json().encode()
+    etag = cache.job_search_cache.put(key, cache.CachedPage(params, None, None, []), body, generation)
+    return cache.job_search_cache.respond(request, etag, body, hit=False)
+
+@router.get("/jobs/{job_id}", response_model=schemas.JobOut)
+async def get_job(job_id: int, db: AsyncSession = Depends(database.get_async_db)):
+    # Archived (expired) jobs stay reachable here; only deleted ones are gone
+    row = (await db.execute(queries.job_listing().where(models.Job.id == job_id))).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return schemas.JobOut(**row._mapping)
+
+def _recommendations(seeker_id, limit):
+    db = database.SessionLocal()
+    try:
+        return recommend.recommendations(db, seeker_id, limit)
+    finally:
+        db.close()
+
+@router.get("/recommendations", response_model=List[schemas.JobRecommendation])
+async def recommended_jobs(
+    limit: int = Depends(pagination.page_size),
+    current_user: auth.Principal = Depends(auth.require_seeker)
+):
+    # Open jobs best matching the seeker's skills and experience, minus the
+    # ones they applied to. CPU work like ranked search, so off the loop.
+    return await run_in_threadpool(_recommendations, current_user.id, limit)
+
+def _duplicate_application(error):
+    # The unique (job_id, seeker_id) index, as each driver reports it; any
+    # other violation (a purged seeker's foreign key, say) is a real error
+    message = str(error.orig)
+    return "uq_applications_job_seeker" in message or "applications.job_id, applications.seeker_id" in message
+
+def _insert_application(db: Session, job_id: int, seeker_id: int):
+    # One INSERT ... SELECT: the SELECT makes a missing job insert nothing,
+    # and the unique (job_id, seeker_id) index rejects a second application
+    # even when two requests race.
+    table = models.Application.__table__
+    source = select(
+        models.Job.id,
+        literal(seeker_id),
+        literal(models.ApplicationStatus.applied, table.c.status.type),
+    ).where(models.Job.id == job_id, queries.live_job(), queries.hot_job())
+    insert = table.insert().from_select(["job_id", "seeker_id", "status"], source)
+
+    try:
+        dialect = db.get_bind().dialect
+        if dialect.insert_returning:
+            # SQLAlchemy does not correlate a subquery in RETURNING with the
+            # inserted table, so the new row's job_id is named explicitly
+            job = aliased(models.Job, name="job")
+            new_job_id = literal_column(dialect.identifier_preparer.format_column(table.c.job_id, use_table=True))
+            job_title = select(job.title).where(job.id == new_job_id).scalar_subquery()
+            row = db.execute(insert.returning(*table.c, job_title.label("job_title"))).first()
+        else:
+            # MySQL has no RETURNING; read the new row back by primary key
+            result = db.execute(insert)
+            row = db.execute(
+                select(*queries.APPLICATION_COLUMNS, models.Job.title.label("job_title"))
+                .join(models.Job, models.Job.id == models.Application.job_id)
+                .where(models.Application.id == result.lastrowid)
+            ).first() if result.rowcount else None
+    except IntegrityError as e:
+        db.rollback()
+        if not _duplicate_application(e):
+            raise
+        raise HTTPException(status_code=400, detail="Already applied")
+    if row is None:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    counters.application_created(db)
+    db.commit()
+    return schemas.ApplicationOut(**row._mapping)
 
 @router.post("/apply/{job_id}", response_model=schemas.ApplicationOut)
 def apply_for_job(
     job_id: int,
-    current_user: models.User = Depends(auth.get_current_active_user),
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    current_user: auth.Principal = Depends(auth.require_seeker),
     db: Session = Depends(database.get_db)
 ):
-    if current_user.role != models.UserRole.seeker:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    job = db.query(models.Job).filter(models.Job.id == job_id).first()
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    existing_app = db.query(models.Application).filter(
-        models.Application.job_id == job_id,
-        models.Application.seeker_id == current_user.id
-    ).first()
-    
-    if existing_app:
-        raise HTTPException(status_code=400, detail="Already applied")
-    
-    application = models.Application(
-        job_id=job_id,
-        seeker_id=current_user.id
-    )
-    db.add(application)
-    db.commit()
-    db.refresh(application)
-    
-    # Return with extra data
-    app_out = schemas.ApplicationOut.model_validate(application)
-    app_out.job_title = job.title
+    if not idempotency_key:
+        return _insert_application(db, job_id, current_user.id)
+
+    key = (current_user.id, "apply", job_id, idempotency_key)
+    app_out, replayed = idempotency.store.run(key, lambda: _insert_application(db, job_id, current_user.id))
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
     return app_out
 
-@router.get("/applications", response_model=List[schemas.ApplicationOut])
-def my_applications(
-    current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(database.get_db)
+@router.get("/applications", response_model=schemas.Page[schemas.ApplicationOut])
+async def my_applications(
+    cursor: Optional[str] = None,
+    limit: int = Depends(pagination.page_size),
+    current_user: auth.Principal = Depends(auth.require_seeker),
+    db: AsyncSession = Depends(database.get_async_db)
 ):
-    if current_user.role != models.UserRole.seeker:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    apps = db.query(models.Application).filter(models.Application.seeker_id == current_user.id).all()
-    
-    result = []
-    for app in apps:
-        app_out = schemas.ApplicationOut.model_validate(app)
-        app_out.job_title = app.job.title
-        result.append(app_out)
-    return result
+    query = (
+        select(*queries.APPLICATION_COLUMNS, models.Job.title.label("job_title"))
+        .join(models.Job, models.Job.id == models.Application.job_id)
+        .where(models.Application.seeker_id == current_user.id, queries.live_job())
+    )
+    query = pagination.keyset(query, models.Application.applied_at, models.Application.id, cursor, limit)
+    rows, next_cursor = pagination.split_page((await db.execute(query)).all(), limit, "applied_at", "id")
+    return responses.ORJSONResponse({"items": queries.application_dicts(rows), "next_cursor": next_cursor})
@@ -0,0 +1,57 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from starlette.concurrency import run_in_threadpool
+
+# Periodic background jobs (purge, archive), started from the app lifespan.
+# Each runs its synchronous function in the threadpool every interval
+# seconds; an interval of 0 disables it (run the matching CLI from cron
+# instead). The jobs are written to be safe with one copy per process.
+#
+# A run in the threadpool cannot be cancelled, so each job gets a
+# threading.Event as its stopping argument: stop() sets it, and the job
+# checks it between chunks (see between_chunks) and returns early.
+
+logger = logging.getLogger(__name__)
+
+# The stopping event of each running task
+_stopping = {}
+
+def between_chunks(seconds, stopping=None):
+    """Pause between a job's chunks; True if it should stop instead."""
+    if stopping is None:
+        time.sleep(seconds)
+        return False
+    return stopping.wait(seconds)
+
+async def _run(name, fn, interval, stopping):
+    # First run at a random point in the first interval: workers restarted
+    # together neither hit the database at once nor during startup
+    await asyncio.sleep(random.uniform(0, interval))
+    while True:
+        try:
+            result = await run_in_threadpool(fn, stopping=stopping)
+            if result:
+                logger.info("%s: %s", name, result)
+        except Exception:
+            logger.exception("%s failed; retrying in %ss", name, interval)
+        await asyncio.sleep(interval)
+
+def start(name, fn, interval):
+    if interval <= 0:
+        return None
+    stopping = threading.Event()
+    task = asyncio.create_task(_run(name, fn, interval, stopping), name=name)
+    _stopping[task] = stopping
+    return task
+
+async def stop(*tasks):
+    tasks = [task for task in tasks if task is not None]
+    for task in tasks:
+        _stopping.pop(task).set()
+        task.cancel()
+    # A run in progress stops after its current chunk, and the
+    # cancellation only completes when it has returned
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, field_validator
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import Optional, List, Generic, TypeVar
 from datetime import datetime
 from enum import Enum
 
@@ -13,6 +13,14 @@ class UserRole(str, Enum):
     employer = "employer"
     admin = "admin"
 
+class EmploymentType(str, Enum):
+    full_time = "Full-time"
+    part_time = "Part-time"
+    contract = "Contract"
+    temporary = "Temporary"
+    internship = "Internship"
+    other = "Other"
+
 class ApplicationStatus(str, Enum):
     applied = "Applied"
     accepted = "Accepted"
@@ -74,6 +82,7 @@ class EmployerCreate(EmployerBase):
 
 class EmployerOut(EmployerBase):
     id: int
+    place_id: Optional[str] = None
     class Config:
         from_attributes = True
 
@@ -106,15 +115,70 @@ class JobUpdate(BaseModel):
     def validate_closing_date(cls, v):
         return empty_to_none(v)
 
+class JobBulkItem(JobCreate):
+    # Rows with an external_id are upserted; without one they are always created
+    external_id: Optional[str] = Field(None, max_length=255)
+
+    @field_validator('external_id', mode='before')
+    @classmethod
+    def validate_external_id(cls, v):
+        return empty_to_none(v)
+
+class JobBulkResult(BaseModel):
+    row: int
+    status: str  # created, updated, unchanged or error
+    id: Optional[int] = None
+    external_id: Optional[str] = None
+    errors: Optional[List[str]] = None
+
+class JobBulkOut(BaseModel):
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    results: List[JobBulkResult] = []
+
 class JobOut(JobBase):
     id: int
     employer_id: int
     posted_at: datetime
     closing_date: Optional[datetime] = None
     company_name: Optional[str] = None # Injected manually if needed
+    # Past its closing date and out of search; still readable by id
+    archived: bool = False
+    # Parsed from job_type and salary_range; salaries per year
+    employment_type: Optional[EmploymentType] = None
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    salary_currency: Optional[str] = None
+    # Gazetteer place of the location, if it names one
+    place_id: Optional[str] = None
+    geohash: Optional[str] = None
+    # From the near= point, on searches that give one
+    distance_km: Optional[float] = None
     class Config:
         from_attributes = True
 
+class JobRecommendation(JobOut):
+    # Cosine similarity of the job to the seeker's skills and experience (0..1)
+    match_score: float
+
+class FacetCount(BaseModel):
+    value: Optional[str] = None  # None counts jobs without one
+    count: int
+
+class SalaryBucket(BaseModel):
+    currency: str
+    min: int
+    max: Optional[int] = None  # None for the top bucket
+    count: int
+
+class JobFacets(BaseModel):
+    total: int
+    employment_type: List[FacetCount]
+    location: List[FacetCount]
+    salary: List[SalaryBucket]
+
 # --- Application Schemas ---
 class ApplicationBase(BaseModel):
     job_id: int
@@ -132,5 +196,21 @@ class ApplicationOut(BaseModel):
     seeker_education: Optional[str] = None
     seeker_experience: Optional[str] = None
     seeker_resume_link: Optional[str] = None
+    # Set when applicants are listed with sort=match (0..1)
+    match_score: Optional[float] = None
     class Config:
         from_attributes = True
+
+class ApplicationStatusBulk(BaseModel):
+    status: ApplicationStatus
+    application_ids: Optional[List[int]] = Field(None, max_length=5000)
+    job_id: Optional[int] = None
+    # Only change applications currently in this status
+    current_status: Optional[ApplicationStatus] = None
+
+# --- Pagination ---
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,323 @@
+import heapq
+import math
+import re
+import threading
+from functools import lru_cache
+from collections import Counter, defaultdict, namedtuple
+
+from sqlalchemy import select
+from . import models, queries, pagination, events
+
+# In-process full-text search over job postings: an inverted index of
+# stemmed terms from title, description, location and company name, ranked
+# with BM25. It follows job and employer changes through backend.events; the
+# first search in a process builds it from the database.
+
+K1 = 1.2
+B = 0.75
+
+# Term frequency multipliers per field, so a match in the title outranks
+# one buried in the description.
+FIELD_WEIGHTS = {"title": 3, "company_name": 2, "location": 2, "description": 1}
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have in is it its of on or our that
+the their this to we will with you your
+""".split())
+
+# What filters.JobFilter.matches reads, kept per indexed job
+FilterFields = namedtuple("FilterFields", "title location employment_type salary_min salary_max salary_currency geohash")
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+def tokenize(text):
+    if not text:
+        return []
+    return [stem(t) for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+# --- Porter stemmer ---
+
+def _is_cons(word, i):
+    c = word[i]
+    if c in "aeiou":
+        return False
+    if c == "y":
+        return i == 0 or not _is_cons(word, i - 1)
+    return True
+
+def _measure(stem):
+    # Number of vowel-consonant sequences in [C](VC)^m[V]
+    n, i, length = 0, 0, len(stem)
+    while i < length and _is_cons(stem, i):
+        i += 1
+    while i < length:
+        while i < length and not _is_cons(stem, i):
+            i += 1
+        if i >= length:
+            break
+        while i < length and _is_cons(stem, i):
+            i += 1
+        n += 1
+    return n
+
+def _has_vowel(stem):
+    return any(not _is_cons(stem, i) for i in range(len(stem)))
+
+def _ends_double_cons(word):
+    return len(word) >= 2 and word[-1] == word[-2] and _is_cons(word, len(word) - 1)
+
+def _ends_cvc(word):
+    return (
+        len(word) >= 3
+        and _is_cons(word, len(word) - 3)
+        and not _is_cons(word, len(word) - 2)
+        and _is_cons(word, len(word) - 1)
+        and word[-1] not in "wxy"
+    )
+
+_STEP2 = [
+    ("ational", "ate"), ("tional", "tion"), ("enci", "ence"), ("anci", "ance"),
+    ("izer", "ize"), ("abli", "able"), ("alli", "al"), ("entli", "ent"), ("eli", "e"),
+    ("ousli", "ous"), ("ization", "ize"), ("ation", "ate"), ("ator", "ate"),
+    ("alism", "al"), ("iveness", "ive"), ("fulness", "ful"), ("ousness", "ous"),
+    ("aliti", "al"), ("iviti", "ive"), ("biliti", "ble"),
+]
+_STEP3 = [
+    ("icate", "ic"), ("ative", ""), ("alize", "al"), ("iciti", "ic"),
+    ("ical", "ic"), ("ful", ""), ("ness", ""),
+]
+_STEP4 = [
+    "al", "ance", "ence", "er", "ic", "able", "ible", "ant", "ement", "ment",
+    "ent", "ion", "ou", "ism", "ate", "iti", "ous", "ive", "ize",
+]
+# Longest suffix wins within each step
+_STEP2.sort(key=lambda rule: -len(rule[0]))
+_STEP3.sort(key=lambda rule: -len(rule[0]))
+_STEP4.sort(key=len, reverse=True)
+
+def _replace_suffix(word, rules):
+    for suffix, replacement in rules:
+        if word.endswith(suffix):
+            base = word[:-len(suffix)]
+            if _measure(base) > 0:
+                return base + replacement
+            return word
+    return word
+
+@lru_cache(maxsize=65536)
+def stem(word):
+    if len(word) <= 2 or not word.isalpha():
+        return word
+
+    # Step 1a: plurals
+    if word.endswith("sses"):
+        word = word[:-2]
+    elif word.endswith("ies"):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+
+    # Step 1b: -eed, -ed, -ing
+    if word.endswith("eed"):
+        if _measure(word[:-3]) > 0:
+            word = word[:-1]
+    else:
+        for suffix in ("ed", "ing"):
+            if word.endswith(suffix) and _has_vowel(word[:-len(suffix)]):
+                word = word[:-len(suffix)]
+                if word.endswith(("at", "bl", "iz")):
+                    word += "e"
+                elif _ends_double_cons(word) and word[-1] not in "lsz":
+                    word = word[:-1]
+                elif _measure(word) == 1 and _ends_cvc(word):
+                    word += "e"
+                break
+
+    # Step 1c: terminal y
+    if word.endswith("y") and _has_vowel(word[:-1]):
+        word = word[:-1] + "i"
+
+    word = _replace_suffix(word, _STEP2)
+    word = _replace_suffix(word, _STEP3)
+
+    # Step 4: strip remaining suffixes on long stems
+    for suffix in _STEP4:
+        if word.endswith(suffix):
+            base = word[:-len(suffix)]
+            if _measure(base) > 1 and (suffix != "ion" or base.endswith(("s", "t"))):
+                word = base
+            break
+
+    # Step 5: tidy up final e / ll
+    if word.endswith("e"):
+        m = _measure(word[:-1])
+        if m > 1 or (m == 1 and not _ends_cvc(word[:-1])):
+            word = word[:-1]
+    if word.endswith("ll") and _measure(word) > 1:
+        word = word[:-1]
+    return word
+
+# --- Index ---
+
+class SearchIndex:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.loaded = False
+        # term -> {job_id: BM25 term weight without idf}. The weight folds in
+        # tf saturation and length normalisation so a query only multiplies
+        # by idf and sums.
+        self.postings = defaultdict(dict)
+        self.doc_terms = {}                # job_id -> Counter of weighted tf
+        self.doc_len = {}
+        self.total_len = 0
+        # Average length the posting weights were computed with; refreshed
+        # once the corpus size drifts far enough to matter.
+        self.avg_len = 0.0
+        self.refreshed_at_size = 0
+        # The fields the structured filters that can be combined with a
+        # ranked query look at
+        self.doc_filters = {}
+
+    def clear(self):
+        with self.lock:
+            self._reset()
+
+    def ensure_loaded(self, db):
+        if self.loaded:
+            return
+        with self.lock:
+            if self.loaded:
+                return
+            query = queries.hot_job_listing().execution_options(yield_per=1000)
+            for job in db.execute(query):
+                self._add(job, reweight=False)
+            self._refresh_weights()
+            self.loaded = True
+
+    def add_job(self, job):
+        # job is anything with the JobOut attributes (a JobOut or a listing row)
+        with self.lock:
+            if self.loaded:
+                self._add(job)
+
+    def reindex_employer(self, db, employer_id):
+        # The company name is indexed, so a profile rename touches all their
+        # jobs; once the employer is deleted none of them are searchable
+        with self.lock:
+            if self.loaded:
+                query = queries.hot_job_listing().where(models.Job.employer_id == employer_id)
+                live = {job.id: job for job in db.execute(query)}
+                for job_id in db.execute(select(models.Job.id).where(models.Job.employer_id == employer_id)).scalars():
+                    if job_id in live:
+                        self._add(live[job_id])
+                    else:
+                        self._remove(job_id)
+
+    def remove_job(self, job_id):
+        with self.lock:
+            self._remove(job_id)
+
+    def _weight(self, tf, length):
+        norm = K1 * (1 - B + B * length / (self.avg_len or length or 1))
+        return tf * (K1 + 1) / (tf + norm)
+
+    def _refresh_weights(self):
+        n_docs = len(self.doc_len)
+        self.avg_len = self.total_len / n_docs if n_docs else 0.0
+        self.refreshed_at_size = n_docs
+        for job_id, terms in self.doc_terms.items():
+            length = self.doc_len[job_id]
+            for term, tf in terms.items():
+                self.postings[term][job_id] = self._weight(tf, length)
+
+    def _add(self, job, reweight=True):
+        self._remove(job.id)
+        terms = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in tokenize(getattr(job, field)):
+                terms[term] += weight
+        length = sum(terms.values())
+        self.doc_terms[job.id] = terms
+        self.doc_len[job.id] = length
+        self.total_len += length
+        self.doc_filters[job.id] = FilterFields(*(getattr(job, field, None) for field in FilterFields._fields))
+        for term, tf in terms.items():
+            self.postings[term][job.id] = self._weight(tf, length)
+
+        # Rebuilding every weight is O(postings); doing it only when the
+        # corpus has grown or shrunk by a quarter keeps inserts amortised O(1).
+        n_docs = len(self.doc_len)
+        if reweight and not (0.8 * self.refreshed_at_size <= n_docs <= 1.25 * self.refreshed_at_size):
+            self._refresh_weights()
+
+    def _remove(self, job_id):
+        terms = self.doc_terms.pop(job_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self.postings[term]
+            postings.pop(job_id, None)
+            if not postings:
+                del self.postings[term]
+        self.total_len -= self.doc_len.pop(job_id)
+        self.doc_filters.pop(job_id, None)
+
+    def search(self, query, limit, after=None, job_filter=None):
+        """Return up to limit (score, job_id) pairs ranked by BM25, best first.
+
+        after is the (score, job_id) of the last result of the previous page.
+        """
+        terms = set(tokenize(query))
+        with self.lock:
+            n_docs = len(self.doc_len)
+            if not terms or not n_docs:
+                return []
+            scores = {}
+            for term in terms:
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                if not scores:
+                    scores = {job_id: idf * w for job_id, w in postings.items()}
+                    continue
+                get = scores.get
+                for job_id, w in postings.items():
+                    scores[job_id] = get(job_id, 0.0) + idf * w
+
+            candidates = zip(scores.values(), scores.keys())
+            if job_filter:
+                matches, fields = job_filter.matches, self.doc_filters
+                candidates = (c for c in candidates if matches(fields[c[1]]))
+            if after is not None:
+                candidates = (c for c in candidates if c < after)
+            return heapq.nlargest(limit, candidates)
+
+index = SearchIndex()
+
+@events.on_job_change
+def _follow_job(old, new):
+    if new is None:
+        index.remove_job(old.id)
+    else:
+        index.add_job(new)
+
+@events.on_employer_change
+def _follow_employer(db, employer_id):
+    index.reindex_employer(db, employer_id)
+
+def search_page(db, q, cursor, limit, job_filter=None):
+    index.ensure_loaded(db)
+    after = pagination.decode_rank_cursor(cursor) if cursor else None
+    ranked = index.search(q, limit + 1, after, job_filter)
+    page = ranked[:limit]
+
+    ids = [job_id for _, job_id in page]
+    rows = {row.id: row for row in db.execute(queries.hot_job_listing().where(models.Job.id.in_(ids)))}
+    items = queries.job_dicts(rows[job_id] for job_id in ids if job_id in rows)
+    next_cursor = pagination.encode_rank_cursor(*page[-1]) if len(ranked) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
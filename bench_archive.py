@@ -0,0 +1,99 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Archive report: seeds jobs posted evenly over several years (each open for
+# 30 days, so nearly all of them have long expired), runs the archiver and
+# compares the search working set before (every live job, as search read it
+# until closing dates were enforced) and after (the hot set).
+#
+#   python bench_archive.py --years 5 --jobs-per-day 200
+
+WORDS = ("python java react django spring sql docker kubernetes aws rust go backend frontend data "
+         "platform mobile security cloud devops analytics").split()
+
+def seed(years, per_day):
+    from backend import models, database
+    models.Base.metadata.create_all(bind=database.engine)
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    days = int(years * 365)
+    with database.engine.begin() as conn:
+        conn.execute(models.User.__table__.insert(), [{"id": 1, "email": "e@example.com", "role": "employer"}])
+        conn.execute(models.Employer.__table__.insert(), [{"id": 1, "company_name": "Acme"}])
+        for day in range(days, -1, -1):
+            posted = now - timedelta(days=day)
+            conn.execute(models.Job.__table__.insert(), [
+                {"employer_id": 1, "title": " ".join(rng.choices(WORDS, k=3)),
+                 "description": " ".join(rng.choices(WORDS, k=40)), "location": "Remote",
+                 "job_type": "Full-time", "salary_range": "n/a", "posted_at": posted,
+                 "closing_date": posted + timedelta(days=30)}
+                for _ in range(per_day)
+            ])
+    return days + 1
+
+def working_set(query, queries_):
+    from backend import search, database
+    index = search.SearchIndex()
+    db = database.SessionLocal()
+    start = time.perf_counter()
+    for job in db.execute(query.execution_options(yield_per=1000)):
+        index._add(job, reweight=False)
+    index._refresh_weights()
+    build = time.perf_counter() - start
+    db.close()
+    start = time.perf_counter()
+    for q in queries_:
+        index.search(q, 20)
+    return {
+        "documents": len(index.doc_len),
+        "postings": sum(len(p) for p in index.postings.values()),
+        "build_s": round(build, 2),
+        "query_mean_ms": round((time.perf_counter() - start) * 1000 / len(queries_), 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="job archive working-set report")
+    parser.add_argument("--years", type=float, default=3)
+    parser.add_argument("--jobs-per-day", type=int, default=100)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_archive_")
+    # Must be set before backend.database builds its engine
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+    from backend import archive, queries
+
+    seed(args.years, args.jobs_per_day)
+    rng = random.Random(7)
+    searches = [" ".join(rng.sample(WORDS, 2)) for _ in range(200)]
+
+    before = working_set(queries.job_listing(), searches)
+    start = time.perf_counter()
+    archived = archive.archive_expired(pause=0)
+    archive_s = time.perf_counter() - start
+    after = working_set(queries.hot_job_listing(), searches)
+
+    result = {
+        "jobs": before["documents"],
+        "archived": archived,
+        "archive_s": round(archive_s, 1),
+        "before": before,
+        "after": after,
+        "shrink": round(before["postings"] / max(after["postings"], 1), 1),
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"{result['jobs']} jobs, {archived} archived in {result['archive_s']}s")
+    print(f"{'':<16}{'all live':>12}{'hot set':>12}")
+    for key in before:
+        print(f"{key:<16}{before[key]:>12}{after[key]:>12}")
+    print(f"search working set {result['shrink']}x smaller")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import argparse
+import json
+import os
+import resource
+import tempfile
+import time
+
+# Export benchmark: streams the admin job export (the same generator the
+# endpoint uses) from a seeded SQLite stand-in and reports time to first
+# row, throughput and resident memory growth. --naive adds the
+# load-everything-then-encode approach for comparison.
+#
+#   python bench_export.py --rows 1000000
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        # Peak rather than current outside Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def seed(rows):
+    from backend import models, database
+    models.Base.metadata.create_all(bind=database.engine)
+    with database.engine.begin() as conn:
+        conn.execute(models.User.__table__.insert(), [{"id": 1, "email": "e@example.com", "role": "employer"}])
+        conn.execute(models.Employer.__table__.insert(), [{"id": 1, "company_name": "Acme"}])
+        batch = 50_000
+        for start in range(0, rows, batch):
+            conn.execute(models.Job.__table__.insert(), [
+                {"employer_id": 1, "title": f"Engineer {i}", "description": "Build and run services. " * 8,
+                 "location": "Remote", "job_type": "Full-time", "salary_range": "$100k-120k"}
+                for i in range(start, min(start + batch, rows))
+            ])
+
+def run_stream(query, fmt):
+    from backend import exports
+    base = rss_mb()
+    peak = base
+    start = time.perf_counter()
+    first_row = None
+    size = 0
+    for i, chunk in enumerate(exports.stream(query, fmt)):
+        size += len(chunk)
+        if first_row is None and (i > 0 or fmt == "ndjson"):
+            first_row = time.perf_counter() - start
+        peak = max(peak, rss_mb())
+    return time.perf_counter() - start, first_row or 0.0, size, peak - base
+
+def run_naive(query, fmt):
+    from backend import exports, database
+    base = rss_mb()
+    start = time.perf_counter()
+    db = database.SessionLocal()
+    rows = db.execute(query).all()
+    columns = list(rows[0]._fields) if rows else []
+    body = exports._csv_chunk([columns] + rows) if fmt == "csv" else exports._ndjson_chunk(columns, rows)
+    peak = rss_mb()
+    db.close()
+    return time.perf_counter() - start, time.perf_counter() - start, len(body), peak - base
+
+def main():
+    parser = argparse.ArgumentParser(description="streaming export benchmark")
+    parser.add_argument("--rows", type=int, default=200_000, help="jobs to seed")
+    parser.add_argument("--naive", action="store_true", help="also time loading everything into memory")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_export_")
+    # Must be set before backend.database builds its engine
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+    from backend import queries, models
+
+    seed(args.rows)
+    query = queries.job_listing().order_by(models.Job.id)
+    results = []
+    for fmt in ("csv", "ndjson"):
+        runs = [("stream", run_stream)] + ([("naive", run_naive)] if args.naive else [])
+        for mode, run in runs:
+            elapsed, first_row, size, rss = run(query, fmt)
+            results.append({
+                "format": fmt, "mode": mode, "rows": args.rows,
+                "first_row_ms": round(first_row * 1000, 1),
+                "rows_per_sec": round(args.rows / elapsed),
+                "mb": round(size / 2**20, 1),
+                "rss_growth_mb": round(rss, 1),
+            })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'format':<8}{'mode':<8}{'first row':>12}{'rows/s':>12}{'MB':>8}{'RSS +MB':>10}")
+    for r in results:
+        print(f"{r['format']:<8}{r['mode']:<8}{r['first_row_ms']:>10}ms{r['rows_per_sec']:>12}"
+              f"{r['mb']:>8}{r['rss_growth_mb']:>10}")
+
+if __name__ == "__main__":
+    main()
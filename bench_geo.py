@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+# Location benchmark: resolves free-text locations against the gazetteer
+# and times radius searches (the query /seeker/jobs?near= runs, first page
+# and a followed cursor) over seeded jobs spread across the gazetteer's
+# places, big cities weighted heaviest.
+#
+#   python bench_geo.py --jobs 1000000
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(p / 100 * len(samples)))]
+
+def seed(jobs, places):
+    from backend import models, database
+    models.Base.metadata.create_all(bind=database.engine)
+    rng = random.Random(42)
+    weights = [1 / (rank + 1) for rank in range(len(places))]
+    with database.engine.begin() as conn:
+        conn.execute(models.User.__table__.insert(), [{"id": 1, "email": "e@example.com", "role": "employer"}])
+        conn.execute(models.Employer.__table__.insert(), [{"id": 1, "company_name": "Acme"}])
+        batch = 50_000
+        for start in range(0, jobs, batch):
+            chosen = rng.choices(places, weights, k=min(batch, jobs - start))
+            conn.execute(models.Job.__table__.insert(), [
+                {"employer_id": 1, "title": "Engineer", "description": "d", "location": place.name,
+                 "job_type": "Full-time", "salary_range": "n/a", "place_id": place.id, "geohash": place.geohash}
+                for place in chosen
+            ])
+
+def main():
+    parser = argparse.ArgumentParser(description="location resolution and radius search benchmark")
+    parser.add_argument("--jobs", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_geo_")
+    # Must be set before backend.database builds its engine
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+    from backend import geo, queries, filters, database
+
+    gazetteer = geo.gazetteer()
+    places = list(gazetteer.places.values())
+    start = time.perf_counter()
+    seed(args.jobs, places)
+    seed_s = time.perf_counter() - start
+
+    rng = random.Random(7)
+    texts = [f"{rng.choice(['Office in ', '', 'Hybrid - '])}{rng.choice(places).name}, {rng.choice(['', 'Remote OK'])}"
+             for _ in range(10_000)]
+    start = time.perf_counter()
+    for text in texts:
+        gazetteer.resolve(text)  # uncached
+    resolve_us = (time.perf_counter() - start) * 1e6 / len(texts)
+
+    db = database.SessionLocal()
+    latencies, cursor_latencies, hits = [], [], []
+    for _ in range(args.queries):
+        job_filter = filters.JobFilter(near=rng.choice(places).name, radius_km=rng.choice([10, 50, 200]))
+        query = job_filter.where(queries.hot_job_listing())
+        start = time.perf_counter()
+        page = queries.job_page_out(db.execute(queries.job_page_query(query, None, 20)).all(), 20)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits.append(len(job_filter.geohashes))
+        if page["next_cursor"]:
+            start = time.perf_counter()
+            db.execute(queries.job_page_query(query, page["next_cursor"], 20)).all()
+            cursor_latencies.append((time.perf_counter() - start) * 1000)
+    db.close()
+
+    result = {
+        "jobs": args.jobs,
+        "places": len(places),
+        "seed_s": round(seed_s, 1),
+        "resolve_mean_us": round(resolve_us, 1),
+        "places_per_query": round(sum(hits) / len(hits), 1),
+        "radius_p50_ms": round(percentile(latencies, 50), 2),
+        "radius_p95_ms": round(percentile(latencies, 95), 2),
+        "radius_p99_ms": round(percentile(latencies, 99), 2),
+        "cursor_p95_ms": round(percentile(cursor_latencies, 95), 2) if cursor_latencies else None,
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    for key, value in result.items():
+        print(f"{key:<18}{value}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Login throughput benchmark: how many bcrypt verifications per second the
+# /auth/login path sustains with the hashing process pool at 1..N workers,
+# compared with running them on Starlette's default 40-thread pool.
+#
+#   python bench_login.py --logins 64 --rounds 12
+
+PASSWORD = "benchmark-password"
+
+def worker_counts(cores):
+    counts, n = [], 1
+    while n < cores:
+        counts.append(n)
+        n *= 2
+    return counts + [cores]
+
+async def storm(executor, verify, hashed, logins):
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        loop.run_in_executor(executor, verify, PASSWORD, hashed) for _ in range(logins)
+    ))
+    elapsed = time.perf_counter() - start
+    assert all(ok for ok, _ in results)
+    return logins / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="bcrypt login throughput benchmark")
+    parser.add_argument("--logins", type=int, default=64, help="concurrent logins per run")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    # Must be set before backend.passwords builds its CryptContext
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    from backend import passwords
+
+    hashed = passwords.hash_password(PASSWORD)
+    cores = os.cpu_count() or 1
+    results = []
+
+    with ThreadPoolExecutor(max_workers=40) as threads:
+        rate = asyncio.run(storm(threads, passwords.verify_and_update, hashed, args.logins))
+        results.append({"mode": "threadpool", "workers": 40, "logins_per_sec": round(rate, 1)})
+
+    for workers in worker_counts(cores):
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            # Start every worker before timing
+            list(pool.map(passwords.verify_and_update, [PASSWORD] * workers, [hashed] * workers))
+            rate = asyncio.run(storm(pool, passwords.verify_and_update, hashed, args.logins))
+        results.append({"mode": "process_pool", "workers": workers, "logins_per_sec": round(rate, 1)})
+
+    if args.json:
+        print(json.dumps({"cores": cores, "rounds": args.rounds, "results": results}, indent=2))
+        return
+
+    base = results[1]["logins_per_sec"]
+    print(f"bcrypt rounds={args.rounds}, cores={cores}, {args.logins} concurrent logins")
+    print(f"{'mode':<14}{'workers':>8}{'logins/s':>12}{'vs 1 proc':>11}")
+    for r in results:
+        print(f"{r['mode']:<14}{r['workers']:>8}{r['logins_per_sec']:>12}{r['logins_per_sec'] / base:>10.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import asyncio
+import json
+import time
+
+# Instrumentation overhead: the cost MetricsMiddleware adds to a request,
+# measured around a trivial ASGI app (so nothing else is in the number),
+# and the cost of the SQL cursor hooks per statement on in-memory SQLite.
+#
+#   python bench_metrics.py --requests 100000
+
+async def endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+async def send(message):
+    pass
+
+async def serve(app, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        await app({"type": "http", "method": "GET", "path": "/"}, receive, send)
+    return (time.perf_counter() - start) / n
+
+def main():
+    parser = argparse.ArgumentParser(description="metrics instrumentation overhead")
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--statements", type=int, default=20_000)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    from sqlalchemy import create_engine, text
+    from backend import metrics
+
+    bare = asyncio.run(serve(endpoint, args.requests))
+    wrapped = asyncio.run(serve(metrics.MetricsMiddleware(endpoint, metrics.Registry()), args.requests))
+
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        def run():
+            start = time.perf_counter()
+            for _ in range(args.statements):
+                conn.execute(text("SELECT 1"))
+            return (time.perf_counter() - start) / args.statements
+        # The hooks only do work inside a request
+        outside = run()
+        token = metrics._current.set(metrics.RequestStats())
+        inside = run()
+        metrics._current.reset(token)
+
+    result = {
+        "request_us": round(bare * 1e6, 2),
+        "request_instrumented_us": round(wrapped * 1e6, 2),
+        "middleware_overhead_us": round((wrapped - bare) * 1e6, 2),
+        "statement_us": round(outside * 1e6, 2),
+        "statement_instrumented_us": round(inside * 1e6, 2),
+        "hook_overhead_us": round((inside - outside) * 1e6, 2),
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    for key, value in result.items():
+        print(f"{key:<27}{value}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import json
+import time
+from types import SimpleNamespace
+import numpy as np
+
+# Recommendation benchmark: fills a RecommendationIndex with synthetic jobs
+# (Zipf-distributed skill terms, so common skills have long postings like
+# they do in practice) and times profile queries on one core, plus
+# incremental posting/removal.
+#
+#   python bench_recommend.py --jobs 500000
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(p / 100 * len(samples)))]
+
+def main():
+    parser = argparse.ArgumentParser(description="job recommendation benchmark")
+    parser.add_argument("--jobs", type=int, default=500_000)
+    parser.add_argument("--vocabulary", type=int, default=20_000, help="distinct skill terms")
+    parser.add_argument("--terms", type=int, default=40, help="terms per job description")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    from backend import recommend
+
+    rng = np.random.default_rng(42)
+    vocabulary = np.array([f"skill{i}" for i in range(args.vocabulary)])
+    p = 1 / np.arange(1, args.vocabulary + 1)
+    p /= p.sum()
+
+    def text(n):
+        return " ".join(vocabulary[rng.choice(args.vocabulary, size=n, p=p)])
+
+    def jobs(first, count):
+        words = vocabulary[rng.choice(args.vocabulary, size=(count, 3 + args.terms), p=p)]
+        return [
+            SimpleNamespace(id=first + i, employer_id=(first + i) % 1000, title=" ".join(row[:3]),
+                            description=" ".join(row[3:]), closing_date=None)
+            for i, row in enumerate(words)
+        ]
+
+    # Timed without generating the text
+    index = recommend.RecommendationIndex()
+    build = 0.0
+    with index.lock:
+        for first in range(1, args.jobs + 1, 50_000):
+            batch = jobs(first, min(50_000, args.jobs + 1 - first))
+            start = time.perf_counter()
+            for job in batch:
+                index._add(job, merge=False)
+            build += time.perf_counter() - start
+        start = time.perf_counter()
+        index._merge()
+        build += time.perf_counter() - start
+        index.loaded = True
+
+    profiles = [text(int(rng.integers(5, 26))) for _ in range(args.queries)]
+    index.recommend(profiles[0], 20)
+    latencies = []
+    for profile in profiles:
+        start = time.perf_counter()
+        index.recommend(profile, 20)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    # Steady-state churn: every post lands in the pending buffer, every
+    # MERGE_ROWS-th triggers a merge
+    churn = 5000
+    posted = jobs(args.jobs + 1, churn)
+    removed = rng.integers(1, args.jobs + 1, size=churn).tolist()
+    start = time.perf_counter()
+    for job, job_id in zip(posted, removed):
+        index.add_job(job)
+        index.remove_job(job_id)
+    update_ms = (time.perf_counter() - start) * 1000 / churn
+
+    result = {
+        "jobs": args.jobs,
+        "nnz": int(len(index.data)),
+        "matrix_mb": round((index.rows.nbytes + index.data.nbytes + index.indptr.nbytes) / 2**20, 1),
+        "build_s": round(build, 1),
+        "query_p50_ms": round(percentile(latencies, 50), 2),
+        "query_p95_ms": round(percentile(latencies, 95), 2),
+        "query_p99_ms": round(percentile(latencies, 99), 2),
+        "update_mean_ms": round(update_ms, 3),
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    for key, value in result.items():
+        print(f"{key:<16}{value}")
+
+if __name__ == "__main__":
+    main()
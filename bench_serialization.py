@@ -0,0 +1,135 @@
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Serialization benchmark for the hot list endpoints: takes one page of
+# listing rows (jobs as /seeker/jobs returns them, applicants as
+# /employer/jobs/{id}/applicants does) and turns it into response bytes
+#
+#   before: a Pydantic model per row, then FastAPI's response_model pass
+#           (validate the page again and serialize it), as the routes did
+#   after:  dicts straight from the row tuples, encoded by orjson
+#           (responses.rows_out + responses.dumps)
+#
+# The database read is done once up front and not timed. Allocation is the
+# tracemalloc peak while building one page.
+#
+#   python bench_serialization.py --rows 1000
+
+def seed(rows):
+    from backend import models, database
+    models.Base.metadata.create_all(bind=database.engine)
+    now = datetime.utcnow()
+    with database.engine.begin() as conn:
+        conn.execute(models.User.__table__.insert(), [{"id": 1, "email": "e@example.com", "role": "employer"}] + [
+            {"id": 1 + i, "email": f"seeker{i}@example.com", "role": "seeker"} for i in range(1, rows + 1)
+        ])
+        conn.execute(models.Employer.__table__.insert(), [{"id": 1, "company_name": "Acme"}])
+        conn.execute(models.JobSeeker.__table__.insert(), [
+            {"id": 1 + i, "full_name": f"Seeker {i}", "skills": "Python, SQL, Docker",
+             "education": "BSc Computer Science", "experience": "4 years of backend services",
+             "resume_link": f"https://example.com/cv/{i}.pdf"}
+            for i in range(1, rows + 1)
+        ])
+        conn.execute(models.Job.__table__.insert(), [
+            {"employer_id": 1, "title": f"Backend Engineer {i}",
+             "description": "Build and run Python services on AWS. " * 8, "location": "Berlin",
+             "job_type": "Full-time", "salary_range": "€60,000 - €75,000", "posted_at": now - timedelta(minutes=i),
+             "employment_type": models.EmploymentType.full_time.name, "salary_min": 60000, "salary_max": 75000,
+             "salary_currency": "EUR", "place_id": "berlin", "geohash": "u33dc"}
+            for i in range(rows)
+        ])
+        conn.execute(models.Application.__table__.insert(), [
+            {"job_id": 1, "seeker_id": 1 + i, "status": models.ApplicationStatus.applied.name,
+             "applied_at": now - timedelta(minutes=i)}
+            for i in range(1, rows + 1)
+        ])
+
+def response_field(router, path):
+    # The route's own response_model field, as FastAPI applies it
+    for route in router.routes:
+        if route.path == path and "GET" in route.methods:
+            return route.response_field
+    raise LookupError(path)
+
+def measure(fn, repeat):
+    fn()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    return elapsed, peak, body
+
+def main():
+    parser = argparse.ArgumentParser(description="list endpoint serialization benchmark")
+    parser.add_argument("--rows", type=int, default=1000, help="rows per page")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_serialization_")
+    # Must be set before backend.database builds its engine
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+    from fastapi.routing import serialize_response
+    from backend import models, schemas, queries, responses, database
+    from backend.routers import employer, seeker
+
+    seed(args.rows)
+    db = database.SessionLocal()
+    job_rows = db.execute(queries.job_listing().order_by(models.Job.posted_at.desc())).all()
+    applicant_rows = db.execute(employer._applicant_rows(1, 1).order_by(models.Application.id)).all()
+    db.close()
+
+    def pydantic_path(field, build):
+        def run():
+            page = {"items": build(), "next_cursor": None}
+            return asyncio.run(serialize_response(field=field, response_content=page, dump_json=True))
+        return run
+
+    endpoints = {
+        "seeker_jobs": (
+            response_field(seeker.router, "/seeker/jobs"),
+            lambda: queries.jobs_out(job_rows),
+            lambda: queries.job_dicts(job_rows),
+        ),
+        "employer_applicants": (
+            response_field(employer.router, "/employer/jobs/{job_id}/applicants"),
+            lambda: [schemas.ApplicationOut(**row._mapping) for row in applicant_rows],
+            lambda: queries.application_dicts(applicant_rows),
+        ),
+    }
+    result = {"rows": args.rows}
+    for name, (field, models_, dicts) in endpoints.items():
+        before = measure(pydantic_path(field, models_), args.repeat)
+        after = measure(lambda: responses.dumps({"items": dicts(), "next_cursor": None}), args.repeat)
+        result[name] = {
+            "before_rows_per_s": round(args.rows / before[0]),
+            "after_rows_per_s": round(args.rows / after[0]),
+            "speedup": round(before[0] / after[0], 1),
+            "before_peak_kb": round(before[1] / 1024),
+            "after_peak_kb": round(after[1] / 1024),
+            "body_kb": round(len(after[2]) / 1024),
+            "same_bytes": before[2] == after[2],
+        }
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"rows per page   {args.rows}")
+    for name, stats in result.items():
+        if name == "rows":
+            continue
+        print(name)
+        for key, value in stats.items():
+            print(f"  {key:<18}{value}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+
+# Startup benchmark, for rolling restarts across many workers:
+#
+#   import      `python -X importtime -c "import backend.main"`, the total
+#               and the packages that take the most of it (self time
+#               summed per top-level package)
+#   startup     a uvicorn worker from spawn to its first answers: liveness,
+#               readiness and a first /seeker/jobs request
+#
+# Runs against a throwaway, migrated SQLite database.
+#
+#   python bench_startup.py --runs 5
+
+def import_times(env):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import backend.main"],
+                            env=env, capture_output=True, text=True, check=True)
+    per_package = Counter()
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        per_package[name.strip().split(".")[0]] += int(self_us)
+        if name.strip() == "backend.main":
+            total = int(cumulative_us)
+    return total, per_package
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_for(url, deadline, status=200):
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == status:
+                    return time.perf_counter()
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.005)
+    raise TimeoutError(url)
+
+def startup(env):
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = start + 60
+        live = wait_for(f"{base}/health/live", deadline)
+        ready = wait_for(f"{base}/health/ready", deadline)
+        first = time.perf_counter()
+        urllib.request.urlopen(f"{base}/seeker/jobs", timeout=10).read()
+        first = time.perf_counter() - first
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return live - start, ready - start, first
+
+def main():
+    parser = argparse.ArgumentParser(description="import time and time-to-first-request benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="packages to list in the import breakdown")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_startup_")
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp}/bench.db",
+           "PURGE_INTERVAL_SECONDS": "0", "ARCHIVE_INTERVAL_SECONDS": "0"}
+    env.pop("ASYNC_DATABASE_URL", None)
+    subprocess.run([sys.executable, "-c", "from backend import migrations, database; "
+                    "migrations.upgrade(database.engine, log=lambda *a: None)"], env=env, check=True)
+
+    totals, packages = [], Counter()
+    for _ in range(args.runs):
+        total, per_package = import_times(env)
+        totals.append(total)
+        packages.update(per_package)
+    runs = [startup(env) for _ in range(args.runs)]
+
+    result = {
+        "import_ms": round(statistics.median(totals) / 1000, 1),
+        "import_by_package_ms": {
+            name: round(us / args.runs / 1000, 1) for name, us in packages.most_common(args.top)
+        },
+        "live_ms": round(statistics.median(r[0] for r in runs) * 1000, 1),
+        "ready_ms": round(statistics.median(r[1] for r in runs) * 1000, 1),
+        "first_request_ms": round(statistics.median(r[2] for r in runs) * 1000, 1),
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"import backend.main   {result['import_ms']} ms")
+    for name, ms in result["import_by_package_ms"].items():
+        print(f"  {name:<20}{ms} ms")
+    for key in ("live_ms", "ready_ms", "first_request_ms"):
+        print(f"{key:<22}{result[key]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import argparse
+import gzip
+import re
+import shutil
+from pathlib import Path
+from backend import assets
+
+# Build the frontend for production (see backend/assets.py for how it is
+# served): content-hashed CSS/JS names, HTML pages rewritten to use them,
+# and .gz/.br variants of every text file. Run on each deploy; the app
+# serves build/frontend/ whenever it exists.
+#
+#   python build_assets.py
+#
+# Brotli needs the brotli package (in requirements.txt). The build stops
+# if it is missing rather than quietly shipping gzip only; pass
+# --no-brotli to build gzip variants alone on purpose.
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+FINGERPRINTED = (".css", ".js")
+COMPRESSED = (".html", ".css", ".js", ".json", ".svg", ".txt")
+# Below this the encoding overhead eats the saving
+MIN_COMPRESS_BYTES = 256
+# src="js/api.js", href="css/style.css": relative references from the pages
+REFERENCE = re.compile(r"""(\b(?:src|href)=)(["'])([^"'?#:]+)\2""")
+
+def fingerprint(relative, data):
+    stem, suffix = relative.rsplit(".", 1)
+    return f"{stem}.{assets.content_hash(data)[:assets.HASH_LENGTH]}.{suffix}"
+
+def compress(path, data, use_brotli=True):
+    """Write the .gz (and .br) variants of path that come out smaller."""
+    sizes = {}
+    variants = [("gzip", ".gz", lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+    if use_brotli and brotli is not None:
+        variants.append(("br", ".br", lambda d: brotli.compress(d, quality=11)))
+    for encoding, suffix, fn in variants:
+        packed = fn(data)
+        if len(packed) < len(data):
+            Path(str(path) + suffix).write_bytes(packed)
+            sizes[encoding] = len(packed)
+    return sizes
+
+def build(source=assets.SOURCE_DIR, output=assets.BUILD_DIR, use_brotli=True):
+    """Build source into output (replacing it); returns a report per file."""
+    source, output = Path(source), Path(output)
+    if output.exists():
+        shutil.rmtree(output)
+    files = sorted(p for p in source.rglob("*") if p.is_file())
+
+    manifest = {}
+    for path in files:
+        relative = path.relative_to(source).as_posix()
+        if path.suffix in FINGERPRINTED:
+            manifest[relative] = fingerprint(relative, path.read_bytes())
+
+    def rewrite(match):
+        prefix, quote, target = match.groups()
+        return f"{prefix}{quote}{manifest.get(target, target)}{quote}"
+
+    report = []
+    for path in files:
+        relative = path.relative_to(source).as_posix()
+        data = path.read_bytes()
+        if path.suffix == ".html":
+            data = REFERENCE.sub(rewrite, data.decode("utf-8")).encode("utf-8")
+        target = output / manifest.get(relative, relative)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        sizes = {}
+        if path.suffix in COMPRESSED and len(data) >= MIN_COMPRESS_BYTES:
+            sizes = compress(target, data, use_brotli)
+        report.append({"file": target.relative_to(output).as_posix(), "bytes": len(data), **sizes})
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="build the frontend assets")
+    parser.add_argument("--source", default=str(assets.SOURCE_DIR))
+    parser.add_argument("--output", default=str(assets.BUILD_DIR))
+    parser.add_argument("--no-brotli", action="store_true", help="build gzip variants only")
+    args = parser.parse_args()
+
+    if brotli is None and not args.no_brotli:
+        parser.error("brotli is not installed (pip install -r requirements.txt); pass --no-brotli to build gzip only")
+    report = build(args.source, args.output, use_brotli=not args.no_brotli)
+    print(f"{'file':<40}{'bytes':>8}{'gzip':>8}{'br':>8}")
+    for row in report:
+        print(f"{row['file']:<40}{row['bytes']:>8}{row.get('gzip', '-'):>8}{row.get('br', '-'):>8}")
+    total = sum(row["bytes"] for row in report)
+    gzipped = sum(row.get("gzip", row["bytes"]) for row in report)
+    print(f"{'total':<40}{total:>8}{gzipped:>8}")
+    print(f"built {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+
+# In-process tests run the app against a throwaway SQLite file instead of the
+# MySQL server it is configured for. Always override: tests drop tables.
+_db_dir = tempfile.mkdtemp(prefix="job_portal_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+# Cheap bcrypt cost for tests; must be set before backend.passwords is imported
+os.environ.setdefault("BCRYPT_ROUNDS", "5")
+# Tests run the purge and archiver themselves instead of on a timer
+os.environ["PURGE_INTERVAL_SECONDS"] = "0"
+os.environ["ARCHIVE_INTERVAL_SECONDS"] = "0"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from backend import models, auth, database, search, cache, idempotency, recommend, metrics, profiling
+from backend.main import app
+
+@pytest.fixture(scope="session", autouse=True)
+def test_database_dir():
+    yield _db_dir
+    shutil.rmtree(_db_dir, ignore_errors=True)
+
+@pytest.fixture(autouse=True)
+def reset_process_state():
+    # Module-level in-process state must not leak between tests
+    search.index.clear()
+    recommend.index.clear()
+    auth.token_versions.clear()
+    cache.job_search_cache.clear()
+    idempotency.store.clear()
+    metrics.registry.clear()
+    profiling.store.clear()
+    yield
+
+@pytest.fixture
+def engine():
+    models.Base.metadata.drop_all(bind=database.engine)
+    models.Base.metadata.create_all(bind=database.engine)
+    yield database.engine
+
+@pytest.fixture
+def db(engine):
+    session = database.SessionLocal()
+    yield session
+    session.close()
+
+@pytest.fixture
+def client(engine):
+    with TestClient(app) as c:
+        yield c
+
+@pytest.fixture
+def query_counter(engine):
+    # Listening on the Engine class also covers the async engine's sync core
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", count)
+    yield statements
+    event.remove(Engine, "before_cursor_execute", count)
+
+def make_user(db, email, role, **profile):
+    user = models.User(email=email, hashed_password="x", role=role)
+    db.add(user)
+    db.flush()
+    if role == models.UserRole.employer:
+        db.add(models.Employer(id=user.id, company_name=profile.get("company_name", "Acme")))
+    elif role == models.UserRole.seeker:
+        db.add(models.JobSeeker(id=user.id, full_name=profile.get("full_name", "Sam Seeker")))
+    db.commit()
+    return user
+
+def auth_headers(user):
+    token = auth.create_access_token(data=auth.token_claims(user))
+    return {"Authorization": f"Bearer {token}"}
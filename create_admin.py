@@ -1,5 +1,5 @@
 from backend.database import SessionLocal
-from backend import models, auth
+from backend import models, auth, counters
 from backend.models import UserRole
 
 def create_admin():
@@ -19,6 +19,7 @@ def create_admin():
             role=UserRole.admin
         )
         db.add(admin_user)
+        counters.user_created(db, UserRole.admin)
         db.commit()
         print(f"Admin user created successfully!")
         print(f"Email: {email}")
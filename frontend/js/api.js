@@ -1,8 +1,9 @@
 const API_URL = "http://127.0.0.1:8000";
 
-async function apiCall(endpoint, method = "GET", data = null) {
+async function apiCall(endpoint, method = "GET", data = null, extraHeaders = {}) {
     const headers = {
-        "Content-Type": "application/json"
+        "Content-Type": "application/json",
+        ...extraHeaders
     };
     
     const token = localStorage.getItem("token");
@@ -57,3 +58,75 @@ function logout() {
     localStorage.removeItem("role");
     window.location.href = "index.html";
 }
+
+// Downloads an export endpoint (streamed CSV/NDJSON) as a file. The
+// Authorization header rules out a plain link, so fetch it and hand the
+// result to the browser.
+async function apiDownload(endpoint, filename) {
+    const token = localStorage.getItem("token");
+    const response = await fetch(`${API_URL}${endpoint}`, {
+        headers: token ? { "Authorization": `Bearer ${token}` } : {}
+    });
+    if (!response.ok) {
+        alert("Export failed");
+        return;
+    }
+    const url = URL.createObjectURL(await response.blob());
+    const link = document.createElement("a");
+    link.href = url;
+    link.download = filename;
+    link.click();
+    URL.revokeObjectURL(url);
+}
+
+// Renders a cursor-paginated list endpoint ({items, next_cursor}) into
+// container. The first page is loaded immediately; later pages load when a
+// sentinel at the end of the list scrolls into view.
+function loadPaginated(container, endpoint, renderItem, emptyHtml) {
+    if (container._pager) container._pager.disconnect();
+    container.innerHTML = "";
+
+    const sentinel = document.createElement("div");
+    sentinel.style.cssText = "grid-column: 1 / -1; height: 1px;";
+    container.appendChild(sentinel);
+
+    const separator = endpoint.includes("?") ? "&" : "?";
+    let cursor = null;
+    let loading = false;
+    let count = 0;
+
+    const observer = new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) {
+            loadNext().catch(error => console.error(error));
+        }
+    });
+
+    async function loadNext() {
+        if (loading) return;
+        loading = true;
+        try {
+            const url = cursor ? `${endpoint}${separator}cursor=${encodeURIComponent(cursor)}` : endpoint;
+            const page = await apiCall(url);
+            page.items.forEach(item => container.insertBefore(renderItem(item), sentinel));
+            count += page.items.length;
+            cursor = page.next_cursor;
+
+            if (!cursor) {
+                observer.disconnect();
+                sentinel.remove();
+                if (count === 0) container.innerHTML = emptyHtml;
+            } else {
+                // Re-observe so a sentinel that is still visible triggers the next page
+                observer.unobserve(sentinel);
+                observer.observe(sentinel);
+            }
+        } finally {
+            loading = false;
+        }
+    }
+
+    container._pager = observer;
+    return loadNext().then(() => {
+        if (cursor) observer.observe(sentinel);
+    });
+}
@@ -37,86 +37,92 @@ async function loadStats() {
         document.getElementById("totalUsers").innerText = stats.total_users;
         document.getElementById("totalJobs").innerText = stats.total_jobs;
         document.getElementById("totalApps").innerText = stats.total_applications;
+        document.getElementById("usersByRole").innerText = formatBreakdown(stats.users_by_role);
+        document.getElementById("appsByStatus").innerText = formatBreakdown(stats.applications_by_status);
+        const top = stats.top_employers.slice(0, 3).map(e => `${e.company_name} ${e.jobs}`).join(" · ");
+        document.getElementById("topEmployers").innerText = top ? `Top: ${top}` : "";
     } catch (e) {
         console.error(e);
     }
 }
 
+function formatBreakdown(counts) {
+    return Object.entries(counts).map(([key, count]) => `${key} ${count}`).join(" · ");
+}
+
 async function loadUsers() {
+    const container = document.getElementById("usersList");
     try {
-        const users = await apiCall("/admin/users");
-        const container = document.getElementById("usersList");
-        container.innerHTML = "";
-
-        if (users.length === 0) {
-            container.innerHTML = "<div style='padding: 2rem; text-align: center; color: var(--gray);'>No users found.</div>";
-            return;
-        }
-
-        users.forEach(user => {
-            const row = document.createElement("div");
-            row.className = "admin-list-row";
-            const initial = user.email.charAt(0).toUpperCase();
-
-            row.innerHTML = `
-                <div class="user-info-main">
-                    <div class="user-initial-circle">${initial}</div>
-                    <div>
-                        <div style="font-weight: 600; color: var(--dark);">${user.email}</div>
-                        <div style="font-size: 0.75rem; color: var(--gray); display: flex; gap: 0.5rem; align-items: center; margin-top: 0.2rem;">
-                            <span class="badge" style="background: #e2e8f0; color: #475569; padding: 0.1rem 0.4rem;">${user.role}</span>
-                            <span>ID: ${user.id}</span>
-                        </div>
-                    </div>
-                </div>
-                <button onclick="deleteUser(${user.id})" class="btn btn-secondary" 
-                    style="color: var(--danger); border-color: #fee2e2; font-size: 0.75rem; padding: 0.35rem 0.75rem;">
-                    Remove
-                </button>
-            `;
-            container.appendChild(row);
-        });
+        await loadPaginated(
+            container,
+            "/admin/users",
+            renderUserRow,
+            "<div style='padding: 2rem; text-align: center; color: var(--gray);'>No users found.</div>"
+        );
     } catch (e) {
         console.error(e);
-        document.getElementById("usersList").innerHTML = "<div style='padding: 2rem; color: var(--danger);'>Error loading users.</div>";
+        container.innerHTML = "<div style='padding: 2rem; color: var(--danger);'>Error loading users.</div>";
     }
 }
 
-async function loadJobs() {
-    try {
-        const jobs = await apiCall("/admin/jobs");
-        const container = document.getElementById("jobsList");
-        container.innerHTML = "";
+function renderUserRow(user) {
+    const row = document.createElement("div");
+    row.className = "admin-list-row";
+    const initial = user.email.charAt(0).toUpperCase();
 
-        if (jobs.length === 0) {
-            container.innerHTML = "<div style='padding: 2rem; text-align: center; color: var(--gray);'>No active jobs.</div>";
-            return;
-        }
-
-        jobs.forEach(job => {
-            const row = document.createElement("div");
-            row.className = "admin-list-row";
-
-            row.innerHTML = `
-                <div>
-                    <div style="font-weight: 600; color: var(--dark);">${job.title}</div>
-                    <div style="font-size: 0.75rem; color: var(--gray); margin-top: 0.2rem;">
-                        <span style="color: var(--primary); font-weight: 500;">${job.company_name}</span>
-                    </div>
+    row.innerHTML = `
+        <div class="user-info-main">
+            <div class="user-initial-circle">${initial}</div>
+            <div>
+                <div style="font-weight: 600; color: var(--dark);">${user.email}</div>
+                <div style="font-size: 0.75rem; color: var(--gray); display: flex; gap: 0.5rem; align-items: center; margin-top: 0.2rem;">
+                    <span class="badge" style="background: #e2e8f0; color: #475569; padding: 0.1rem 0.4rem;">${user.role}</span>
+                    <span>ID: ${user.id}</span>
                 </div>
-                <button onclick="deleteJob(${job.id})" class="btn btn-secondary" 
-                    style="color: var(--danger); border-color: #fee2e2; font-size: 0.75rem; padding: 0.35rem 0.75rem;">
-                    Delete
-                </button>
-            `;
-            container.appendChild(row);
-        });
+            </div>
+        </div>
+        <button onclick="deleteUser(${user.id})" class="btn btn-secondary" 
+            style="color: var(--danger); border-color: #fee2e2; font-size: 0.75rem; padding: 0.35rem 0.75rem;">
+            Remove
+        </button>
+    `;
+    return row;
+}
+
+async function loadJobs() {
+    const container = document.getElementById("jobsList");
+    try {
+        await loadPaginated(
+            container,
+            "/admin/jobs",
+            renderJobRow,
+            "<div style='padding: 2rem; text-align: center; color: var(--gray);'>No active jobs.</div>"
+        );
     } catch (e) {
         console.error(e);
-        document.getElementById("jobsList").innerHTML = "<div style='padding: 2rem; color: var(--danger);'>Error loading jobs.</div>";
+        container.innerHTML = "<div style='padding: 2rem; color: var(--danger);'>Error loading jobs.</div>";
     }
 }
 
+function renderJobRow(job) {
+    const row = document.createElement("div");
+    row.className = "admin-list-row";
+
+    row.innerHTML = `
+        <div>
+            <div style="font-weight: 600; color: var(--dark);">${job.title}</div>
+            <div style="font-size: 0.75rem; color: var(--gray); margin-top: 0.2rem;">
+                <span style="color: var(--primary); font-weight: 500;">${job.company_name}</span>
+            </div>
+        </div>
+        <button onclick="deleteJob(${job.id})" class="btn btn-secondary" 
+            style="color: var(--danger); border-color: #fee2e2; font-size: 0.75rem; padding: 0.35rem 0.75rem;">
+            Delete
+        </button>
+    `;
+    return row;
+}
+
 async function deleteUser(userId) {
     if (!confirm("Are you sure? This will delete all their data.")) return;
     try {
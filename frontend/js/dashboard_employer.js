@@ -76,48 +76,48 @@ async function handlePostJob(event) {
 let myJobs = []; // Global registry to avoid JSON.stringify issues in HTML attributes
 
 async function loadMyJobs() {
+    myJobs = [];
     try {
-        myJobs = await apiCall("/employer/jobs");
-        const container = document.getElementById("jobsList");
-        container.innerHTML = "";
-
-        if (myJobs.length === 0) {
-            container.innerHTML = "<p>No jobs posted yet.</p>";
-            return;
-        }
-
-        myJobs.forEach(job => {
-            const card = document.createElement("div");
-            card.className = "card";
-            const postedDate = new Date(job.posted_at).toLocaleDateString();
-            const closingDate = job.closing_date ? new Date(job.closing_date).toLocaleDateString() : "No deadline";
-
-            card.innerHTML = `
-                <div style="display: flex; justify-content: space-between; align-items: flex-start;">
-                    <div>
-                        <h3 style="margin-bottom: 0.25rem;">${job.title}</h3>
-                        <p class="text-sm text-muted">${job.location} • ${job.job_type}</p>
-                    </div>
-                    <div style="display: flex; gap: 0.5rem;">
-                        <button onclick="openEditModalById(${job.id})" class="btn btn-secondary" style="font-size: 0.8rem; padding: 0.4rem 0.8rem;">Edit</button>
-                        <button onclick="deleteJob(${job.id})" class="btn btn-secondary" style="color: var(--danger); border-color: var(--danger); font-size: 0.8rem; padding: 0.4rem 0.8rem;">Delete</button>
-                    </div>
-                </div>
-                <div style="margin-top: 1rem; padding: 0.75rem; background: #f8fafc; border-radius: 0.5rem; display: flex; gap: 2rem;">
-                    <div><span class="text-xs text-muted">POSTED</span><br><b class="text-sm">${postedDate}</b></div>
-                    <div><span class="text-xs text-muted">CLOSING</span><br><b class="text-sm">${closingDate}</b></div>
-                </div>
-                <div style="margin-top: 1rem;">
-                    <button onclick="viewApplicants(${job.id})" class="btn btn-primary" style="width: 100%;">View Applicants</button>
-                </div>
-            `;
-            container.appendChild(card);
-        });
+        await loadPaginated(
+            document.getElementById("jobsList"),
+            "/employer/jobs",
+            renderMyJob,
+            "<p>No jobs posted yet.</p>"
+        );
     } catch (e) {
         console.error(e);
     }
 }
 
+function renderMyJob(job) {
+    myJobs.push(job);
+    const card = document.createElement("div");
+    card.className = "card";
+    const postedDate = new Date(job.posted_at).toLocaleDateString();
+    const closingDate = job.closing_date ? new Date(job.closing_date).toLocaleDateString() : "No deadline";
+
+    card.innerHTML = `
+        <div style="display: flex; justify-content: space-between; align-items: flex-start;">
+            <div>
+                <h3 style="margin-bottom: 0.25rem;">${job.title}</h3>
+                <p class="text-sm text-muted">${job.location} • ${job.job_type}</p>
+            </div>
+            <div style="display: flex; gap: 0.5rem;">
+                <button onclick="openEditModalById(${job.id})" class="btn btn-secondary" style="font-size: 0.8rem; padding: 0.4rem 0.8rem;">Edit</button>
+                <button onclick="deleteJob(${job.id})" class="btn btn-secondary" style="color: var(--danger); border-color: var(--danger); font-size: 0.8rem; padding: 0.4rem 0.8rem;">Delete</button>
+            </div>
+        </div>
+        <div style="margin-top: 1rem; padding: 0.75rem; background: #f8fafc; border-radius: 0.5rem; display: flex; gap: 2rem;">
+            <div><span class="text-xs text-muted">POSTED</span><br><b class="text-sm">${postedDate}</b></div>
+            <div><span class="text-xs text-muted">CLOSING</span><br><b class="text-sm">${closingDate}</b></div>
+        </div>
+        <div style="margin-top: 1rem;">
+            <button onclick="viewApplicants(${job.id})" class="btn btn-primary" style="width: 100%;">View Applicants</button>
+        </div>
+    `;
+    return card;
+}
+
 function openEditModalById(jobId) {
     const job = myJobs.find(j => j.id === jobId);
     if (!job) return;
@@ -176,67 +176,77 @@ async function deleteJob(jobId) {
     }
 }
 
+let currentApplicantsJob = null;
+
 async function viewApplicants(jobId) {
     const modal = document.getElementById("applicantsModal");
     const container = document.getElementById("applicantsList");
+    const sort = document.getElementById("applicantSort").value;
+    currentApplicantsJob = jobId;
     container.innerHTML = "Loading...";
     modal.style.display = "flex";
 
     try {
-        const apps = await apiCall(`/employer/jobs/${jobId}/applicants`);
-        container.innerHTML = "";
-
-        if (apps.length === 0) {
-            container.innerHTML = "<p class='text-center py-4'>No applicants yet for this position.</p>";
-            return;
-        }
-
-        apps.forEach(app => {
-            const div = document.createElement("div");
-            div.className = "card";
-            div.style.padding = "1.5rem";
-            div.style.border = "1px solid #e2e8f0";
-
-            div.innerHTML = `
-                <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 1rem;">
-                    <div>
-                        <h4 style="font-size: 1.1rem; margin-bottom: 0.25rem;">${app.seeker_name}</h4>
-                        <p class="text-sm text-muted">${app.seeker_email}</p>
-                    </div>
-                    <span class="badge ${app.status === 'Accepted' ? 'badge-accepted' : app.status === 'Rejected' ? 'badge-rejected' : 'badge-applied'}">${app.status}</span>
-                </div>
-                
-                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; margin-bottom: 1.5rem;">
-                    <div>
-                        <p class="text-xs text-muted">SKILLS</p>
-                        <p class="text-sm">${app.seeker_skills || 'Not specified'}</p>
-                    </div>
-                    <div>
-                        <p class="text-xs text-muted">EDUCATION</p>
-                        <p class="text-sm">${app.seeker_education || 'Not specified'}</p>
-                    </div>
-                    <div style="grid-column: span 2;">
-                        <p class="text-xs text-muted">EXPERIENCE</p>
-                        <p class="text-sm" style="white-space: pre-wrap;">${app.seeker_experience || 'Not specified'}</p>
-                    </div>
-                    <div style="grid-column: span 2;">
-                        <p class="text-xs text-muted">RESUME / LINKEDIN</p>
-                        ${app.seeker_resume_link ? `<a href="${app.seeker_resume_link}" target="_blank" class="text-sm" style="color: var(--primary);">View Resume</a>` : '<p class="text-sm">Not provided</p>'}
-                    </div>
-                </div>
-
-                <div style="display: flex; gap: 1rem; border-top: 1px solid #f1f5f9; pt-1rem; padding-top: 1rem;">
-                    <button onclick="updateStatus(${app.id}, 'Accepted')" class="btn btn-primary" style="flex: 1; background: #22c55e; border: none;">Accept Applicant</button>
-                    <button onclick="updateStatus(${app.id}, 'Rejected')" class="btn btn-secondary" style="flex: 1; color: var(--danger); border-color: var(--danger);">Reject Applicant</button>
-                </div>
-            `;
-            container.appendChild(div);
-        });
+        // Ranking happens server side, so pages arrive already sorted
+        await loadPaginated(
+            container,
+            `/employer/jobs/${jobId}/applicants?sort=${sort}`,
+            renderApplicant,
+            "<p class='text-center py-4'>No applicants yet for this position.</p>"
+        );
     } catch (e) {
         container.innerHTML = "Error loading applicants.";
     }
 }
 
+function renderApplicant(app) {
+    const div = document.createElement("div");
+    div.className = "card";
+    div.style.padding = "1.5rem";
+    div.style.border = "1px solid #e2e8f0";
+
+    div.innerHTML = `
+        <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 1rem;">
+            <label style="display: flex; gap: 0.75rem; align-items: flex-start; cursor: pointer;">
+                <input type="checkbox" class="applicant-select" value="${app.id}" style="margin-top: 0.35rem;">
+                <div>
+                <h4 style="font-size: 1.1rem; margin-bottom: 0.25rem;">${app.seeker_name}</h4>
+                <p class="text-sm text-muted">${app.seeker_email}</p>
+                </div>
+            </label>
+            <div style="text-align: right;">
+                <span class="badge ${app.status === 'Accepted' ? 'badge-accepted' : app.status === 'Rejected' ? 'badge-rejected' : 'badge-applied'}">${app.status}</span>
+                ${app.match_score != null ? `<p class="text-xs text-muted" style="margin-top: 0.25rem;">${Math.round(app.match_score * 100)}% match</p>` : ''}
+            </div>
+        </div>
+        
+        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; margin-bottom: 1.5rem;">
+            <div>
+                <p class="text-xs text-muted">SKILLS</p>
+                <p class="text-sm">${app.seeker_skills || 'Not specified'}</p>
+            </div>
+            <div>
+                <p class="text-xs text-muted">EDUCATION</p>
+                <p class="text-sm">${app.seeker_education || 'Not specified'}</p>
+            </div>
+            <div style="grid-column: span 2;">
+                <p class="text-xs text-muted">EXPERIENCE</p>
+                <p class="text-sm" style="white-space: pre-wrap;">${app.seeker_experience || 'Not specified'}</p>
+            </div>
+            <div style="grid-column: span 2;">
+                <p class="text-xs text-muted">RESUME / LINKEDIN</p>
+                ${app.seeker_resume_link ? `<a href="${app.seeker_resume_link}" target="_blank" class="text-sm" style="color: var(--primary);">View Resume</a>` : '<p class="text-sm">Not provided</p>'}
+            </div>
+        </div>
+
+        <div style="display: flex; gap: 1rem; border-top: 1px solid #f1f5f9; pt-1rem; padding-top: 1rem;">
+            <button onclick="updateStatus(${app.id}, 'Accepted')" class="btn btn-primary" style="flex: 1; background: #22c55e; border: none;">Accept Applicant</button>
+            <button onclick="updateStatus(${app.id}, 'Rejected')" class="btn btn-secondary" style="flex: 1; color: var(--danger); border-color: var(--danger);">Reject Applicant</button>
+        </div>
+    `;
+    return div;
+}
+
 async function updateStatus(appId, status) {
     if (!confirm(`Are you sure you want to ${status.toLowerCase()} this applicant?`)) return;
     try {
@@ -252,6 +262,31 @@ async function updateStatus(appId, status) {
     }
 }
 
+// Bulk actions: the checked applicants, or every applicant of the open job
+// still in "Applied". Either way it is a single request.
+async function bulkUpdateStatus(status, allApplied = false) {
+    const body = { status };
+    if (allApplied) {
+        body.job_id = currentApplicantsJob;
+        body.current_status = "Applied";
+    } else {
+        body.application_ids = [...document.querySelectorAll(".applicant-select:checked")].map(box => Number(box.value));
+        if (body.application_ids.length === 0) {
+            alert("Select applicants first");
+            return;
+        }
+    }
+    const target = allApplied ? "all pending applicants" : `${body.application_ids.length} applicant(s)`;
+    if (!confirm(`Mark ${target} as ${status}?`)) return;
+    try {
+        const result = await apiCall("/employer/applications/status", "PUT", body);
+        alert(`${result.updated} application(s) updated`);
+        viewApplicants(currentApplicantsJob);
+    } catch (e) {
+        alert(e.message);
+    }
+}
+
 function closeModal() {
     document.getElementById("applicantsModal").style.display = "none";
 }
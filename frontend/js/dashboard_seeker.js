@@ -6,6 +6,7 @@ document.addEventListener("DOMContentLoaded", async () => {
     }
 
     await loadProfile();
+    await loadRecommendations();
     await loadJobs();
     await loadApplications();
 });
@@ -51,88 +52,140 @@ async function handleUpdateProfile(event) {
         alert("Profile updated successfully!");
         closeProfileModal();
         await loadProfile(); // Refresh display name and avatar
+        await loadRecommendations();
     } catch (e) {
         alert(e.message);
     }
 }
 
 async function loadJobs() {
-    const title = document.getElementById("searchTitle").value;
+    const keywords = document.getElementById("searchTitle").value;
     const location = document.getElementById("searchLocation").value;
+    const radius = document.getElementById("searchRadius").value;
+    const type = document.getElementById("searchType").value;
+    const salary = document.getElementById("searchSalary").value;
+
+    const filters = new URLSearchParams();
+    if (location && radius) {
+        filters.append("near", location);
+        filters.append("radius_km", radius);
+    } else if (location) {
+        filters.append("location", location);
+    }
+    if (salary) filters.append("salary_min", salary);
+    loadFacets(filters, type);
 
-    let query = "?";
-    if (title) query += `title=${title}&`;
-    if (location) query += `location=${location}`;
+    const params = new URLSearchParams(filters);
+    if (type) params.append("employment_type", type);
+    if (keywords) params.append("q", keywords);
+    const query = params.toString() ? `?${params}` : "";
 
     try {
-        const jobs = await apiCall(`/seeker/jobs${query}`);
-        const container = document.getElementById("jobsList");
-        container.innerHTML = "";
+        await loadPaginated(
+            document.getElementById("jobsList"),
+            `/seeker/jobs${query}`,
+            renderJobCard,
+            "<p>No jobs found.</p>"
+        );
+    } catch (e) {
+        console.error(e);
+    }
+}
 
-        if (jobs.length === 0) {
-            container.innerHTML = "<p>No jobs found.</p>";
-            return;
-        }
+async function loadFacets(filters, selected) {
+    // Job counts per type under the other filters, shown in the type dropdown
+    const select = document.getElementById("searchType");
+    try {
+        const facets = await apiCall(`/seeker/jobs/facets?${filters}`);
+        select.innerHTML = `<option value="">Any type (${facets.total})</option>`;
+        facets.employment_type.filter(f => f.value).forEach(f => {
+            const option = new Option(`${f.value} (${f.count})`, f.value, false, f.value === selected);
+            select.appendChild(option);
+        });
+    } catch (e) {
+        console.error(e);
+    }
+}
 
+async function loadRecommendations() {
+    const section = document.getElementById("recommendationsSection");
+    const list = document.getElementById("recommendationsList");
+    try {
+        const jobs = await apiCall("/seeker/recommendations?limit=6");
+        list.innerHTML = "";
         jobs.forEach(job => {
-            const card = document.createElement("div");
-            card.className = "card";
-            card.innerHTML = `
-                <h3>${job.title}</h3>
-                <p class="text-sm text-muted">${job.company_name} • ${job.location}</p>
-                <div style="margin: 1rem 0;">
-                    <span class="badge" style="background: #f1f5f9; color: #475569;">${job.job_type}</span>
-                    <span class="badge" style="background: #f1f5f9; color: #475569;">${job.salary_range}</span>
-                </div>
-                <p style="margin-bottom: 1rem;">${job.description.substring(0, 100)}...</p>
-                <button onclick="applyForJob(${job.id})" class="btn btn-primary" style="width: 100%;">Apply Now</button>
-            `;
-            container.appendChild(card);
+            const card = renderJobCard(job);
+            const badge = document.createElement("span");
+            badge.className = "badge badge-accepted";
+            badge.innerText = `${Math.round(job.match_score * 100)}% match`;
+            card.querySelector("h3").after(badge);
+            list.appendChild(card);
         });
+        // Hidden until the profile has skills or experience that match something
+        section.style.display = jobs.length ? "block" : "none";
     } catch (e) {
         console.error(e);
     }
 }
 
+function renderJobCard(job) {
+    const card = document.createElement("div");
+    card.className = "card";
+    card.innerHTML = `
+        <h3>${job.title}</h3>
+        <p class="text-sm text-muted">${job.company_name} • ${job.location}</p>
+        <div style="margin: 1rem 0;">
+            <span class="badge" style="background: #f1f5f9; color: #475569;">${job.job_type}</span>
+            <span class="badge" style="background: #f1f5f9; color: #475569;">${job.salary_range}</span>
+            ${job.distance_km != null ? `<span class="badge" style="background: #f1f5f9; color: #475569;">${job.distance_km} km away</span>` : ""}
+        </div>
+        <p style="margin-bottom: 1rem;">${job.description.substring(0, 100)}...</p>
+        <button onclick="applyForJob(${job.id})" class="btn btn-primary" style="width: 100%;">Apply Now</button>
+    `;
+    return card;
+}
+
 async function loadApplications() {
     try {
-        const apps = await apiCall("/seeker/applications");
-        const container = document.getElementById("applicationsList");
-        container.innerHTML = "";
-
-        if (apps.length === 0) {
-            container.innerHTML = "<p>No applications yet.</p>";
-            return;
-        }
-
-        apps.forEach(app => {
-            let badgeClass = "badge-applied";
-            if (app.status === "Accepted") badgeClass = "badge-accepted";
-            if (app.status === "Rejected") badgeClass = "badge-rejected";
-
-            const div = document.createElement("div");
-            div.className = "card";
-            div.style.padding = "1rem";
-            div.innerHTML = `
-                <div style="display: flex; justify-content: space-between; align-items: center;">
-                    <strong>${app.job_title}</strong>
-                    <span class="badge ${badgeClass}">${app.status}</span>
-                </div>
-                <p class="text-sm text-muted" style="margin-top: 0.5rem;">Applied: ${new Date(app.applied_at).toLocaleDateString()}</p>
-            `;
-            container.appendChild(div);
-        });
+        await loadPaginated(
+            document.getElementById("applicationsList"),
+            "/seeker/applications",
+            renderApplication,
+            "<p>No applications yet.</p>"
+        );
     } catch (e) {
         console.error(e);
     }
 }
 
+function renderApplication(app) {
+    let badgeClass = "badge-applied";
+    if (app.status === "Accepted") badgeClass = "badge-accepted";
+    if (app.status === "Rejected") badgeClass = "badge-rejected";
+
+    const div = document.createElement("div");
+    div.className = "card";
+    div.style.padding = "1rem";
+    div.innerHTML = `
+        <div style="display: flex; justify-content: space-between; align-items: center;">
+            <strong>${app.job_title}</strong>
+            <span class="badge ${badgeClass}">${app.status}</span>
+        </div>
+        <p class="text-sm text-muted" style="margin-top: 0.5rem;">Applied: ${new Date(app.applied_at).toLocaleDateString()}</p>
+    `;
+    return div;
+}
+
+const applySession = crypto.randomUUID();
+
 async function applyForJob(jobId) {
     if (!confirm("Confirm apply?")) return;
     try {
-        await apiCall(`/seeker/apply/${jobId}`, "POST");
+        // Same key for repeat clicks on this page, so the server replays the first result
+        await apiCall(`/seeker/apply/${jobId}`, "POST", null, { "Idempotency-Key": `${applySession}-${jobId}` });
         alert("Applied successfully!");
         loadApplications();
+        loadRecommendations();
     } catch (e) {
         alert(e.message);
     }
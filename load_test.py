@@ -0,0 +1,311 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+# Load test: replays a mixed workload through the ASGI app in-process (no
+# server, no network; httpx's ASGI transport) and reports latency
+# percentiles and throughput per endpoint as JSON, for comparing one commit
+# against another. Seed the database first (seed_data.py); the workload
+# draws its jobs, employers and seekers from it.
+#
+#   python seed_data.py --database-url sqlite:///load.db
+#   python load_test.py --database-url sqlite:///load.db --output base.json
+#   ... change something ...
+#   python load_test.py --database-url sqlite:///load.db --compare base.json
+#
+# --compare prints the change per endpoint and exits 1 if any p95 got
+# slower, or throughput lower, by more than --tolerance. Each operation is
+# run a few times untimed first (warmup_ms in the report: first-call costs
+# such as building the search index). Virtual users pick operations from
+# the --mix weights with their own seeded generators, so the same --seed
+# replays the same request sequence. Logins verify bcrypt at the seeded
+# hash's cost and dominate the mix if weighted up. Applying writes to the
+# database, so reseed before a run that must match a baseline exactly.
+#
+# Numbers from one machine are comparable with each other only; the report
+# records the commit, Python and database it ran on.
+
+REPORT_VERSION = 1
+DEFAULT_MIX = {
+    "search": 25, "search_filtered": 10, "listing": 15, "job_detail": 15, "facets": 5,
+    "login": 2, "apply": 5, "my_applications": 8, "recommendations": 5,
+    "employer_jobs": 5, "applicants": 5,
+}
+SEARCH_TERMS = ("python", "react developer", "data", "senior engineer", "kubernetes aws", "sql", "remote java")
+PASSWORD = "password123"
+WARMUP_REQUESTS = 3
+SAMPLE_SIZE = 500
+
+def percentile(values, p):
+    # Nearest-rank
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown operation {name.strip()!r}; one of {', '.join(DEFAULT_MIX)}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+class Workload:
+    """What the operations pick from: sampled ids and tokens from the
+    seeded database."""
+
+    def __init__(self, db):
+        from sqlalchemy import func, select
+        from backend import auth, models, geo
+
+        def token(user_id, email, role, version):
+            user = SimpleNamespace(id=user_id, email=email, role=role, token_version=version)
+            return auth.create_access_token(data=auth.token_claims(user))
+
+        live = (models.Job.deleted_at.is_(None), models.Job.archived.is_(False))
+        self.jobs = db.execute(
+            select(models.Job.id, models.Job.employer_id).where(*live).order_by(func.random()).limit(SAMPLE_SIZE)
+        ).all()
+        seekers = db.execute(
+            select(models.User.id, models.User.email, models.User.token_version)
+            .where(models.User.role == models.UserRole.seeker, models.User.deleted_at.is_(None))
+            .order_by(func.random()).limit(SAMPLE_SIZE)
+        ).all()
+        if not self.jobs or not seekers:
+            raise SystemExit("the database has no open jobs or no seekers; run seed_data.py first")
+        # (id, email, token)
+        self.seekers = [(s.id, s.email, token(s.id, s.email, models.UserRole.seeker, s.token_version))
+                        for s in seekers]
+        employers = db.execute(
+            select(models.User.id, models.User.email, models.User.token_version)
+            .where(models.User.id.in_({job.employer_id for job in self.jobs}))
+        ).all()
+        self.employer_tokens = {e.id: token(e.id, e.email, models.UserRole.employer, e.token_version)
+                                for e in employers}
+        self.locations = [place.name for place in list(geo.gazetteer().places.values())[:50]]
+        self.counts = {
+            "users": db.scalar(select(func.count()).select_from(models.User)),
+            "jobs": db.scalar(select(func.count()).select_from(models.Job)),
+            "applications": db.scalar(select(func.count()).select_from(models.Application)),
+        }
+
+    def request(self, op, rng):
+        """(method, url, kwargs) for one operation."""
+        bearer = lambda token: {"headers": {"Authorization": f"Bearer {token}"}}
+        if op == "search":
+            return "GET", "/seeker/jobs", {"params": {"q": rng.choice(SEARCH_TERMS)}}
+        if op == "search_filtered":
+            return "GET", "/seeker/jobs", {"params": {
+                "q": rng.choice(SEARCH_TERMS), "location": rng.choice(self.locations),
+                "employment_type": rng.choice(("Full-time", "Contract")),
+            }}
+        if op == "listing":
+            return "GET", "/seeker/jobs", {}
+        if op == "job_detail":
+            return "GET", f"/seeker/jobs/{rng.choice(self.jobs).id}", {}
+        if op == "facets":
+            return "GET", "/seeker/jobs/facets", {"params": {"location": rng.choice(self.locations)}}
+        if op == "login":
+            return "POST", "/auth/login", {"data": {"username": rng.choice(self.seekers)[1], "password": PASSWORD}}
+        if op == "apply":
+            # Mostly fresh pairs; a repeat is a 400, not an error
+            return "POST", f"/seeker/apply/{rng.choice(self.jobs).id}", bearer(rng.choice(self.seekers)[2])
+        if op == "my_applications":
+            return "GET", "/seeker/applications", bearer(rng.choice(self.seekers)[2])
+        if op == "recommendations":
+            return "GET", "/seeker/recommendations", bearer(rng.choice(self.seekers)[2])
+        job = rng.choice(self.jobs)
+        if op == "employer_jobs":
+            return "GET", "/employer/jobs", bearer(self.employer_tokens[job.employer_id])
+        if op == "applicants":
+            return "GET", f"/employer/jobs/{job.id}/applicants", bearer(self.employer_tokens[job.employer_id])
+        raise ValueError(op)
+
+class Results:
+    def __init__(self):
+        self.latencies = {}  # op -> [seconds]
+        self.statuses = {}  # op -> Counter
+        self.errors = Counter()
+        self.warmup = {}
+
+    def record(self, op, elapsed, status):
+        self.latencies.setdefault(op, []).append(elapsed)
+        self.statuses.setdefault(op, Counter())[str(status)] += 1
+        if status == "exception" or status >= 500:
+            self.errors[op] += 1
+
+    def report(self, elapsed):
+        def describe(latencies, requests, errors):
+            ms = [value * 1000 for value in latencies]
+            return {
+                "requests": requests,
+                "errors": errors,
+                "throughput_rps": round(requests / elapsed, 1),
+                "mean_ms": round(statistics.fmean(ms), 3),
+                "p50_ms": round(percentile(ms, 50), 3),
+                "p95_ms": round(percentile(ms, 95), 3),
+                "p99_ms": round(percentile(ms, 99), 3),
+                "max_ms": round(max(ms), 3),
+            }
+
+        endpoints = {}
+        for op in sorted(self.latencies):
+            endpoints[op] = {
+                **describe(self.latencies[op], len(self.latencies[op]), self.errors[op]),
+                "status": dict(sorted(self.statuses[op].items())),
+                "warmup_ms": round(self.warmup.get(op, 0) * 1000, 3),
+            }
+        everything = [value for values in self.latencies.values() for value in values]
+        overall = describe(everything, len(everything), sum(self.errors.values())) if everything else {}
+        return endpoints, {**overall, "duration_s": round(elapsed, 3)}
+
+async def _call(client, workload, op, rng):
+    method, url, kwargs = workload.request(op, rng)
+    start = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+        status = response.status_code
+    except Exception:
+        status = "exception"
+    return time.perf_counter() - start, status
+
+async def run(app, workload, mix=DEFAULT_MIX, concurrency=8, requests=2000, duration=None, seed_value=1):
+    """Drive app with the workload and return the report (without meta)."""
+    import httpx
+
+    ops = [op for op, weight in mix.items() if weight > 0]
+    weights = [mix[op] for op in ops]
+    results = Results()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            rng = random.Random(seed_value)
+            for op in ops:
+                start = time.perf_counter()
+                for _ in range(WARMUP_REQUESTS):
+                    await _call(client, workload, op, rng)
+                results.warmup[op] = time.perf_counter() - start
+
+            issued = 0
+            deadline = time.perf_counter() + duration if duration else None
+
+            async def user(index):
+                nonlocal issued
+                rng = random.Random(f"{seed_value}-{index}")
+                while True:
+                    if deadline is not None:
+                        if time.perf_counter() >= deadline:
+                            return
+                    elif issued >= requests:
+                        return
+                    issued += 1
+                    op = rng.choices(ops, weights)[0]
+                    elapsed, status = await _call(client, workload, op, rng)
+                    results.record(op, elapsed, status)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(user(i) for i in range(concurrency)))
+            elapsed = time.perf_counter() - start
+
+    endpoints, overall = results.report(elapsed)
+    return {"version": REPORT_VERSION, "endpoints": endpoints, "overall": overall}
+
+def compare(report, baseline, tolerance):
+    """Lines describing the change from baseline, and whether any endpoint
+    regressed beyond tolerance."""
+    lines, regressed = [], False
+    names = sorted(set(report["endpoints"]) | set(baseline["endpoints"]))
+    lines.append(f"{'endpoint':<18}{'p95 ms':>10}{'was':>10}{'change':>9}{'req/s':>10}{'was':>10}{'change':>9}")
+    for name in names + ["overall"]:
+        now = report["overall"] if name == "overall" else report["endpoints"].get(name)
+        was = baseline["overall"] if name == "overall" else baseline["endpoints"].get(name)
+        if not now or not was:
+            lines.append(f"{name:<18}  only in {'baseline' if was else 'this run'}")
+            continue
+        p95 = now["p95_ms"] / was["p95_ms"] - 1 if was["p95_ms"] else 0.0
+        rps = now["throughput_rps"] / was["throughput_rps"] - 1 if was["throughput_rps"] else 0.0
+        flag = p95 > tolerance or rps < -tolerance
+        regressed |= flag
+        lines.append(f"{name:<18}{now['p95_ms']:>10.2f}{was['p95_ms']:>10.2f}{p95:>+9.0%}"
+                     f"{now['throughput_rps']:>10.1f}{was['throughput_rps']:>10.1f}{rps:>+9.0%}"
+                     + ("  REGRESSION" if flag else ""))
+    return lines, regressed
+
+def main():
+    parser = argparse.ArgumentParser(description="in-process mixed-workload load test")
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL")
+    parser.add_argument("--concurrency", type=int, default=8, help="virtual users")
+    parser.add_argument("--requests", type=int, default=2000, help="timed requests, all users together")
+    parser.add_argument("--duration", type=float, help="run for this many seconds instead of --requests")
+    parser.add_argument("--mix", type=parse_mix, help="operation weights, e.g. search=5,apply=1 (others 0)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="baseline report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative slowdown")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    if args.database_url:
+        # Must be set before backend.database builds its engines
+        os.environ["DATABASE_URL"] = args.database_url
+        os.environ.pop("ASYNC_DATABASE_URL", None)
+    # The load test measures requests, not the background jobs; and logins
+    # would all be logged as slow requests
+    os.environ.setdefault("PURGE_INTERVAL_SECONDS", "0")
+    os.environ.setdefault("ARCHIVE_INTERVAL_SECONDS", "0")
+    os.environ.setdefault("SLOW_REQUEST_SECONDS", "60")
+    from backend import database
+    from backend.main import app
+
+    with database.SessionLocal() as db:
+        workload = Workload(db)
+    report = asyncio.run(run(app, workload, args.mix or DEFAULT_MIX, args.concurrency, args.requests,
+                             args.duration, args.seed))
+    report["meta"] = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": database.engine.dialect.name,
+        "dataset": workload.counts,
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+        "mix": args.mix or DEFAULT_MIX,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'endpoint':<18}{'req':>7}{'err':>5}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for name, row in [*report["endpoints"].items(), ("overall", report["overall"])]:
+            print(f"{name:<18}{row['requests']:>7}{row['errors']:>5}{row['throughput_rps']:>9.1f}"
+                  f"{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        lines, regressed = compare(report, baseline, args.tolerance)
+        print("\n".join(lines))
+        if regressed:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import argparse
+from backend.database import engine
+from backend import migrations
+
+# Bring the database schema up to date. Replaces init_tables.py and
+# migrate_db.py; safe to run on every deploy.
+#
+#   python migrate.py            apply pending migrations
+#   python migrate.py --status   show the current version and what is pending
+
+def main():
+    parser = argparse.ArgumentParser(description="Job portal schema migrations")
+    parser.add_argument("--status", action="store_true", help="show pending migrations without applying them")
+    args = parser.parse_args()
+
+    if args.status:
+        version, pending = migrations.status(engine)
+        print(f"Current schema version: {version}")
+        for number, name in pending:
+            print(f"  pending {number}: {name}")
+        return
+
+    print("Starting migration...")
+    migrations.upgrade(engine)
+    print("Migration complete.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+from backend.database import SessionLocal
+from backend import purge
+
+# Remove soft-deleted users and jobs and everything that depends on them,
+# in small chunks. The app does this every PURGE_INTERVAL_SECONDS already;
+# run this from cron when that is disabled (PURGE_INTERVAL_SECONDS=0).
+
+def main():
+    db = SessionLocal()
+    try:
+        purged = purge.purge_pending(db)
+    finally:
+        db.close()
+    print("Purged: " + (", ".join(f"{n} {kind}" for kind, n in purged.items() if n) or "nothing pending"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import argparse
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+# Synthetic data for load tests and benchmarks: users, employer and seeker
+# profiles, jobs and applications, bulk-inserted into the database in
+# DATABASE_URL (or --database-url), SQLite or MySQL. Run it on an empty
+# database; the schema is brought up to date first.
+#
+#   python seed_data.py --jobs 1000000 --applications 10000000
+#
+# The data is skewed the way real traffic is. Applications pick their job
+# from a Zipf distribution (--job-skew), so a few hot jobs collect most
+# applicants, and their seeker likewise (--seeker-skew, prolific
+# seekers). Job text draws from a skill vocabulary with the same kind of
+# skew, so search and recommendations see realistic posting lengths. The
+# same --seed gives the same data.
+#
+# Every user's password is --password (hashed once, at the BCRYPT_ROUNDS
+# the app will verify with). Ids are assigned in order:
+# admin@example.com is 1, then employer{i}@example.com, then
+# seeker{i}@example.com. Counters are reconciled at the end.
+
+SKILLS = (
+    "python java javascript typescript react angular vue node django flask fastapi spring go rust kotlin "
+    "swift sql postgresql mysql mongodb redis kafka docker kubernetes terraform aws azure gcp linux git "
+    "graphql rest microservices pandas numpy spark hadoop airflow tableau excel figma selenium jenkins "
+    "ansible elasticsearch rabbitmq c++ c# .net php laravel ruby rails scala hive tensorflow pytorch nlp "
+    "security networking salesforce sap agile scrum testing devops android ios flutter html css sass"
+).split()
+TITLES = ("Backend Engineer", "Frontend Developer", "Full Stack Developer", "Data Engineer", "Data Analyst",
+          "DevOps Engineer", "Mobile Developer", "QA Engineer", "Machine Learning Engineer", "Product Designer",
+          "Site Reliability Engineer", "Security Engineer", "Engineering Manager", "Cloud Architect")
+LEVELS = ("Junior", "", "", "Senior", "Lead", "Staff")
+JOB_TYPES = ("Full-time", "Full-time", "Full-time", "Part-time", "Contract", "Internship", "Temporary")
+SALARIES = ("$80k-100k", "$100k-130k", "$120,000 - $150,000", "€45,000 - €60,000", "£40k-55k",
+            "₹12-18 LPA", "$45/hr", "Up to $90k", "Competitive", "")
+EDUCATION = ("BSc Computer Science", "BE Information Technology", "MSc Data Science", "BA Economics",
+             "Bootcamp graduate", "PhD Physics")
+STATUSES = ("applied", "applied", "applied", "applied", "rejected", "accepted")
+REMOTE_SHARE = 0.15
+
+def zipf_choice(rng, n, size, skew, popular=None):
+    """size draws from range(n), rank r drawn with weight 1 / (r + 1) ** skew.
+    popular[r] is the value of rank r (a random permutation if not given);
+    pass the same one to keep the same values hot across calls."""
+    import numpy as np
+    if skew <= 0:
+        return rng.integers(0, n, size=size)
+    if popular is None:
+        popular = rng.permutation(n)
+    weights = 1.0 / np.arange(1, n + 1) ** skew
+    ranks = rng.choice(n, size=size, p=weights / weights.sum())
+    return popular[ranks]
+
+def text(rng, vocabulary, p, words):
+    return " ".join(vocabulary[rng.choice(len(vocabulary), size=words, p=p)])
+
+def batches(total, size):
+    for start in range(0, total, size):
+        yield start, min(size, total - start)
+
+def seed(engine, employers, seekers, jobs, applications, job_skew=1.0, seeker_skew=0.8, days=365,
+         password="password123", seed_value=42, batch_size=10_000, log=print):
+    import numpy as np
+    from sqlalchemy.orm import Session
+    from backend import models, migrations, counters, normalize, geo, passwords
+
+    migrations.upgrade(engine, log=lambda *args: None)
+    rng = np.random.default_rng(seed_value)
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    hashed = passwords.hash_password(password)
+    vocabulary = np.array(SKILLS)
+    p = 1.0 / np.arange(1, len(SKILLS) + 1)
+    p /= p.sum()
+    locations = [place.name for place in geo.gazetteer().places.values()] + ["Remote"]
+    derived_cache = {}
+
+    def derived(location, job_type, salary):
+        key = (location, job_type, salary)
+        if key not in derived_cache:
+            derived_cache[key] = {**normalize.derived(job_type, salary), **geo.derived(location)}
+        return derived_cache[key]
+
+    first_employer, first_seeker = 2, 2 + employers
+    timings = {}
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+
+        start = time.perf_counter()
+        users = [{"id": 1, "email": "admin@example.com", "hashed_password": hashed, "role": models.UserRole.admin,
+                  "created_at": now - timedelta(days=days)}]
+        signup_days = rng.integers(0, days + 1, size=employers + seekers)
+        users += [{"id": first_employer + i, "email": f"employer{i}@example.com", "hashed_password": hashed,
+                   "role": models.UserRole.employer, "created_at": now - timedelta(days=int(signup_days[i]))}
+                  for i in range(employers)]
+        users += [{"id": first_seeker + i, "email": f"seeker{i}@example.com", "hashed_password": hashed,
+                   "role": models.UserRole.seeker, "created_at": now - timedelta(days=int(signup_days[employers + i]))}
+                  for i in range(seekers)]
+        for offset, count in batches(len(users), batch_size):
+            conn.execute(models.User.__table__.insert(), users[offset:offset + count])
+        conn.execute(models.Employer.__table__.insert(), [
+            {"id": first_employer + i, "company_name": f"Company {i}", "location": locations[i % len(locations)],
+             "place_id": geo.derived(locations[i % len(locations)])["place_id"]}
+            for i in range(employers)
+        ])
+        for offset, count in batches(seekers, batch_size):
+            conn.execute(models.JobSeeker.__table__.insert(), [
+                {"id": first_seeker + i, "full_name": f"Seeker {i}",
+                 "skills": ", ".join(dict.fromkeys(text(rng, vocabulary, p, int(rng.integers(3, 12))).split())),
+                 "experience": f"{int(rng.integers(0, 15))} years; " + text(rng, vocabulary, p, 8),
+                 "education": EDUCATION[i % len(EDUCATION)], "resume_link": f"https://example.com/cv/{i}.pdf"}
+                for i in range(offset, offset + count)
+            ])
+        timings["users_s"] = time.perf_counter() - start
+
+        # Jobs: employers also skewed (a few post most jobs); posted evenly
+        # over the period, open for 30-60 days
+        start = time.perf_counter()
+        job_employers = first_employer + zipf_choice(rng, employers, jobs, 1.0)
+        posted_minutes = np.sort(rng.integers(0, days * 24 * 60, size=jobs))[::-1]
+        posted = [now - timedelta(minutes=int(m)) for m in posted_minutes]
+        for offset, count in batches(jobs, batch_size):
+            rows = []
+            for i in range(offset, offset + count):
+                location = "Remote" if rng.random() < REMOTE_SHARE else locations[int(rng.integers(len(locations)))]
+                job_type = JOB_TYPES[int(rng.integers(len(JOB_TYPES)))]
+                salary = SALARIES[int(rng.integers(len(SALARIES)))]
+                closing = posted[i] + timedelta(days=int(rng.integers(30, 61)))
+                rows.append({
+                    "id": i + 1, "employer_id": int(job_employers[i]),
+                    "title": f"{LEVELS[int(rng.integers(len(LEVELS)))]} {TITLES[int(rng.integers(len(TITLES)))]}".strip(),
+                    "description": text(rng, vocabulary, p, int(rng.integers(20, 60))),
+                    "location": location, "job_type": job_type, "salary_range": salary,
+                    "posted_at": posted[i], "closing_date": closing, "archived": closing <= now,
+                    **derived(location, job_type, salary),
+                })
+            conn.execute(models.Job.__table__.insert(), rows)
+        timings["jobs_s"] = time.perf_counter() - start
+
+        # Applications: (job, seeker) pairs from the two skewed
+        # distributions, duplicates dropped and redrawn
+        start = time.perf_counter()
+        keys = np.zeros(0, dtype=np.int64)
+        # Drawn once: redraws must keep the same jobs and seekers hot
+        hot_jobs, hot_seekers = rng.permutation(jobs), rng.permutation(seekers)
+        for _ in range(10):
+            need = applications - len(keys)
+            if need <= 0 or not jobs or not seekers:
+                break
+            draw = int(need * 1.2) + 10
+            job_idx = zipf_choice(rng, jobs, draw, job_skew, hot_jobs).astype(np.int64)
+            seeker_idx = zipf_choice(rng, seekers, draw, seeker_skew, hot_seekers).astype(np.int64)
+            keys = np.unique(np.concatenate([keys, job_idx * seekers + seeker_idx]))
+        keys = rng.permutation(keys)[:applications]
+        statuses = [getattr(models.ApplicationStatus, s) for s in STATUSES]
+        for offset, count in batches(len(keys), batch_size):
+            chunk = keys[offset:offset + count]
+            job_idx, seeker_idx = chunk // seekers, chunk % seekers
+            delays = rng.integers(0, 30 * 24 * 60, size=count)
+            picks = rng.integers(0, len(statuses), size=count)
+            conn.execute(models.Application.__table__.insert(), [
+                {"job_id": int(j) + 1, "seeker_id": first_seeker + int(s),
+                 "status": statuses[k], "applied_at": min(now, posted[int(j)] + timedelta(minutes=int(d)))}
+                for j, s, d, k in zip(job_idx, seeker_idx, delays, picks)
+            ])
+        timings["applications_s"] = time.perf_counter() - start
+
+    with Session(engine) as db:
+        counters.reconcile(db)
+    result = {"employers": employers, "seekers": seekers, "jobs": jobs, "applications": int(len(keys)),
+              **{key: round(value, 1) for key, value in timings.items()}}
+    log(result)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="seed the database with synthetic data")
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL")
+    parser.add_argument("--employers", type=int, default=2_000)
+    parser.add_argument("--seekers", type=int, default=50_000)
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--applications", type=int, default=1_000_000)
+    parser.add_argument("--job-skew", type=float, default=1.0, help="Zipf exponent of applications per job; 0 is uniform")
+    parser.add_argument("--seeker-skew", type=float, default=0.8, help="Zipf exponent of applications per seeker")
+    parser.add_argument("--days", type=int, default=365, help="period the jobs are posted over")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    if args.database_url:
+        # Must be set before backend.database builds its engine
+        os.environ["DATABASE_URL"] = args.database_url
+    from backend import database
+
+    start = time.perf_counter()
+    seed(database.engine, args.employers, args.seekers, args.jobs, args.applications, args.job_skew,
+         args.seeker_skew, args.days, args.password, args.seed, args.batch_size)
+    print(f"seeded in {time.perf_counter() - start:.1f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+from backend import models, matching
+from conftest import make_user, auth_headers
+
+def seed(db, seekers):
+    employer = make_user(db, "employer@example.com", models.UserRole.employer)
+    job = models.Job(employer_id=employer.id, title="Backend Engineer",
+                     description="Python services with FastAPI and PostgreSQL on AWS",
+                     location="Remote", job_type="Full-time", salary_range="n/a")
+    db.add(job)
+    db.commit()
+    for i, (skills, experience) in enumerate(seekers):
+        seeker = make_user(db, f"seeker{i}@example.com", models.UserRole.seeker, full_name=f"Seeker {i}")
+        profile = db.get(models.JobSeeker, seeker.id)
+        profile.skills, profile.experience = skills, experience
+        db.add(models.Application(job_id=job.id, seeker_id=seeker.id))
+    db.commit()
+    return job.id, auth_headers(employer)
+
+def test_applicants_query_count_is_constant(client, db, query_counter):
+    job_id, headers = seed(db, [("Python", "3 years")] * 30)
+    url = f"/employer/jobs/{job_id}/applicants"
+    client.get(url, headers=headers)
+
+    query_counter.clear()
+    r = client.get(url, headers=headers, params={"limit": 100})
+    assert len(r.json()["items"]) == 30
+    assert r.json()["items"][0]["seeker_email"].endswith("@example.com")
+    assert r.json()["items"][0]["job_title"] == "Backend Engineer"
+    assert len(query_counter) == 1
+
+    other = auth_headers(make_user(db, "other@example.com", models.UserRole.employer))
+    assert client.get(url, headers=other).status_code == 404
+
+def test_sort_by_match(client, db, query_counter):
+    job_id, headers = seed(db, [
+        ("Excel, PowerPoint", "Office administration"),
+        ("Python, FastAPI, PostgreSQL", "Built Python services on AWS"),
+        (None, None),
+        ("Python", "Django web apps"),
+    ])
+    url = f"/employer/jobs/{job_id}/applicants"
+    client.get(url, headers=headers)
+
+    query_counter.clear()
+    r = client.get(url, headers=headers, params={"sort": "match"})
+    assert r.status_code == 200
+    items = r.json()["items"]
+    assert [item["seeker_name"] for item in items[:2]] == ["Seeker 1", "Seeker 3"]
+    assert items[0]["match_score"] > items[1]["match_score"] > 0
+    assert items[-1]["match_score"] == 0
+    # First listing: the unscored applications, their scores, the page
+    assert len(query_counter) == 3
+    query_counter.clear()
+    assert client.get(url, headers=headers, params={"sort": "match"}).json()["items"] == items
+    # Then nothing left to score: the page is one indexed query
+    assert len(query_counter) == 2
+
+    # Ranked pages walk the same order without gaps or repeats
+    seen, cursor = [], None
+    while True:
+        params = {"sort": "match", "limit": 1, **({"cursor": cursor} if cursor else {})}
+        page = client.get(url, headers=headers, params=params).json()
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == [item["id"] for item in items]
+
+def test_match_scores_follow_profile_and_job_edits(client, db):
+    job_id, headers = seed(db, [("Python, FastAPI", "Built services"), ("Excel", "Office administration")])
+    url = f"/employer/jobs/{job_id}/applicants"
+    ranked = lambda: [(i["seeker_name"], i["match_score"]) for i in
+                      client.get(url, headers=headers, params={"sort": "match"}).json()["items"]]
+    assert [name for name, _ in ranked()] == ["Seeker 0", "Seeker 1"]
+
+    # Seeker 1 retrains: only their application is scored again
+    seeker = auth_headers(db.query(models.User).filter_by(email="seeker1@example.com").one())
+    profile = {"full_name": "Seeker 1", "skills": "Python, FastAPI, PostgreSQL, AWS", "experience": "Python services"}
+    assert client.put("/seeker/profile", json=profile, headers=seeker).status_code == 200
+    stored = dict(db.query(models.Application.seeker_id, models.Application.match_score).all())
+    assert sorted(score is None for score in stored.values()) == [False, True]
+    assert [name for name, _ in ranked()] == ["Seeker 1", "Seeker 0"]
+
+    # The job is rewritten: every score is redone
+    job = {"title": "Office Manager", "description": "Has built and run an office"}
+    assert client.put(f"/employer/jobs/{job_id}", json=job, headers=headers).status_code == 200
+    db.expire_all()
+    assert all(a.match_score is None for a in db.query(models.Application))
+    assert [name for name, score in ranked() if score > 0] == ["Seeker 0"]
+
+def test_scores_are_cosine_similarities():
+    result = matching.scores("python developer", ["python developer", "java developer", "", "cooking"])
+    assert abs(result[0] - 1.0) < 1e-5
+    assert 0 < result[1] < result[0]
+    assert result[2] == 0 and result[3] == 0
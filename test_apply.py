@@ -0,0 +1,85 @@
+import asyncio
+import httpx
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import IntegrityError
+from backend import models
+from backend.main import app
+from conftest import make_user, auth_headers
+
+def seed(db, jobs=4, seekers=5):
+    employer = make_user(db, "employer@example.com", models.UserRole.employer)
+    job_ids = []
+    for i in range(jobs):
+        job = models.Job(employer_id=employer.id, title=f"Job {i}", description="d", location="Remote",
+                         job_type="Full-time", salary_range="n/a")
+        db.add(job)
+        db.flush()
+        job_ids.append(job.id)
+    db.commit()
+    users = [make_user(db, f"seeker{i}@example.com", models.UserRole.seeker) for i in range(seekers)]
+    return job_ids, [auth_headers(user) for user in users]
+
+def test_apply_is_one_statement(client, db, query_counter):
+    (job_id, other_id), (headers,) = seed(db, jobs=2, seekers=1)
+    client.post(f"/seeker/apply/{other_id}", headers=headers)  # warm the token cache
+
+    query_counter.clear()
+    r = client.post(f"/seeker/apply/{job_id}", headers=headers)
+    assert r.status_code == 200
+    assert r.json()["job_title"] == "Job 0"
+    assert r.json()["status"] == "Applied"
+    # The insert itself plus the counters bump (was four statements before)
+    assert len(query_counter) == 2
+
+    assert client.post(f"/seeker/apply/{job_id}", headers=headers).status_code == 400
+    assert client.post("/seeker/apply/9999", headers=headers).status_code == 404
+
+def test_parallel_applies_create_one_row_each(engine, db):
+    job_ids, seekers = seed(db)
+    attempts = 10
+
+    async def storm():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            requests = [ac.post(f"/seeker/apply/{job_id}", headers=headers)
+                        for job_id in job_ids for headers in seekers for _ in range(attempts)]
+            return await asyncio.gather(*requests)
+
+    responses = asyncio.run(storm())
+    assert len(responses) == len(job_ids) * len(seekers) * attempts
+    codes = [r.status_code for r in responses]
+    assert codes.count(200) == len(job_ids) * len(seekers)
+    assert codes.count(400) == len(responses) - codes.count(200)
+
+    pairs = db.execute(
+        select(models.Application.job_id, models.Application.seeker_id, func.count())
+        .group_by(models.Application.job_id, models.Application.seeker_id)
+    ).all()
+    assert len(pairs) == len(job_ids) * len(seekers)
+    assert all(n == 1 for _, _, n in pairs)
+
+def test_idempotency_key_replays_response(client, db, query_counter):
+    (job_id,), (headers,) = seed(db, jobs=1, seekers=1)
+    retry = {**headers, "Idempotency-Key": "click-1"}
+    first = client.post(f"/seeker/apply/{job_id}", headers=retry)
+    assert first.status_code == 200
+
+    query_counter.clear()
+    again = client.post(f"/seeker/apply/{job_id}", headers=retry)
+    assert again.status_code == 200
+    assert again.json() == first.json()
+    assert again.headers["idempotent-replayed"] == "true"
+    assert query_counter == []
+
+    # A new key is a new attempt
+    assert client.post(f"/seeker/apply/{job_id}", headers={**headers, "Idempotency-Key": "click-2"}).status_code == 400
+
+def test_only_duplicates_are_already_applied(client, db):
+    (job_id,), (headers,) = seed(db, jobs=1, seekers=1)
+    # Any other constraint failure, such as a purged seeker's foreign key
+    db.execute(text("CREATE TRIGGER reject_applications BEFORE INSERT ON applications "
+                    "BEGIN SELECT RAISE(ABORT, 'FOREIGN KEY constraint failed'); END"))
+    db.commit()
+    with pytest.raises(IntegrityError):
+        client.post(f"/seeker/apply/{job_id}", headers=headers)
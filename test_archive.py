@@ -0,0 +1,56 @@
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from backend import models, archive
+from conftest import make_user, auth_headers
+
+JOB = {"description": "Build things", "location": "Remote", "job_type": "Full-time", "salary_range": "n/a"}
+
+def test_expired_jobs_are_archived(client, db, monkeypatch):
+    admin = auth_headers(make_user(db, "admin@example.com", models.UserRole.admin))
+    employer = auth_headers(make_user(db, "employer@example.com", models.UserRole.employer))
+    seeker = auth_headers(make_user(db, "seeker@example.com", models.UserRole.seeker))
+    late = auth_headers(make_user(db, "late@example.com", models.UserRole.seeker))
+    job_ids = [client.post("/employer/jobs", json={**JOB, "title": f"Engineer {i}"}, headers=employer).json()["id"]
+               for i in range(5)]
+    for job_id in job_ids:
+        client.post(f"/seeker/apply/{job_id}", headers=seeker)
+    client.get("/seeker/jobs", params={"q": "engineer"})  # build the search index
+    # Three of them close, as if time had passed
+    expired, current = job_ids[:3], job_ids[3:]
+    db.execute(update(models.Job).where(models.Job.id.in_(expired))
+               .values(closing_date=datetime.utcnow() - timedelta(days=1)))
+    db.commit()
+
+    # Hidden from the listing before the archiver even runs
+    listed = lambda: [j["id"] for j in client.get("/seeker/jobs").json()["items"]]
+    assert sorted(listed()) == current
+
+    monkeypatch.setattr(archive, "ARCHIVE_BATCH_SIZE", 2)
+    stopping = threading.Event()
+    stopping.set()
+    # Told to stop: one chunk, then the next run picks up the rest
+    assert archive.archive_expired(db, pause=0, stopping=stopping) == 2
+    assert archive.archive_expired(db, pause=0) == 1
+    assert archive.archive_expired(db, pause=0) == 0
+    assert sorted(listed()) == current
+    searched = client.get("/seeker/jobs", params={"q": "engineer"}).json()["items"]
+    assert sorted(j["id"] for j in searched) == current
+    assert client.post(f"/seeker/apply/{expired[0]}", headers=late).status_code == 404
+
+    # Still there for lookups, the employer and the admin archive view
+    job = client.get(f"/seeker/jobs/{expired[0]}").json()
+    assert job["archived"] is True and job["title"] == "Engineer 0"
+    assert len(client.get(f"/employer/jobs/{expired[0]}/applicants", headers=employer).json()["items"]) == 1
+    assert len(client.get("/seeker/applications", headers=seeker).json()["items"]) == 5
+    archived = client.get("/admin/jobs", params={"archived": True}, headers=admin).json()["items"]
+    assert sorted(j["id"] for j in archived) == expired
+    assert sorted(j["id"] for j in client.get("/admin/jobs", headers=admin).json()["items"]) == current
+
+    # Extending the closing date brings a job back
+    closing = (datetime.utcnow() + timedelta(days=30)).isoformat()
+    response = client.put(f"/employer/jobs/{expired[0]}", json={"closing_date": closing}, headers=employer)
+    assert response.json()["archived"] is False
+    assert sorted(listed()) == sorted(current + expired[:1])
+    searched = client.get("/seeker/jobs", params={"q": "engineer"}).json()["items"]
+    assert expired[0] in [j["id"] for j in searched]
@@ -0,0 +1,54 @@
+import gzip
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+import build_assets
+from backend import assets
+
+def served(tmp_path):
+    report = build_assets.build(assets.SOURCE_DIR, tmp_path)
+    app = Starlette(routes=[Mount("/", assets.PrecompressedStaticFiles(directory=str(tmp_path), html=True))])
+    return TestClient(app), {row["file"] for row in report}
+
+def test_build_fingerprints_and_rewrites(tmp_path):
+    _, files = served(tmp_path)
+    [api] = [name for name in files if name.startswith("js/api.")]
+    assert assets.HASHED_NAME.search(api)
+    page = (tmp_path / "dashboard_seeker.html").read_text()
+    assert f'src="{api}"' in page and 'src="js/api.js"' not in page
+    # External URLs are left alone
+    assert "https://fonts.googleapis.com/" in page
+    assert gzip.decompress((tmp_path / f"{api}.gz").read_bytes()) == (tmp_path / api).read_bytes()
+
+def test_negotiation_caching_and_etags(tmp_path):
+    client, files = served(tmp_path)
+    [css] = [name for name in files if name.startswith("css/style.")]
+    original = (tmp_path / css).read_bytes()
+    # A brotli variant, as build_assets writes when brotli is installed
+    (tmp_path / f"{css}.br").write_bytes(b"pretend brotli")
+
+    r = client.get(f"/{css}", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.content == original
+    assert r.headers["cache-control"] == assets.IMMUTABLE
+    assert r.headers["vary"] == "Accept-Encoding"
+    assert r.headers["content-type"].startswith("text/css")
+    gzip_etag = r.headers["etag"]
+
+    with client.stream("GET", f"/{css}", headers={"Accept-Encoding": "gzip, br"}) as r:
+        assert r.headers["content-encoding"] == "br"
+        assert b"".join(r.iter_raw()) == b"pretend brotli"
+        assert r.headers["etag"] != gzip_etag
+
+    r = client.get(f"/{css}", headers={"Accept-Encoding": "identity, gzip;q=0"})
+    assert "content-encoding" not in r.headers
+    assert r.content == original
+
+    r = client.get(f"/{css}", headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag})
+    assert r.status_code == 304
+
+    # Pages keep their names, so they are revalidated on every load
+    r = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["cache-control"] == assets.REVALIDATE
+    assert r.headers["content-type"].startswith("text/html")
+    assert client.get("/", headers={"If-None-Match": r.headers["etag"], "Accept-Encoding": "gzip"}).status_code == 304
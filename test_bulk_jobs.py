@@ -0,0 +1,93 @@
+import json
+from backend import models, bulk
+from conftest import make_user, auth_headers
+
+def job(i, **fields):
+    return {"title": f"Engineer {i}", "description": "Build things", "location": "Remote",
+            "job_type": "Full-time", "salary_range": "n/a", "external_id": f"ats-{i}", **fields}
+
+def upload(client, headers, body, content_type):
+    r = client.post("/employer/jobs/bulk", content=body, headers={**headers, "Content-Type": content_type})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+def test_bulk_upsert_writes_only_changes(client, db, monkeypatch, query_counter):
+    monkeypatch.setattr(bulk, "BULK_CHUNK_SIZE", 10)
+    headers = auth_headers(make_user(db, "employer@example.com", models.UserRole.employer))
+    rows = [job(i) for i in range(25)]
+
+    query_counter.clear()
+    first = upload(client, headers, json.dumps(rows), "application/json")
+    assert (first["created"], first["updated"], first["unchanged"], first["failed"]) == (25, 0, 0, 0)
+    assert [r["row"] for r in first["results"]] == list(range(1, 26))
+    # Per chunk of 10: external id lookup, one INSERT, counters, re-read
+    writes = [sql for sql in query_counter if sql.lstrip().upper().startswith(("INSERT INTO JOBS", "UPDATE JOBS"))]
+    assert len(writes) == 3
+
+    rows[3]["title"] = "Staff Engineer"
+    rows[20]["closing_date"] = "2030-01-31T00:00:00"
+    query_counter.clear()
+    second = upload(client, headers, "\n".join(json.dumps(r) for r in rows), "application/x-ndjson")
+    assert (second["created"], second["updated"], second["unchanged"]) == (0, 2, 23)
+    assert {r["row"] for r in second["results"] if r["status"] == "updated"} == {4, 21}
+    assert not any(sql.lstrip().upper().startswith("INSERT INTO JOBS") for sql in query_counter)
+
+    ids = {r["external_id"]: r["id"] for r in first["results"]}
+    assert db.get(models.Job, ids["ats-3"]).title == "Staff Engineer"
+    assert db.query(models.Job).count() == 25
+
+def test_bulk_csv_with_row_errors(client, db):
+    headers = auth_headers(make_user(db, "employer@example.com", models.UserRole.employer))
+    body = (
+        "title,description,location,job_type,salary_range,closing_date,external_id\n"
+        "Engineer,Build,Remote,Full-time,n/a,,\n"
+        "Designer,\"Multi\nline\",Pune,Contract,n/a,2030-01-31,d-1\n"
+        "Broken,Build,Remote,Full-time,n/a,not-a-date,d-2\n"
+        "Designer again,Build,Pune,Contract,n/a,,d-1\n"
+    )
+    result = upload(client, headers, body, "text/csv")
+    assert (result["created"], result["failed"]) == (2, 2)
+    statuses = {r["row"]: r["status"] for r in result["results"]}
+    assert statuses == {1: "created", 2: "created", 3: "error", 4: "error"}
+    errors = {r["row"]: r["errors"] for r in result["results"] if r["errors"]}
+    assert errors[3][0].startswith("closing_date")
+    assert errors[4] == ["duplicate external_id in this upload"]
+
+    # New postings are searchable straight away
+    titles = [j["title"] for j in client.get("/seeker/jobs", params={"q": "designer"}).json()["items"]]
+    assert titles == ["Designer"]
+
+def test_bulk_rejects_bad_uploads(client, db):
+    headers = auth_headers(make_user(db, "employer@example.com", models.UserRole.employer))
+    post = lambda body, ct: client.post("/employer/jobs/bulk", content=body, headers={**headers, "Content-Type": ct})
+    assert post("<jobs/>", "application/xml").status_code == 415
+    assert post("{not json", "application/json").status_code == 400
+    assert post("{}", "application/json").status_code == 400
+    # Invalid UTF-8 anywhere rejects the whole upload before any chunk is written
+    rows = [job(i) for i in range(600)]
+    csv_body = "title,description,location,job_type,salary_range,external_id\n" + "".join(
+        f"{r['title']},{r['description']},{r['location']},{r['job_type']},{r['salary_range']},{r['external_id']}\n" for r in rows
+    )
+    jsonl_body = "".join(json.dumps(r) + "\n" for r in rows)
+    for body, ct in ((csv_body, "text/csv"), (jsonl_body, "application/x-ndjson")):
+        response = post(body.encode() + b"\xff\xfe broken\n", ct)
+        assert response.status_code == 400 and "UTF-8" in response.json()["detail"]
+    assert db.query(models.Job).count() == 0
+    seeker = auth_headers(make_user(db, "seeker@example.com", models.UserRole.seeker))
+    assert client.post("/employer/jobs/bulk", content="[]", headers={**seeker, "Content-Type": "application/json"}).status_code == 403
+
+def test_bulk_extending_an_archived_job_unarchives_it(client, db):
+    headers = auth_headers(make_user(db, "employer@example.com", models.UserRole.employer))
+    rows = [job(0, closing_date="2020-01-31T00:00:00"), job(1, closing_date="2020-01-31T00:00:00")]
+    first = upload(client, headers, json.dumps(rows), "application/json")
+    ids = [r["id"] for r in first["results"]]
+    db.query(models.Job).update({models.Job.archived: True})
+    db.commit()
+
+    rows[0]["closing_date"] = "2099-01-31T00:00:00"
+    rows[1]["title"] = "Renamed, still closed"
+    second = upload(client, headers, json.dumps(rows), "application/json")
+    assert second["updated"] == 2
+    db.expire_all()
+    assert db.get(models.Job, ids[0]).archived is False
+    assert db.get(models.Job, ids[1]).archived is True
@@ -0,0 +1,51 @@
+from backend import models, counters
+from conftest import make_user, auth_headers
+
+def seed(db, applicants=6):
+    employer = make_user(db, "employer@example.com", models.UserRole.employer)
+    other = make_user(db, "other@example.com", models.UserRole.employer)
+    for owner in (employer, other):
+        db.add(models.Job(employer_id=owner.id, title="Job", description="d", location="x",
+                          job_type="Full-time", salary_range="n/a"))
+    db.flush()
+    for i in range(applicants):
+        seeker = make_user(db, f"seeker{i}@example.com", models.UserRole.seeker)
+        db.add(models.Application(job_id=1, seeker_id=seeker.id))
+        db.add(models.Application(job_id=2, seeker_id=seeker.id))
+    db.commit()
+    counters.reconcile(db)
+    return auth_headers(employer)
+
+def statuses(db, job_id):
+    db.expire_all()
+    return sorted(a.status.value for a in db.query(models.Application).filter_by(job_id=job_id))
+
+def test_bulk_status_by_ids_and_filter(client, db, query_counter):
+    headers = seed(db)
+    url = "/employer/applications/status"
+
+    query_counter.clear()
+    # Ids of another employer's job (even ids) are ignored
+    r = client.put(url, json={"status": "Accepted", "application_ids": [1, 2, 3]}, headers=headers)
+    assert r.json() == {"updated": 2, "previous_status": {"Applied": 2}}
+    assert len([sql for sql in query_counter if sql.lstrip().upper().startswith("UPDATE APPLICATIONS")]) == 1
+
+    r = client.put(url, json={"status": "Rejected", "job_id": 1, "current_status": "Applied"}, headers=headers)
+    assert r.json() == {"updated": 4, "previous_status": {"Applied": 4}}
+    assert statuses(db, 1) == ["Accepted"] * 2 + ["Rejected"] * 4
+    assert statuses(db, 2) == ["Applied"] * 6
+
+    # Already in the target status: nothing to change
+    r = client.put(url, json={"status": "Rejected", "job_id": 1, "current_status": "Applied"}, headers=headers)
+    assert r.json()["updated"] == 0
+
+    assert counters.reconcile(db) == 0
+    assert client.put(url, json={"status": "Rejected"}, headers=headers).status_code == 400
+
+def test_single_status_update_checks_owner(client, db):
+    headers = seed(db, applicants=1)
+    assert client.put("/employer/applications/1/status", params={"status": "Accepted"}, headers=headers).status_code == 200
+    assert client.put("/employer/applications/2/status", params={"status": "Accepted"}, headers=headers).status_code == 403
+    assert client.put("/employer/applications/99/status", params={"status": "Accepted"}, headers=headers).status_code == 404
+    assert statuses(db, 1) == ["Accepted"]
+    assert counters.reconcile(db) == 0
@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+from backend import models, exports
+from conftest import make_user, auth_headers
+
+def seed_jobs(db, employer, count):
+    for i in range(count):
+        db.add(models.Job(employer_id=employer.id, title=f"Job {i}", description="Line one\nline, two",
+                          location="Remote", job_type="Full-time", salary_range="n/a"))
+    db.commit()
+
+def test_admin_job_export_streams_in_batches(client, db, monkeypatch):
+    monkeypatch.setattr(exports, "EXPORT_BATCH_SIZE", 2)
+    admin = make_user(db, "admin@example.com", models.UserRole.admin)
+    employer = make_user(db, "employer@example.com", models.UserRole.employer, company_name="Acme")
+    seed_jobs(db, employer, 5)
+    headers = auth_headers(admin)
+
+    chunks = list(exports.stream(models.Base.metadata.tables["jobs"].select(), "csv"))
+    assert len(chunks) == 1 + 3  # header, then one chunk per batch
+
+    r = client.get("/admin/jobs/export", headers=headers)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+    assert 'filename="jobs.csv"' in r.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [row["title"] for row in rows] == [f"Job {i}" for i in range(5)]
+    assert rows[0]["description"] == "Line one\nline, two"
+    assert rows[0]["company_name"] == "Acme"
+
+    r = client.get("/admin/users/export", params={"format": "ndjson"}, headers=headers)
+    assert r.headers["content-type"] == "application/x-ndjson"
+    users = [json.loads(line) for line in r.text.splitlines()]
+    assert [(u["email"], u["role"]) for u in users] == [("admin@example.com", "admin"), ("employer@example.com", "employer")]
+    assert "hashed_password" not in users[0]
+
+    assert client.get("/admin/jobs/export", params={"format": "xml"}, headers=headers).status_code == 422
+    assert client.get("/admin/jobs/export", headers=auth_headers(employer)).status_code == 403
+
+def test_applicant_export(client, db):
+    employer = make_user(db, "employer@example.com", models.UserRole.employer)
+    seed_jobs(db, employer, 1)
+    seeker = make_user(db, "seeker@example.com", models.UserRole.seeker, full_name="Sam")
+    db.add(models.Application(job_id=1, seeker_id=seeker.id))
+    db.commit()
+
+    r = client.get("/employer/jobs/1/applicants/export", params={"format": "ndjson"}, headers=auth_headers(employer))
+    assert r.status_code == 200
+    (row,) = [json.loads(line) for line in r.text.splitlines()]
+    assert (row["seeker_name"], row["seeker_email"], row["status"]) == ("Sam", "seeker@example.com", "Applied")
+
+    other = make_user(db, "other@example.com", models.UserRole.employer)
+    assert client.get("/employer/jobs/1/applicants/export", headers=auth_headers(other)).status_code == 404
+
+def test_csv_cells_cannot_run_formulas(client, db):
+    employer = make_user(db, "employer@example.com", models.UserRole.employer)
+    seed_jobs(db, employer, 1)
+    seeker = make_user(db, "seeker@example.com", models.UserRole.seeker, full_name='=HYPERLINK("http://x","y")')
+    db.get(models.JobSeeker, seeker.id).skills = "+1 python"
+    db.add(models.Application(job_id=1, seeker_id=seeker.id))
+    db.commit()
+    headers = auth_headers(employer)
+
+    (row,) = csv.DictReader(io.StringIO(client.get("/employer/jobs/1/applicants/export", headers=headers).text))
+    assert row["seeker_name"] == '\'=HYPERLINK("http://x","y")'
+    assert row["seeker_skills"] == "'+1 python"
+    r = client.get("/employer/jobs/1/applicants/export", params={"format": "ndjson"}, headers=headers)
+    assert json.loads(r.text)["seeker_name"] == '=HYPERLINK("http://x","y")'
@@ -0,0 +1,49 @@
+import random
+from backend import models, geo
+from conftest import make_user, auth_headers
+
+JOB = {"description": "Build things", "job_type": "Full-time", "salary_range": "n/a"}
+
+def test_resolve_spellings():
+    ids = lambda *texts: [getattr(geo.resolve(t), "id", None) for t in texts]
+    assert ids("Bengaluru", "Bangalore, India", "Whitefield, Bangalore") == ["in-bengaluru"] * 3
+    assert ids("NYC", "New York, NY", "São Paulo", "Sao Paulo", "München") == [
+        "us-new-york", "us-new-york", "br-sao-paulo", "br-sao-paulo", "de-munich"]
+    assert ids("Remote", "", "Anywhere") == [None, None, None]
+    assert geo.origin("12.97, 77.59") == (12.97, 77.59)
+    assert geo.origin("91,0") is None
+
+def test_geohash_and_radius_cover():
+    assert geo.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    gazetteer = geo.gazetteer()
+    rng = random.Random(3)
+    for _ in range(300):
+        # The prefix cover must not lose any place a full scan finds
+        place = rng.choice(gazetteer.sorted)
+        lat, lon = place.latitude + rng.uniform(-1, 1), place.longitude + rng.uniform(-1, 1)
+        radius = rng.choice([5, 25, 100, 400, 1500])
+        want = {p.id for p in gazetteer.sorted if geo.distance_km(lat, lon, p.latitude, p.longitude) <= radius}
+        assert {p.id for p in gazetteer.within(lat, lon, radius)} == want
+
+def test_location_and_radius_filters(client, db):
+    headers = auth_headers(make_user(db, "employer@example.com", models.UserRole.employer))
+    for title, location in [("Bangalore job", "Bangalore"), ("Mysore job", "Mysuru, Karnataka"),
+                            ("Chennai job", "Chennai"), ("Remote job", "Remote")]:
+        client.post("/employer/jobs", json={**JOB, "title": title, "location": location}, headers=headers)
+
+    def search(**params):
+        r = client.get("/seeker/jobs", params=params)
+        assert r.status_code == 200, r.text
+        return {j["title"]: j["distance_km"] for j in r.json()["items"]}
+
+    assert list(search(location="Bengaluru")) == ["Bangalore job"]
+    assert list(search(location="remote")) == ["Remote job"]
+    near = search(near="Bengaluru", radius_km=200)
+    assert set(near) == {"Bangalore job", "Mysore job"}
+    assert near["Bangalore job"] == 0 and 120 < near["Mysore job"] < 130
+    assert set(search(near="Bengaluru", radius_km=400)) == {"Bangalore job", "Mysore job", "Chennai job"}
+    assert set(search(near="13.08,80.27", radius_km=10)) == {"Chennai job"}
+    # Ranked search and facets take the same filter
+    assert set(search(q="job", near="Mysore", radius_km=50)) == {"Mysore job"}
+    assert client.get("/seeker/jobs/facets", params={"near": "Chennai"}).json()["total"] == 1
+    assert client.get("/seeker/jobs", params={"near": "Atlantis"}).status_code == 422
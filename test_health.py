@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+from backend import migrations, database
+
+def test_live_and_ready(client):
+    assert client.get("/health/live").json() == {"status": "ok"}
+
+    # Tables from create_all, but never migrated
+    r = client.get("/health/ready")
+    assert r.status_code == 503
+    assert r.json()["database"].startswith("error")
+
+    migrations.upgrade(database.engine, log=lambda *args: None)
+    r = client.get("/health/ready")
+    assert r.status_code == 200
+    assert r.json()["schema_version"] == migrations.MIGRATIONS[-1][0]
+
+def test_import_does_not_touch_the_database():
+    # Nothing listens on port 1: importing the app and serving liveness
+    # must not need the database
+    env = {**os.environ, "DATABASE_URL": "mysql+pymysql://user:pw@127.0.0.1:1/job_portal"}
+    env.pop("ASYNC_DATABASE_URL", None)
+    code = (
+        "from fastapi.testclient import TestClient\n"
+        "from backend.main import app\n"
+        "with TestClient(app) as client:\n"
+        "    assert client.get('/health/live').status_code == 200\n"
+        "    assert client.get('/health/ready').status_code == 503\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,80 @@
+import pytest
+from backend import models, normalize
+from conftest import make_user, auth_headers
+
+JOB = {"description": "Build things", "location": "Remote"}
+
+@pytest.mark.parametrize("text, expected", [
+    ("$100k-120k", (100000, 120000, "USD")),
+    ("€45,000 - €55,000", (45000, 55000, "EUR")),
+    ("£18/hr", (37440, 37440, "GBP")),
+    ("40 000 - 50 000 SEK", (40000, 50000, "SEK")),
+    ("CAD $90,000", (90000, 90000, "CAD")),
+    ("$5,000 per month", (60000, 60000, "USD")),
+    ("Up to 80k", (None, 80000, "USD")),
+    ("$60k+", (60000, None, "USD")),
+    ("45-60", (None, None, None)),
+    ("Competitive", (None, None, None)),
+])
+def test_parse_salary(text, expected):
+    assert normalize.parse_salary(text) == expected
+
+def test_parse_job_type():
+    assert [normalize.parse_job_type(t) for t in ("full time", "Part-Time", "Freelance", "Summer intern", "Remote", "")] == [
+        models.EmploymentType.full_time, models.EmploymentType.part_time, models.EmploymentType.contract,
+        models.EmploymentType.internship, models.EmploymentType.other, None,
+    ]
+
+def test_filters_and_facets(client, db):
+    headers = auth_headers(make_user(db, "employer@example.com", models.UserRole.employer))
+    post = lambda title, job_type, salary, **fields: client.post(
+        "/employer/jobs", json={**JOB, "title": title, "job_type": job_type, "salary_range": salary, **fields},
+        headers=headers).json()
+    senior = post("Senior engineer", "Full-time", "$150k-180k")
+    assert (senior["employment_type"], senior["salary_min"], senior["salary_max"]) == ("Full-time", 150000, 180000)
+    post("Engineer", "full time", "$90k-110k")
+    post("Support engineer", "Part time", "$25/hr", location="Berlin")
+    post("Engineer (EU)", "Contract", "€120,000")
+    post("Intern engineer", "Internship", "n/a")
+
+    def ids(**params):
+        return sorted(j["title"] for j in client.get("/seeker/jobs", params=params).json()["items"])
+
+    assert ids(employment_type="Full-time") == ["Engineer", "Senior engineer"]
+    assert ids(salary_min=100000) == ["Engineer", "Senior engineer"]
+    assert ids(salary_min=100000, currency="eur") == ["Engineer (EU)"]
+    assert ids(salary_max=60000) == ["Support engineer"]
+    # Ranked search applies the same filters
+    assert ids(q="engineer", salary_min=100000, employment_type="Full-time") == ["Engineer", "Senior engineer"]
+    assert client.get("/seeker/jobs", params={"employment_type": "Gig"}).status_code == 422
+
+    facets = client.get("/seeker/jobs/facets").json()
+    assert facets["total"] == 5
+    types = {f["value"]: f["count"] for f in facets["employment_type"]}
+    assert types == {"Full-time": 2, "Part-time": 1, "Contract": 1, "Internship": 1}
+    assert facets["location"] == [{"value": "Remote", "count": 4}, {"value": "Berlin", "count": 1}]
+    assert facets["salary"] == [
+        {"currency": "EUR", "min": 100000, "max": 150000, "count": 1},
+        {"currency": "USD", "min": 50000, "max": 75000, "count": 1},
+        {"currency": "USD", "min": 75000, "max": 100000, "count": 1},
+        {"currency": "USD", "min": 150000, "max": 200000, "count": 1},
+    ]
+    filtered = client.get("/seeker/jobs/facets", params={"location": "berlin"}).json()
+    assert filtered["total"] == 1 and filtered["employment_type"] == [{"value": "Part-time", "count": 1}]
+
+    # Editing the salary text re-derives the columns and evicts cached facets
+    client.put(f"/employer/jobs/{senior['id']}", json={"salary_range": "£200k"}, headers=headers)
+    assert ids(salary_min=100000) == ["Engineer"]
+    salary = client.get("/seeker/jobs/facets").json()["salary"]
+    assert {"currency": "GBP", "min": 200000, "max": None, "count": 1} in salary
+
+def test_text_filters_are_literal(client, db):
+    headers = auth_headers(make_user(db, "employer@example.com", models.UserRole.employer))
+    for title in ("50% remote engineer", "500 remote engineer", "QA_lead", "QA lead"):
+        client.post("/employer/jobs", json={**JOB, "title": title, "job_type": "Full-time", "salary_range": "n/a"},
+                    headers=headers)
+    # % and _ are not wildcards: SQL agrees with JobFilter.matches (the cache's test)
+    titles = lambda **params: sorted(j["title"] for j in client.get("/seeker/jobs", params=params).json()["items"])
+    assert titles(title="50%") == ["50% remote engineer"]
+    assert titles(title="QA_") == ["QA_lead"]
+    assert client.get("/seeker/jobs/facets", params={"title": "50%"}).json()["total"] == 1
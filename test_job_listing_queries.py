@@ -0,0 +1,69 @@
+from backend import models, cache
+from conftest import make_user, auth_headers
+
+def seed_jobs(db, employers, count, prefix="Engineer"):
+    for i in range(count):
+        db.add(models.Job(
+            employer_id=employers[i % len(employers)].id,
+            title=f"{prefix} {i}",
+            description="Build things",
+            location="Remote",
+            job_type="Full-time",
+            salary_range="$100k-120k",
+        ))
+    db.commit()
+
+def make_employers(db, count=3):
+    return [
+        make_user(db, f"employer{i}@example.com", models.UserRole.employer, company_name=f"Company {i}")
+        for i in range(count)
+    ]
+
+def count_queries(client, query_counter, url, headers=None):
+    # Warm per-process caches (token versions) so only the listing is counted
+    client.get(url, headers=headers)
+    query_counter.clear()
+    r = client.get(url, params={"limit": 100}, headers=headers)
+    assert r.status_code == 200
+    return len(query_counter), r.json()["items"]
+
+def test_search_jobs_query_count_is_constant(client, db, query_counter):
+    employers = make_employers(db)
+    seed_jobs(db, employers, 5)
+    small, jobs = count_queries(client, query_counter, "/seeker/jobs")
+    assert len(jobs) == 5
+    assert {job["company_name"] for job in jobs} == {"Company 0", "Company 1", "Company 2"}
+
+    seed_jobs(db, employers, 50, prefix="Extra")
+    # Seeded behind the app's back, so nothing invalidated the response cache
+    cache.job_search_cache.clear()
+    large, jobs = count_queries(client, query_counter, "/seeker/jobs")
+    assert len(jobs) == 55
+    assert small == large == 1
+
+def test_admin_list_jobs_query_count_is_constant(client, db, query_counter):
+    headers = auth_headers(make_user(db, "admin@example.com", models.UserRole.admin))
+    employers = make_employers(db)
+    seed_jobs(db, employers, 3)
+    small, _ = count_queries(client, query_counter, "/admin/jobs", headers)
+
+    seed_jobs(db, employers, 40, prefix="More")
+    # A job whose employer profile is gone still lists, as "Unknown"
+    db.add(models.Job(employer_id=9999, title="Orphan", description="d", location="x",
+                      job_type="Full-time", salary_range="n/a"))
+    db.commit()
+    large, jobs = count_queries(client, query_counter, "/admin/jobs", headers)
+    assert len(jobs) == 44
+    assert small == large == 1
+    assert [j["company_name"] for j in jobs if j["title"] == "Orphan"] == ["Unknown"]
+
+def test_employer_jobs_query_count_is_constant(client, db, query_counter):
+    employers = make_employers(db, 1)
+    headers = auth_headers(employers[0])
+    seed_jobs(db, employers, 3)
+    small, jobs = count_queries(client, query_counter, "/employer/jobs", headers)
+
+    seed_jobs(db, employers, 20, prefix="More")
+    large, more_jobs = count_queries(client, query_counter, "/employer/jobs", headers)
+    assert len(more_jobs) == len(jobs) + 20
+    assert small == large == 1
@@ -0,0 +1,53 @@
+import asyncio
+from sqlalchemy import func, select
+from backend import models
+from backend.main import app
+import load_test
+import seed_data
+
+def test_seed_is_skewed_and_consistent(engine, db):
+    result = seed_data.seed(engine, employers=5, seekers=40, jobs=60, applications=400, log=lambda *a: None)
+    assert result["applications"] == 400
+    assert db.scalar(select(func.count()).select_from(models.User)) == 1 + 5 + 40
+    assert db.scalar(select(func.count()).select_from(models.Job)) == 60
+
+    per_job = db.execute(
+        select(func.count()).select_from(models.Application).group_by(models.Application.job_id)
+        .order_by(func.count().desc())
+    ).scalars().all()
+    # Hot jobs: the busiest job has far more than an even share
+    assert per_job[0] > 3 * 400 / 60
+    late = db.scalar(
+        select(func.count()).select_from(models.Application)
+        .join(models.Job, models.Job.id == models.Application.job_id)
+        .where(models.Application.applied_at < models.Job.posted_at)
+    )
+    assert late == 0
+    stats = dict(db.execute(select(models.Counter.name, models.Counter.value).where(models.Counter.bucket == "")).all())
+    assert stats["users"] == 46
+
+def test_load_test_report(engine, db):
+    seed_data.seed(engine, employers=3, seekers=20, jobs=30, applications=100, days=20, log=lambda *a: None)
+    workload = load_test.Workload(db)
+    mix = {op: 1 for op in load_test.DEFAULT_MIX if op != "login"}
+    report = asyncio.run(load_test.run(app, workload, mix, concurrency=4, requests=120))
+
+    assert set(report["endpoints"]) <= set(mix)
+    assert report["overall"]["requests"] == 120
+    assert report["overall"]["errors"] == 0
+    for row in report["endpoints"].values():
+        assert row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"] <= row["max_ms"]
+        assert all(status in ("200", "400") for status in row["status"])
+
+    lines, regressed = load_test.compare(report, report, 0.15)
+    assert not regressed and len(lines) == len(report["endpoints"]) + 2
+    slower = {**report, "endpoints": {name: {**row, "p95_ms": row["p95_ms"] * 2 + 1}
+                                      for name, row in report["endpoints"].items()}}
+    assert load_test.compare(slower, report, 0.15)[1]
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert load_test.percentile(values, 50) == 50
+    assert load_test.percentile(values, 95) == 95
+    assert load_test.percentile(values, 99) == 99
+    assert load_test.percentile([7], 99) == 7
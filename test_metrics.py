@@ -0,0 +1,57 @@
+import logging
+from backend import models, metrics
+from conftest import make_user, auth_headers
+
+def sample(text, name, **labels):
+    wanted = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    for line in text.splitlines():
+        if line.startswith(f"{name}{{{wanted}") and (line[len(name) + 1 + len(wanted)] in ",}"):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+def test_metrics_per_route_template(client, db, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "scrape-secret")
+    employer = make_user(db, "employer@example.com", models.UserRole.employer)
+    for i in range(3):
+        db.add(models.Job(employer_id=employer.id, title=f"Job {i}", description="d", location="Remote",
+                          job_type="Full-time", salary_range="n/a"))
+    db.commit()
+    job_ids = [job.id for job in db.query(models.Job)]
+
+    for job_id in job_ids:
+        assert client.get(f"/seeker/jobs/{job_id}").status_code == 200
+    listing = client.get("/employer/jobs", headers=auth_headers(employer))
+    assert client.get("/no/such/path").status_code == 404
+
+    text = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).text
+    route = {"method": "GET", "route": "/seeker/jobs/{job_id}"}
+    # One label per template, not per job id
+    assert sample(text, "http_requests_total", **route) == 3
+    assert sample(text, "http_request_duration_seconds_count", **route) == 3
+    assert sample(text, "http_request_duration_seconds_bucket", **route, le="+Inf") == 3
+    # The async route's statements are counted through the greenlet
+    assert sample(text, "http_sql_statements_total", **route) == 3
+    assert sample(text, "http_sql_seconds_total", **route) > 0
+
+    mine = {"method": "GET", "route": "/employer/jobs"}
+    assert sample(text, "http_response_bytes_total", **mine) == len(listing.content)
+    assert sample(text, "http_sql_statements_total", **mine) >= 1
+    assert sample(text, "http_requests_total", method="GET", route="<other>") == 1
+
+def test_slow_requests_are_logged_with_statements(client, db, monkeypatch, caplog):
+    monkeypatch.setattr(metrics, "SLOW_REQUEST_SECONDS", 0)
+    with caplog.at_level(logging.WARNING, logger="backend.metrics"):
+        client.get("/seeker/jobs", params={"limit": 5})
+    [record] = [r for r in caplog.records if "slow request" in r.getMessage()]
+    message = record.getMessage()
+    assert "GET /seeker/jobs -> 200" in message
+    assert "SELECT" in message
+
+def test_metrics_need_the_scrape_token(client, db, monkeypatch):
+    admin = make_user(db, "admin@example.com", models.UserRole.admin)
+    assert client.get("/metrics").status_code == 404
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics").status_code == 404
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 404
+    assert client.get("/metrics", headers=auth_headers(admin)).status_code == 404
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
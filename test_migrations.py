@@ -0,0 +1,81 @@
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+from backend import models, migrations, counters
+
+NEW_INDEXES = {
+    "applications": ["uq_applications_job_seeker", "ix_applications_job_applied_at_id",
+                     "ix_applications_seeker_applied_at_id", "ix_applications_job_match_score_id"],
+    "jobs": ["ix_jobs_employer_posted_at_id", "uq_jobs_employer_external_id", "ix_jobs_hot_posted_at_id",
+             "ix_jobs_archived_closing_date", "ix_jobs_hot_type_posted_at_id", "ix_jobs_hot_salary_max",
+             "ix_jobs_hot_geohash_posted_at_id"],
+    "users": ["ix_users_deleted_at_created_at_id"],
+    "counters": ["ix_counters_name_value"],
+}
+# Created by earlier migrations and superseded by later ones
+DROPPED_INDEXES = {
+    "jobs": ["ix_jobs_posted_at_id", "ix_jobs_deleted_at_posted_at_id"],
+    "users": ["ix_users_created_at_id"],
+}
+
+def legacy_engine(tmp_path):
+    # A database as the old create_all/migrate_db.py scripts left it
+    engine = create_engine(f"sqlite:///{tmp_path}/legacy.db")
+    models.Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for names in NEW_INDEXES.values():
+            for name in names:
+                conn.execute(text(f"DROP INDEX {name}"))
+        conn.execute(text("DROP TABLE counters"))
+        conn.execute(text("ALTER TABLE jobs DROP COLUMN external_id"))
+        conn.execute(text("ALTER TABLE jobs DROP COLUMN deleted_at"))
+        conn.execute(text("ALTER TABLE jobs DROP COLUMN archived"))
+        for column in ("employment_type", "salary_min", "salary_max", "salary_currency", "place_id", "geohash"):
+            conn.execute(text(f"ALTER TABLE jobs DROP COLUMN {column}"))
+        conn.execute(text("ALTER TABLE employers DROP COLUMN place_id"))
+        conn.execute(text("ALTER TABLE applications DROP COLUMN match_score"))
+        conn.execute(text("ALTER TABLE users DROP COLUMN deleted_at"))
+        conn.execute(text("INSERT INTO users (id, email, role) VALUES (1, 's@example.com', 'seeker')"))
+        conn.execute(text("INSERT INTO job_seekers (id, full_name) VALUES (1, 'Sam')"))
+        conn.execute(text("INSERT INTO jobs (id, employer_id, title, location, job_type, salary_range) "
+                          "VALUES (1, NULL, 'Job', 'Bangalore, India', 'Full time', '$100k-120k')"))
+        for app_id in (1, 2, 3):
+            conn.execute(text(f"INSERT INTO applications (id, job_id, seeker_id, status) VALUES ({app_id}, 1, 1, 'applied')"))
+    return engine
+
+def test_upgrade_legacy_database(tmp_path):
+    engine = legacy_engine(tmp_path)
+    applied = migrations.upgrade(engine, log=lambda message: None)
+    assert applied == [number for number, _, _ in migrations.MIGRATIONS]
+
+    inspector = inspect(engine)
+    for table, names in NEW_INDEXES.items():
+        assert set(names) <= {index["name"] for index in inspector.get_indexes(table)}
+    for table, names in DROPPED_INDEXES.items():
+        assert not set(names) & {index["name"] for index in inspector.get_indexes(table)}
+    with engine.connect() as conn:
+        # Duplicates collapse to the first application
+        assert conn.execute(text("SELECT id FROM applications")).scalars().all() == [1]
+        counts = dict(conn.execute(text("SELECT name, value FROM counters WHERE bucket = ''")).all())
+    assert counts == {"users": 1, "jobs": 1, "applications": 1}
+    with Session(engine) as db:
+        # The migrations' own counting agrees with today's
+        assert counters.snapshot(db)["applications_by_status"] == {"Applied": 1}
+        assert counters.snapshot(db)["users_by_role"] == {"seeker": 1}
+        assert counters.reconcile(db) == 0
+    with engine.connect() as conn:
+        # Structured fields backfilled from the text
+        job = conn.execute(text(
+            "SELECT employment_type, salary_min, salary_max, salary_currency, place_id FROM jobs"
+        )).one()
+    assert tuple(job) == ("full_time", 100000, 120000, "USD", "in-bengaluru")
+
+    # Re-running is a no-op
+    assert migrations.upgrade(engine, log=lambda message: None) == []
+    assert migrations.status(engine) == (migrations.MIGRATIONS[-1][0], [])
+
+def test_fresh_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/fresh.db")
+    migrations.upgrade(engine, log=lambda message: None)
+    inspector = inspect(engine)
+    assert set(models.Base.metadata.tables) <= set(inspector.get_table_names())
+    assert "uq_applications_job_seeker" in {index["name"] for index in inspector.get_indexes("applications")}
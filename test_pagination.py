@@ -0,0 +1,49 @@
+from backend import models
+from conftest import make_user, auth_headers
+
+def walk(client, url, headers=None, limit=10):
+    ids, cursor = [], None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        r = client.get(url, params=params, headers=headers)
+        assert r.status_code == 200
+        page = r.json()
+        assert len(page["items"]) <= limit
+        ids.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return ids
+
+def test_job_pages_cover_every_row_once(client, db):
+    employer = make_user(db, "employer@example.com", models.UserRole.employer)
+    # Rows inserted in the same second share posted_at, so the id tiebreaker matters
+    for i in range(45):
+        db.add(models.Job(employer_id=employer.id, title=f"Job {i}", description="d",
+                          location="Remote", job_type="Full-time", salary_range="n/a"))
+    db.commit()
+
+    ids = walk(client, "/seeker/jobs")
+    assert ids == sorted(ids, reverse=True)
+    assert len(ids) == len(set(ids)) == 45
+    assert walk(client, "/employer/jobs", auth_headers(employer), limit=7) == ids
+
+def test_application_pages(client, db):
+    employer = make_user(db, "employer@example.com", models.UserRole.employer)
+    job = models.Job(employer_id=employer.id, title="Job", description="d",
+                     location="Remote", job_type="Full-time", salary_range="n/a")
+    db.add(job)
+    db.commit()
+    seekers = [make_user(db, f"seeker{i}@example.com", models.UserRole.seeker) for i in range(12)]
+    for seeker in seekers:
+        db.add(models.Application(job_id=job.id, seeker_id=seeker.id))
+    db.commit()
+
+    ids = walk(client, f"/employer/jobs/{job.id}/applicants", auth_headers(employer), limit=5)
+    assert len(set(ids)) == 12
+    assert walk(client, "/seeker/applications", auth_headers(seekers[0])) == [ids[-1]]
+
+def test_page_size_is_capped_and_cursor_validated(client):
+    assert client.get("/seeker/jobs", params={"limit": 1000}).status_code == 422
+    assert client.get("/seeker/jobs", params={"cursor": "not-a-cursor"}).status_code == 400
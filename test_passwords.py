@@ -0,0 +1,31 @@
+from passlib.context import CryptContext
+from backend import models, passwords
+from conftest import make_user
+
+def register(client, email="new@example.com", password="s3cret"):
+    return client.post("/auth/register", json={
+        "email": email, "password": password, "role": "seeker", "full_name": "New Seeker",
+    })
+
+def login(client, email="new@example.com", password="s3cret"):
+    return client.post("/auth/login", data={"username": email, "password": password})
+
+def test_register_and_login_through_pool(client, db):
+    assert register(client).status_code == 200
+    assert register(client).status_code == 400
+    r = login(client)
+    assert r.status_code == 200 and r.json()["role"] == "seeker"
+    assert login(client, password="wrong").status_code == 401
+    assert login(client, email="nobody@example.com").status_code == 401
+
+def test_outdated_hash_is_upgraded_on_login(client, db):
+    old_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+    user = make_user(db, "old@example.com", models.UserRole.seeker)
+    user.hashed_password = old_context.hash("s3cret")
+    db.commit()
+    assert passwords.pwd_context.needs_update(user.hashed_password)
+
+    assert login(client, "old@example.com").status_code == 200
+    db.refresh(user)
+    assert not passwords.pwd_context.needs_update(user.hashed_password)
+    assert login(client, "old@example.com").status_code == 200
@@ -0,0 +1,43 @@
+from backend import models, auth
+from conftest import make_user, auth_headers
+
+def test_role_checks_use_token_claims(client, db, query_counter):
+    seeker = make_user(db, "seeker@example.com", models.UserRole.seeker)
+    headers = auth_headers(seeker)
+    assert client.get("/seeker/applications", headers=headers).status_code == 200
+
+    # Warm cache: authentication and the role check cost no queries
+    query_counter.clear()
+    assert client.get("/employer/jobs", headers=headers).status_code == 403
+    assert query_counter == []
+
+def test_deleted_user_is_rejected(client, db):
+    admin = make_user(db, "admin@example.com", models.UserRole.admin)
+    employer = make_user(db, "employer@example.com", models.UserRole.employer)
+    headers = auth_headers(employer)
+    assert client.get("/employer/jobs", headers=headers).status_code == 200
+
+    db.delete(db.get(models.Employer, employer.id))
+    db.commit()
+    assert client.delete(f"/admin/users/{employer.id}", headers=auth_headers(admin)).status_code == 200
+    assert client.get("/employer/jobs", headers=headers).status_code == 401
+
+def test_revoked_tokens_expire_with_cache_ttl(client, db):
+    seeker = make_user(db, "seeker@example.com", models.UserRole.seeker)
+    headers = auth_headers(seeker)
+    assert client.get("/seeker/applications", headers=headers).status_code == 200
+
+    # Simulate a revocation made by another worker: the cached version is
+    # still trusted until it expires
+    seeker.token_version += 1
+    db.commit()
+    assert client.get("/seeker/applications", headers=headers).status_code == 200
+    auth.token_versions.clear()  # TTL elapsed
+    assert client.get("/seeker/applications", headers=headers).status_code == 401
+    assert client.get("/seeker/applications", headers=auth_headers(seeker)).status_code == 200
+
+def test_tokens_without_claims_are_rejected(client, db):
+    seeker = make_user(db, "seeker@example.com", models.UserRole.seeker)
+    legacy = auth.create_access_token(data={"sub": seeker.email, "role": "seeker"})
+    r = client.get("/seeker/applications", headers={"Authorization": f"Bearer {legacy}"})
+    assert r.status_code == 401
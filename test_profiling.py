@@ -0,0 +1,60 @@
+from backend import models
+from conftest import make_user, auth_headers
+
+def seed(db, applicants):
+    employer = make_user(db, "employer@example.com", models.UserRole.employer)
+    job = models.Job(employer_id=employer.id, title="Backend Engineer", description="Python",
+                     location="Remote", job_type="Full-time", salary_range="n/a")
+    db.add(job)
+    db.commit()
+    for i in range(applicants):
+        seeker = make_user(db, f"seeker{i}@example.com", models.UserRole.seeker)
+        db.add(models.Application(job_id=job.id, seeker_id=seeker.id))
+    db.commit()
+    return job.id, employer
+
+def test_admin_profiles_another_accounts_request(client, db):
+    job_id, employer = seed(db, 5)
+    admin = auth_headers(make_user(db, "admin@example.com", models.UserRole.admin))
+    url = f"/employer/jobs/{job_id}/applicants"
+    headers = {**auth_headers(employer), "X-Profile": "1", "X-Profile-Token": admin["Authorization"].split()[1]}
+
+    r = client.get(url, headers=headers, params={"sort": "match"})
+    assert r.status_code == 200 and len(r.json()["items"]) == 5
+    profile_id = r.headers["X-Profile-Id"]
+
+    [summary] = client.get("/admin/profiles", headers=admin).json()
+    assert summary["id"] == profile_id
+    assert summary["route"] == "/employer/jobs/{job_id}/applicants"
+    assert summary["status"] == 200
+    assert summary["sql_statements"] >= 3
+    assert summary["samples"] > 0
+
+    speedscope = client.get(f"/admin/profiles/{profile_id}", headers=admin).json()
+    profile = speedscope["profiles"][0]
+    assert profile["type"] == "sampled"
+    assert len(profile["samples"]) == len(profile["weights"])
+    frames = speedscope["shared"]["frames"]
+    assert all(0 <= i < len(frames) for sample in profile["samples"] for i in sample)
+    assert any("FROM applications" in s["sql"] for s in speedscope["sql"])
+
+    collapsed = client.get(f"/admin/profiles/{profile_id}", headers=admin, params={"format": "collapsed"})
+    assert collapsed.headers["content-disposition"].startswith("attachment")
+    for line in collapsed.text.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack and int(count) > 0
+
+def test_flag_is_ignored_without_an_admin(client, db):
+    job_id, employer = seed(db, 1)
+    headers = auth_headers(employer)
+    r = client.get(f"/employer/jobs/{job_id}/applicants", headers=headers, params={"profile": "1"})
+    assert r.status_code == 200
+    assert "X-Profile-Id" not in r.headers
+    admin = auth_headers(make_user(db, "admin@example.com", models.UserRole.admin))
+    assert client.get("/admin/profiles", headers=admin).json() == []
+    assert client.get("/admin/profiles", headers=headers).status_code == 403
+
+    # An admin's own request can carry the flag as a query parameter
+    r = client.get("/admin/jobs", headers=admin, params={"profile": "1"})
+    assert client.get(f"/admin/profiles/{r.headers['X-Profile-Id']}", headers=admin).status_code == 200
+    assert client.get("/admin/profiles/nope", headers=admin).status_code == 404
@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from backend import models, database
+from conftest import make_user, auth_headers
+
+@pytest.fixture
+def seeded(db):
+    employers = [make_user(db, f"employer{i}@example.com", models.UserRole.employer) for i in range(5)]
+    seekers = [make_user(db, f"seeker{i}@example.com", models.UserRole.seeker) for i in range(5)]
+    admin = make_user(db, "admin@example.com", models.UserRole.admin)
+    for i in range(300):
+        db.add(models.Job(employer_id=employers[i % 5].id, title=f"Job {i}", description="d",
+                          location="Remote", job_type="Full-time", salary_range="n/a"))
+    db.flush()
+    for job_id in range(1, 101):
+        for seeker in seekers:
+            db.add(models.Application(job_id=job_id, seeker_id=seeker.id))
+    db.commit()
+    return employers[0], seekers[0], admin
+
+@pytest.fixture
+def selects():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(Engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(Engine, "before_cursor_execute", capture)
+
+def test_router_queries_use_indexes(client, seeded, selects):
+    employer, seeker, admin = seeded
+    pages = [
+        ("/seeker/jobs", None),
+        ("/seeker/jobs?employment_type=Full-time", None),
+        ("/seeker/jobs?salary_min=50000", None),
+        ("/seeker/jobs?location=Bengaluru", None),
+        ("/seeker/jobs?near=Bengaluru", None),
+        ("/seeker/applications", auth_headers(seeker)),
+        ("/employer/jobs", auth_headers(employer)),
+        ("/employer/jobs/1/applicants", auth_headers(employer)),
+        ("/admin/users", auth_headers(admin)),
+        ("/admin/jobs", auth_headers(admin)),
+    ]
+    for url, headers in pages:
+        first = client.get(url, headers=headers, params={"limit": 2}).json()
+        # Follow a cursor too: the keyset predicate must not defeat the index
+        assert client.get(url, headers=headers, params={"limit": 2, "cursor": first["next_cursor"]}).status_code == 200
+    assert client.get("/admin/stats", headers=auth_headers(admin)).status_code == 200
+    assert client.post("/seeker/apply/200", headers=auth_headers(seeker)).status_code == 200
+    assert client.post("/seeker/apply/200", headers=auth_headers(seeker)).status_code == 400
+
+    assert selects
+    raw = database.engine.raw_connection()
+    try:
+        for statement, parameters in selects:
+            plan = [row[3] for row in raw.cursor().execute("EXPLAIN QUERY PLAN " + statement, parameters)]
+            for step in plan:
+                # SCAN without an index reads the whole table
+                assert not (step.startswith("SCAN") and "INDEX" not in step), (statement, plan)
+                # Sorting the whole result defeats LIMIT
+                assert "TEMP B-TREE" not in step, (statement, plan)
+    finally:
+        raw.close()
@@ -0,0 +1,78 @@
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import numpy as np
+from backend import models, recommend, matching
+from conftest import make_user, auth_headers
+
+def job(title, description, **fields):
+    return {"title": title, "description": description, "location": "Remote", "job_type": "Full-time",
+            "salary_range": "n/a", **fields}
+
+def test_recommendations_follow_profile_and_jobs(client, db):
+    employer = auth_headers(make_user(db, "employer@example.com", models.UserRole.employer))
+    seeker_user = make_user(db, "seeker@example.com", models.UserRole.seeker)
+    seeker = auth_headers(seeker_user)
+    post = lambda body: client.post("/employer/jobs", json=body, headers=employer).json()["id"]
+    python = post(job("Python developer", "Build APIs with Python, Django and Postgres"))
+    post(job("Java engineer", "Spring services on the JVM"))
+    data = post(job("Data analyst", "SQL dashboards; some Python scripting"))
+    post(job("Django lead", "Python and Django", closing_date=(datetime.utcnow() - timedelta(days=1)).isoformat()))
+
+    assert client.get("/seeker/recommendations", headers=seeker).json() == []  # empty profile
+    client.put("/seeker/profile", json={"full_name": "Sam", "skills": "Python, Django"}, headers=seeker)
+    items = client.get("/seeker/recommendations", headers=seeker).json()
+    # The closed job and the unrelated one are left out
+    assert [j["id"] for j in items] == [python, data]
+    assert 0 < items[1]["match_score"] < items[0]["match_score"] <= 1
+    assert items[0]["company_name"] == "Acme"
+
+    # Incremental: new postings, deletions and applications show up at once
+    newer = post(job("Senior Python engineer", "Python, Django, Celery"))
+    client.delete(f"/employer/jobs/{data}", headers=employer)
+    client.post(f"/seeker/apply/{python}", headers=seeker)
+    assert [j["id"] for j in client.get("/seeker/recommendations", headers=seeker).json()] == [newer]
+    assert client.get("/seeker/recommendations", headers=employer).status_code == 403
+
+def brute_force(jobs, profile, k):
+    # The same lnc.ltc scoring, dense and row by row
+    n = len(jobs)
+    rows = {job_id: recommend._row_vector(text) for job_id, text in jobs.items()}
+    df = np.zeros(matching.FEATURES)
+    for idx, _ in rows.values():
+        df[idx] += 1
+    idx, tf = matching.term_vector(profile)
+    query = np.zeros(matching.FEATURES)
+    query[idx] = tf * (np.log((n + 1) / (df[idx] + 1)) + 1)
+    query /= np.linalg.norm(query)
+    scores = [(float(query[r_idx] @ r_w), job_id) for job_id, (r_idx, r_w) in rows.items()]
+    return sorted([s for s in scores if s[0] > 0], reverse=True)[:k]
+
+def test_incremental_index_matches_brute_force(monkeypatch):
+    monkeypatch.setattr(recommend, "MERGE_ROWS", 8)
+    words = "python java react django spring sql docker kubernetes aws rust go ml".split()
+    rng = random.Random(7)
+    index = recommend.RecommendationIndex()
+    index.loaded = True
+    live = {}
+    for step in range(400):
+        if live and rng.random() < 0.35:
+            job_id = rng.choice(list(live))
+            index.remove_job(job_id)
+            del live[job_id]
+        else:
+            job_id = rng.randrange(1, 150)  # re-adding an id is an update
+            text = " ".join(rng.choices(words, k=rng.randint(1, 8)))
+            index.add_job(SimpleNamespace(id=job_id, employer_id=1, title=text, description="", closing_date=None))
+            live[job_id] = text + " "
+        if step % 40 == 0:
+            # Merging pending rows changes nothing; after a vacuum (which
+            # also makes df exact again) it matches the dense computation
+            pending = index.recommend("python django sql", 10)
+            index._merge()
+            assert index.recommend("python django sql", 10) == pending
+            index._vacuum()
+            got = index.recommend("python django sql", 10)
+            want = brute_force(live, "python django sql", 10)
+            assert [job_id for _, job_id in got] == [job_id for _, job_id in want]
+            assert np.allclose([s for s, _ in got], [s for s, _ in want], atol=1e-5)
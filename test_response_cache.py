@@ -0,0 +1,99 @@
+from backend import models, cache
+from conftest import make_user, auth_headers
+
+JOB = {"description": "Work", "job_type": "Full-time", "salary_range": "n/a"}
+
+def post(client, headers, title, location="Remote"):
+    r = client.post("/employer/jobs", json={**JOB, "title": title, "location": location}, headers=headers)
+    assert r.status_code == 200
+    return r.json()["id"]
+
+def test_hit_etag_and_not_modified(client, db):
+    employer = make_user(db, "employer@example.com", models.UserRole.employer)
+    post(client, auth_headers(employer), "Python Developer")
+
+    first = client.get("/seeker/jobs")
+    assert first.headers["x-cache"] == "MISS"
+    second = client.get("/seeker/jobs")
+    assert second.headers["x-cache"] == "HIT"
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+
+    r = client.get("/seeker/jobs", headers={"If-None-Match": first.headers["etag"]})
+    assert r.status_code == 304
+    assert r.content == b""
+
+def test_writes_invalidate_only_affected_pages(client, db):
+    employer = make_user(db, "employer@example.com", models.UserRole.employer)
+    headers = auth_headers(employer)
+    for i in range(4):
+        post(client, headers, f"Job {i}", location="Pune" if i % 2 else "Mumbai")
+
+    page1 = client.get("/seeker/jobs", params={"limit": 2}).json()
+    client.get("/seeker/jobs", params={"limit": 2, "cursor": page1["next_cursor"]})
+    client.get("/seeker/jobs", params={"location": "pune"})
+    client.get("/seeker/jobs", params={"q": "job"})
+
+    # A new Mumbai posting lands on the first page only; the older page,
+    # the Pune filter and unrelated keywords keep their entries
+    post(client, headers, "Job 4", location="Mumbai")
+    assert client.get("/seeker/jobs", params={"limit": 2}).headers["x-cache"] == "MISS"
+    older = client.get("/seeker/jobs", params={"limit": 2, "cursor": page1["next_cursor"]})
+    assert older.headers["x-cache"] == "HIT"
+    assert client.get("/seeker/jobs", params={"location": "pune"}).headers["x-cache"] == "HIT"
+    # Ranked pages reshuffle on any matching posting
+    r = client.get("/seeker/jobs", params={"q": "job"})
+    assert r.headers["x-cache"] == "MISS"
+    assert len(r.json()["items"]) == 5
+
+    # Editing a job on the older page evicts that page
+    job_id = older.json()["items"][0]["id"]
+    r = client.put(f"/employer/jobs/{job_id}", json={"title": "Renamed"}, headers=headers)
+    assert r.status_code == 200
+    r = client.get("/seeker/jobs", params={"limit": 2, "cursor": page1["next_cursor"]})
+    assert r.headers["x-cache"] == "MISS"
+    assert r.json()["items"][0]["title"] == "Renamed"
+
+def test_employer_rename_invalidates_their_pages(client, db):
+    employer = make_user(db, "employer@example.com", models.UserRole.employer, company_name="Acme")
+    headers = auth_headers(employer)
+    post(client, headers, "Python Developer")
+    assert client.get("/seeker/jobs").json()["items"][0]["company_name"] == "Acme"
+
+    r = client.put("/employer/profile", json={"company_name": "Globex"}, headers=headers)
+    assert r.status_code == 200
+    r = client.get("/seeker/jobs")
+    assert r.headers["x-cache"] == "MISS"
+    assert r.json()["items"][0]["company_name"] == "Globex"
+
+def test_memory_backend_bounds():
+    backend = cache.MemoryBackend(max_entries=2, max_bytes=10)
+    backend.set("a", b"1234", 60)
+    backend.set("b", b"1234", 60)
+    backend.get("a")
+    backend.set("c", b"1234", 60)
+    assert backend.get("b") is None  # least recently used
+    assert backend.get("a") == b"1234"
+    backend.set("d", b"12345678", 60)  # over the byte budget
+    assert backend.usage()["bytes"] <= 10
+    backend.set("e", b"1", -1)
+    assert backend.get("e") is None  # expired
+
+def test_page_computed_across_a_write_is_not_cached(client, db, monkeypatch):
+    from backend import queries
+    employer = make_user(db, "employer@example.com", models.UserRole.employer)
+    post(client, auth_headers(employer), "Python Developer")
+    job_page = queries.job_page
+
+    async def racing_job_page(*args, **kwargs):
+        page = await job_page(*args, **kwargs)
+        # A write lands (and is invalidated) after the page was read
+        cache.job_search_cache.invalidate_employer(employer.id)
+        return page
+
+    monkeypatch.setattr(queries, "job_page", racing_job_page)
+    assert client.get("/seeker/jobs").headers["x-cache"] == "MISS"
+    assert client.get("/seeker/jobs").headers["x-cache"] == "MISS"
+    monkeypatch.setattr(queries, "job_page", job_page)
+    assert client.get("/seeker/jobs").headers["x-cache"] == "MISS"
+    assert client.get("/seeker/jobs").headers["x-cache"] == "HIT"
@@ -0,0 +1,66 @@
+from backend import models, search
+from conftest import make_user, auth_headers
+
+JOB = {"location": "Remote", "job_type": "Full-time", "salary_range": "n/a"}
+
+def post(client, headers, title, description, **fields):
+    r = client.post("/employer/jobs", json={**JOB, "title": title, "description": description, **fields},
+                    headers=headers)
+    assert r.status_code == 200
+    return r.json()["id"]
+
+def titles(client, **params):
+    r = client.get("/seeker/jobs", params=params)
+    assert r.status_code == 200
+    return [job["title"] for job in r.json()["items"]]
+
+def test_stemming_and_stopwords():
+    assert search.tokenize("Developers developing the development") == ["develop"] * 3
+    assert search.tokenize("C++ and C# engineers") == ["c++", "c#", "engin"]
+
+def test_ranked_search_covers_description_and_company(client, db):
+    employer = make_user(db, "employer@example.com", models.UserRole.employer, company_name="Pythonistas Ltd")
+    headers = auth_headers(employer)
+    post(client, headers, "Python Developer", "Write Python services")
+    post(client, headers, "Data Analyst", "Some Python scripting helps")
+    post(client, headers, "Office Manager", "Keep the office running")
+
+    assert titles(client, q="python")[:2] == ["Python Developer", "Data Analyst"]
+    # Company name is indexed too, so every posting of theirs matches
+    assert len(titles(client, q="pythonistas")) == 3
+    assert titles(client, q="developing") == ["Python Developer"]
+    assert titles(client, q="python", title="analyst") == ["Data Analyst"]
+    assert titles(client, q="zebra") == []
+
+def test_index_follows_employer_writes(client, db):
+    employer = make_user(db, "employer@example.com", models.UserRole.employer)
+    headers = auth_headers(employer)
+    job_id = post(client, headers, "Rust Engineer", "Systems work")
+    assert titles(client, q="rust") == ["Rust Engineer"]
+
+    post(client, headers, "Rust Intern", "Learn systems programming")
+    assert len(titles(client, q="rust")) == 2
+
+    client.put(f"/employer/jobs/{job_id}", json={"title": "Go Engineer"}, headers=headers)
+    assert titles(client, q="rust") == ["Rust Intern"]
+    assert titles(client, q="go") == ["Go Engineer"]
+
+    client.delete(f"/employer/jobs/{job_id}", headers=headers)
+    assert titles(client, q="go") == []
+
+def test_ranked_pages(client, db):
+    employer = make_user(db, "employer@example.com", models.UserRole.employer)
+    for i in range(25):
+        db.add(models.Job(employer_id=employer.id, title=f"Java Developer {i}", description="java " * (i % 5),
+                          **JOB))
+    db.commit()
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": "java", "limit": 10, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/seeker/jobs", params=params).json()
+        seen.extend(job["id"] for job in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 25
@@ -0,0 +1,41 @@
+from datetime import datetime
+from backend import models, schemas, queries, responses
+from conftest import make_user, auth_headers
+
+def seed(db):
+    employer = make_user(db, "employer@example.com", models.UserRole.employer)
+    jobs = [
+        models.Job(employer_id=employer.id, title=f"Engineer {i}", description="Python", location="Berlin",
+                   job_type="Full-time", salary_range="€60k-70k", posted_at=datetime(2024, 1, 1, 12, 0, i, 123456 * (i % 2)),
+                   employment_type=models.EmploymentType.full_time, salary_min=60000, salary_max=70000,
+                   salary_currency="EUR")
+        for i in range(3)
+    ]
+    db.add_all(jobs)
+    db.commit()
+    seeker = make_user(db, "seeker@example.com", models.UserRole.seeker, full_name="Sam")
+    db.add(models.Application(job_id=jobs[0].id, seeker_id=seeker.id))
+    db.commit()
+    return jobs[0].id, auth_headers(employer)
+
+def pydantic_json(model, content):
+    # What FastAPI sends for content returned through response_model=model
+    return model.model_validate(content).model_dump_json().encode()
+
+def test_fast_path_matches_pydantic(client, db):
+    job_id, headers = seed(db)
+    rows = db.execute(queries.job_listing().order_by(models.Job.id)).all()
+    page = {"items": queries.job_dicts(rows), "next_cursor": None}
+    assert responses.dumps(page) == pydantic_json(
+        schemas.Page[schemas.JobOut], {"items": queries.jobs_out(rows), "next_cursor": None}
+    )
+
+    r = client.get("/employer/jobs", headers=headers)
+    assert r.content == pydantic_json(schemas.Page[schemas.JobOut], r.json())
+    assert r.json()["items"][0]["employment_type"] == "Full-time"
+
+    for sort in ("recent", "match"):
+        r = client.get(f"/employer/jobs/{job_id}/applicants", headers=headers, params={"sort": sort})
+        assert r.status_code == 200
+        assert r.content == pydantic_json(schemas.Page[schemas.ApplicationOut], r.json())
+        assert r.json()["items"][0]["seeker_email"] == "seeker@example.com"
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+from sqlalchemy import func, select
+from backend import models, counters, purge, scheduler
+from conftest import make_user, auth_headers
+
+JOB = {"description": "Build things", "location": "Remote", "job_type": "Full-time", "salary_range": "n/a"}
+
+def seed(client, db, jobs=3, seekers=4):
+    admin = make_user(db, "admin@example.com", models.UserRole.admin)
+    employer = make_user(db, "employer@example.com", models.UserRole.employer)
+    headers = auth_headers(employer)
+    job_ids = [client.post("/employer/jobs", json={**JOB, "title": f"Engineer {i}"}, headers=headers).json()["id"]
+               for i in range(jobs)]
+    seeker_headers = [auth_headers(make_user(db, f"seeker{i}@example.com", models.UserRole.seeker))
+                      for i in range(seekers)]
+    for job_id in job_ids:
+        for h in seeker_headers:
+            assert client.post(f"/seeker/apply/{job_id}", headers=h).status_code == 200
+    counters.reconcile(db)
+    return auth_headers(admin), headers, job_ids, seeker_headers
+
+def count(db, model):
+    return db.scalar(select(func.count()).select_from(model))
+
+def test_deleted_job_disappears_then_is_purged(client, db, monkeypatch, query_counter):
+    admin, employer, (job_id, *others), seekers = seed(client, db)
+    late = auth_headers(make_user(db, "late@example.com", models.UserRole.seeker))
+    counters.reconcile(db)
+    client.get("/seeker/jobs", params={"q": "engineer"})  # build the search index
+
+    assert client.delete(f"/employer/jobs/{job_id}", headers=employer).status_code == 200
+    assert client.delete(f"/employer/jobs/{job_id}", headers=employer).status_code == 404
+    assert job_id not in [j["id"] for j in client.get("/seeker/jobs").json()["items"]]
+    assert job_id not in [j["id"] for j in client.get("/seeker/jobs", params={"q": "engineer"}).json()["items"]]
+    assert client.get(f"/employer/jobs/{job_id}/applicants", headers=employer).status_code == 404
+    assert client.post(f"/seeker/apply/{job_id}", headers=late).status_code == 404
+    mine = client.get("/seeker/applications", headers=seekers[0]).json()["items"]
+    assert sorted(a["job_id"] for a in mine) == others
+    assert client.get("/admin/stats", headers=admin).json()["total_jobs"] == 2
+    assert counters.reconcile(db) == 0
+
+    monkeypatch.setattr(purge, "PURGE_BATCH_SIZE", 3)
+    query_counter.clear()
+    assert purge.purge_pending(db, pause=0) == {"applications": 4, "jobs": 1}
+    # Chunked, by primary key
+    deletes = [sql for sql in query_counter if sql.lstrip().upper().startswith("DELETE")]
+    assert len(deletes) == 3 and all(" IN (" in sql for sql in deletes)
+    assert db.get(models.Job, job_id) is None
+    assert count(db, models.Application) == 8
+    assert counters.reconcile(db) == 0
+
+def test_deleted_employer_cascades_in_background(client, db, monkeypatch):
+    admin, employer, job_ids, seekers = seed(client, db)
+    client.get("/seeker/jobs", params={"q": "engineer"})
+    employer_id = client.get("/auth/me", headers=employer).json()["id"]
+
+    assert client.delete(f"/admin/users/{employer_id}", headers=admin).status_code == 200
+    # Gone from every listing at once, though nothing is removed yet
+    assert client.get("/seeker/jobs").json()["items"] == []
+    assert client.get("/seeker/jobs", params={"q": "engineer"}).json()["items"] == []
+    assert client.get("/admin/jobs", headers=admin).json()["items"] == []
+    assert client.get("/seeker/applications", headers=seekers[0]).json()["items"] == []
+    assert client.get("/employer/jobs", headers=employer).status_code == 401
+    users = [u["email"] for u in client.get("/admin/users", headers=admin).json()["items"]]
+    assert "employer@example.com" not in users
+    assert count(db, models.Job) == 3
+    assert counters.reconcile(db) == 0
+
+    monkeypatch.setattr(purge, "PURGE_BATCH_SIZE", 5)
+    assert purge.purge_pending(db, pause=0) == {"jobs_retired": 3, "applications": 12, "jobs": 3, "users": 1}
+    assert (count(db, models.Job), count(db, models.Application), count(db, models.Employer)) == (0, 0, 0)
+    assert db.get(models.User, employer_id) is None
+    assert count(db, models.JobSeeker) == 4
+    assert counters.reconcile(db) == 0
+    assert purge.purge_pending(db, pause=0) == {}
+
+def test_purge_stops_between_chunks(client, db, monkeypatch):
+    admin, employer, job_ids, seekers = seed(client, db)
+    employer_id = client.get("/auth/me", headers=employer).json()["id"]
+    client.delete(f"/admin/users/{employer_id}", headers=admin)
+
+    monkeypatch.setattr(purge, "PURGE_BATCH_SIZE", 2)
+    stopping = threading.Event()
+    stopping.set()
+    # Shutting down: the chunk in hand is finished, nothing after it
+    assert purge.purge_pending(db, pause=0, stopping=stopping) == {"jobs_retired": 2}
+    assert purge.purge_pending(db, pause=0) == {"jobs_retired": 1, "applications": 12, "jobs": 3, "users": 1}
+    assert counters.reconcile(db) == 0
+
+def test_scheduler_stop_waits_for_the_chunk_in_hand():
+    chunks = []
+
+    def job(stopping):
+        while True:
+            chunks.append(len(chunks))
+            if scheduler.between_chunks(0.01, stopping):
+                return len(chunks)
+
+    async def main():
+        task = scheduler.start("job", job, 0.001)
+        while not chunks:
+            await asyncio.sleep(0.001)
+        await scheduler.stop(task)
+        return len(chunks)
+
+    done = asyncio.run(main())
+    time.sleep(0.05)
+    assert len(chunks) == done
+
+def test_deleted_seeker(client, db):
+    admin, employer, (job_id, *_), seekers = seed(client, db, jobs=1, seekers=2)
+    seeker_id = client.get("/auth/me", headers=seekers[0]).json()["id"]
+    assert client.delete(f"/admin/users/{seeker_id}", headers=admin).status_code == 200
+    assert client.delete(f"/admin/users/{seeker_id}", headers=admin).status_code == 404
+
+    applicants = client.get(f"/employer/jobs/{job_id}/applicants", headers=employer).json()["items"]
+    assert [a["seeker_id"] for a in applicants] == [seeker_id + 1]
+    ranked = client.get(f"/employer/jobs/{job_id}/applicants", params={"sort": "match"}, headers=employer).json()
+    assert len(ranked["items"]) == 1
+    assert client.get("/seeker/applications", headers=seekers[0]).status_code == 401
+
+    # The email stays taken until the account is purged
+    register = {"email": "seeker0@example.com", "password": "secret", "role": "seeker"}
+    assert client.post("/auth/register", json=register).status_code == 400
+    purge.purge_pending(db, pause=0)
+    assert client.post("/auth/register", json=register).status_code == 200
+    assert counters.reconcile(db) == 0